@@ -0,0 +1,109 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import (AuthenticationFailed,
+                                                 InvalidToken)
+from rest_framework_simplejwt.settings import api_settings
+
+USER_CACHE_SETTINGS = getattr(settings, 'JWT_USER_CACHE', {})
+
+
+class TTLCache:
+    """Потокобезопасный LRU-кэш ограниченного размера с временем жизни."""
+
+    def __init__(self, max_size, ttl, timer=time.monotonic):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.timer = timer
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            expires, value = item
+            if expires <= self.timer():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (self.timer() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+user_cache = TTLCache(
+    max_size=USER_CACHE_SETTINGS.get('MAX_SIZE', 10000),
+    ttl=USER_CACHE_SETTINGS.get('TTL', 60),
+)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWT-аутентификация, берущая пользователя из кэша процесса.
+
+    В кэше хранятся значения полей пользователя, при каждом запросе из
+    них собирается новый экземпляр модели. Записи сбрасываются сигналами
+    сохранения и удаления пользователя, а в остальных процессах
+    устаревают по истечении TTL.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                'Token contained no recognizable user identification'
+            )
+
+        cached = user_cache.get(user_id)
+        if cached is None:
+            try:
+                user = self.user_model.objects.get(
+                    **{api_settings.USER_ID_FIELD: user_id}
+                )
+            except self.user_model.DoesNotExist:
+                raise AuthenticationFailed(
+                    'User not found', code='user_not_found'
+                )
+            user_cache.set(user_id, self.dump_user(user))
+        else:
+            user = self.load_user(cached)
+
+        if not user.is_active:
+            raise AuthenticationFailed(
+                'User is inactive', code='user_inactive'
+            )
+        return user
+
+    def dump_user(self, user):
+        return user._state.db, tuple(
+            getattr(user, field.attname)
+            for field in self.user_model._meta.concrete_fields
+        )
+
+    def load_user(self, cached):
+        db, values = cached
+        field_names = [
+            field.attname for field in self.user_model._meta.concrete_fields
+        ]
+        return self.user_model.from_db(db, field_names, values)
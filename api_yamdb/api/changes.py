@@ -0,0 +1,54 @@
+from django.db.models import Prefetch
+
+from reviews.models import Category, Change, Comment, Genre, Review, Title
+
+from .metrics import serialization_timer
+from .serializers import (CategorySerializer, CommentSerializer,
+                          GenreSerializer, ReviewSerializer, TitleSerializer)
+
+# Модель журнала: (ключ в ответе, queryset, сериализатор, поле родителя).
+FEEDS = {
+    'category': ('categories', Category.objects.all(), CategorySerializer,
+                 None),
+    'genre': ('genres', Genre.objects.all(), GenreSerializer, None),
+    'title': (
+        'titles',
+        Title.objects.select_related('category').prefetch_related(
+            Prefetch('genre', queryset=Genre.objects.order_by('id'))
+        ),
+        TitleSerializer,
+        None,
+    ),
+    'review': ('reviews', Review.objects.select_related('author'),
+               ReviewSerializer, 'title_id'),
+    'comment': ('comments', Comment.objects.select_related('author'),
+                CommentSerializer, 'review_id'),
+}
+
+
+def build_changes(latest, request=None):
+    """Собирает upserts с текущим состоянием объектов и tombstones.
+
+    Объект, удалённый после записи в журнал, в upserts не попадает:
+    его tombstone придёт в одной из следующих пачек.
+    """
+    upserts = {key: [] for key, *_ in FEEDS.values()}
+    deletes = {key: [] for key, *_ in FEEDS.values()}
+    ids = {model: [] for model in FEEDS}
+    for (model, object_id), action in latest.items():
+        if action == Change.DELETE:
+            deletes[FEEDS[model][0]].append(object_id)
+        else:
+            ids[model].append(object_id)
+    for model, object_ids in ids.items():
+        if not object_ids:
+            continue
+        key, queryset, serializer, parent = FEEDS[model]
+        instances = list(queryset.filter(id__in=object_ids).order_by('id'))
+        with serialization_timer(request):
+            for instance in instances:
+                data = {'id': instance.pk, **serializer(instance).data}
+                if parent:
+                    data[parent] = getattr(instance, parent)
+                upserts[key].append(data)
+    return upserts, deletes
@@ -0,0 +1,83 @@
+import csv
+from datetime import datetime
+
+from reviews.models import Comment, Review, Title
+
+from .renderers import FastJSONRenderer
+
+# Ресурс: (модель, заголовок как в static/data/*.csv, колонки values_list).
+EXPORTS = {
+    'titles': (
+        Title,
+        ('id', 'name', 'year', 'category'),
+        ('id', 'name', 'year', 'category_id'),
+    ),
+    'reviews': (
+        Review,
+        ('id', 'title_id', 'text', 'author', 'score', 'pub_date'),
+        ('id', 'title_id', 'text', 'author_id', 'score', 'pub_date'),
+    ),
+    'comments': (
+        Comment,
+        ('id', 'review_id', 'text', 'author', 'pub_date'),
+        ('id', 'review_id', 'text', 'author_id', 'pub_date'),
+    ),
+}
+CONTENT_TYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson; charset=utf-8',
+}
+
+
+class Echo:
+    """Файлоподобный объект, который возвращает записанное."""
+
+    def write(self, value):
+        return value
+
+
+def iso_datetime(value):
+    """Дата в формате static/data: миллисекунды и суффикс Z."""
+    value = value.isoformat(timespec='milliseconds')
+    if value.endswith('+00:00'):
+        value = value[:-6] + 'Z'
+    return value
+
+
+def export_rows(resource, chunk_size):
+    model, _, columns = EXPORTS[resource]
+    rows = model.objects.order_by('id').values_list(*columns)
+    for row in rows.iterator(chunk_size=chunk_size):
+        yield [iso_datetime(value) if isinstance(value, datetime)
+               else value for value in row]
+
+
+def stream_csv(resource, chunk_size):
+    """Отдаёт csv кусками по chunk_size строк."""
+    header = EXPORTS[resource][1]
+    writer = csv.writer(Echo(), lineterminator='\n')
+    lines = [writer.writerow(header)]
+    for row in export_rows(resource, chunk_size):
+        lines.append(writer.writerow(row))
+        if len(lines) >= chunk_size:
+            yield ''.join(lines)
+            lines = []
+    if lines:
+        yield ''.join(lines)
+
+
+def stream_ndjson(resource, chunk_size):
+    """Отдаёт по JSON-объекту на строку, кусками по chunk_size строк."""
+    header = EXPORTS[resource][1]
+    render = FastJSONRenderer().render
+    lines = []
+    for row in export_rows(resource, chunk_size):
+        lines.append(render(dict(zip(header, row))) + b'\n')
+        if len(lines) >= chunk_size:
+            yield b''.join(lines)
+            lines = []
+    if lines:
+        yield b''.join(lines)
+
+
+STREAMS = {'csv': stream_csv, 'ndjson': stream_ndjson}
@@ -0,0 +1,56 @@
+from django.db.models import Count, ExpressionWrapper, F, IntegerField
+
+from reviews.models import Title
+
+TitleGenre = Title.genre.through
+
+
+def restrict(queryset, field, titles):
+    """Ограничивает queryset тайтлами из отфильтрованного списка."""
+    if titles is None:
+        return queryset
+    return queryset.filter(**{f'{field}__in': titles.order_by().values('id')})
+
+
+def genre_facet(titles):
+    rows = restrict(TitleGenre.objects, 'title_id', titles).values(
+        'genre__slug', 'genre__name'
+    ).annotate(count=Count('title_id')).order_by('-count', 'genre__slug')
+    return [{'slug': row['genre__slug'], 'name': row['genre__name'],
+             'count': row['count']} for row in rows]
+
+
+def category_facet(titles):
+    rows = restrict(Title.objects, 'id', titles).filter(
+        category__isnull=False
+    ).values('category__slug', 'category__name').annotate(
+        count=Count('id')
+    ).order_by('-count', 'category__slug')
+    return [{'slug': row['category__slug'], 'name': row['category__name'],
+             'count': row['count']} for row in rows]
+
+
+def year_facet(titles):
+    rows = restrict(Title.objects, 'id', titles).values('year').annotate(
+        count=Count('id')
+    ).order_by('year')
+    return [{'value': row['year'], 'count': row['count']} for row in rows]
+
+
+def decade_facet(titles):
+    decade = ExpressionWrapper(F('year') / 10 * 10,
+                               output_field=IntegerField())
+    rows = restrict(Title.objects, 'id', titles).annotate(
+        decade=decade
+    ).values('decade').annotate(count=Count('id')).order_by('decade')
+    return [{'value': row['decade'], 'count': row['count']} for row in rows]
+
+
+# Измерение: функция, которая одним GROUP BY считает тайтлы по значениям.
+# None вместо queryset означает все тайтлы без фильтров.
+TITLE_FACETS = {
+    'genre': genre_facet,
+    'category': category_facet,
+    'year': year_facet,
+    'decade': decade_facet,
+}
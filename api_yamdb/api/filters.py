@@ -1,13 +1,39 @@
 from django_filters.rest_framework import CharFilter, FilterSet
+from rest_framework.filters import OrderingFilter
 
 from reviews.models import Title
+from reviews.search import search_titles
+
+# Верхняя граница для поиска по префиксу диапазоном по индексу name.
+MAX_CHAR = '\U0010ffff'
 
 
 class TitleFilter(FilterSet):
-    category = CharFilter(field_name='category__slug', lookup_expr='contains')
-    genre = CharFilter(field_name='genre__slug', lookup_expr='contains')
-    name = CharFilter(field_name='name', lookup_expr='contains')
+    category = CharFilter(field_name='category__slug')
+    genre = CharFilter(field_name='genre__slug')
+    name = CharFilter(method='filter_name_prefix')
+    search = CharFilter(method='filter_search')
 
     class Meta:
         model = Title
-        fields = ['category', 'genre', 'name', 'year']
+        fields = ['category', 'genre', 'name', 'year', 'search']
+
+    def filter_name_prefix(self, queryset, name, value):
+        return queryset.filter(name__gte=value, name__lt=value + MAX_CHAR)
+
+    def filter_search(self, queryset, name, value):
+        return search_titles(queryset, value)
+
+
+class TitleOrderingFilter(OrderingFilter):
+    """Сортировка тайтлов; при равных значениях порядок задаёт id
+    в том же направлении, чтобы страницы не пересекались."""
+    ordering_fields = ('id', 'name', 'year', 'rating_bayesian',
+                       'rating_decayed')
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if not ordering or any(
+                field.lstrip('-') == 'id' for field in ordering):
+            return ordering
+        return (*ordering, '-id' if ordering[-1].startswith('-') else 'id')
@@ -0,0 +1,164 @@
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count, Sum
+from django.test import Client
+
+from reviews.models import Comment, Review
+
+# Имя маршрута и url по id объектов из БД.
+ENDPOINTS = (
+    ('titles-list', lambda ids: '/api/v1/titles/'),
+    ('titles-filter-category-year', lambda ids: (
+        f'/api/v1/titles/?category={ids["category"]}&year={ids["year"]}'
+    )),
+    ('titles-filter-year', lambda ids: f'/api/v1/titles/?year={ids["year"]}'),
+    ('titles-filter-genre', lambda ids: (
+        f'/api/v1/titles/?genre={ids["genre"]}'
+    )),
+    ('titles-filter-name', lambda ids: f'/api/v1/titles/?name={ids["name"]}'),
+    ('titles-detail', lambda ids: f'/api/v1/titles/{ids["title"]}/'),
+    ('reviews-list', lambda ids: f'/api/v1/titles/{ids["title"]}/reviews/'),
+    ('reviews-cursor', lambda ids: (
+        f'/api/v1/titles/{ids["title"]}/reviews/?cursor='
+    )),
+    ('reviews-detail', lambda ids: (
+        f'/api/v1/titles/{ids["title"]}/reviews/{ids["review"]}/'
+    )),
+    ('comments-list', lambda ids: (
+        f'/api/v1/titles/{ids["title"]}/reviews/{ids["review"]}/comments/'
+    )),
+    ('comments-detail', lambda ids: (
+        f'/api/v1/titles/{ids["title"]}/reviews/{ids["review"]}/comments/'
+        f'{ids["comment"]}/'
+    )),
+    ('categories-list', lambda ids: '/api/v1/categories/'),
+    ('genres-list', lambda ids: '/api/v1/genres/'),
+)
+
+# Признаки полного просмотра таблицы и сортировки во временной таблице.
+SCAN = 'полный просмотр'
+SCAN_PATTERNS = (
+    (re.compile(r'^SCAN (?:TABLE )?(\w+)$'), SCAN),
+    (re.compile(r'Seq Scan on (\w+)'), SCAN),
+    (re.compile(r'USE TEMP B-TREE FOR (.+)$'), 'сортировка без индекса'),
+)
+
+
+class QueryRecorder:
+    """Обёртка execute_wrapper: запоминает SQL и параметры запросов."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries.append((sql, params))
+        return execute(sql, params, many, context)
+
+
+def sample_ids():
+    comment = Comment.objects.select_related(
+        'review__title__category'
+    ).filter(review__title__category__isnull=False).first()
+    if comment is None:
+        raise CommandError(
+            'Нет данных для запросов: сначала выполните load_data.'
+        )
+    title = comment.review.title
+    genre = title.genre.first()
+    return {
+        'title': title.id,
+        'review': comment.review_id,
+        'comment': comment.id,
+        'category': title.category.slug,
+        'year': title.year,
+        'genre': genre.slug if genre else '',
+        'name': title.name[:3],
+    }
+
+
+def rating_aggregate():
+    queryset = Review.objects.order_by().values('title').annotate(
+        score_sum=Sum('score'), score_count=Count('id')
+    )
+    return queryset.query.get_compiler(connection.alias).as_sql()
+
+
+def explain(sql, params):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'{connection.ops.explain_query_prefix()} {sql}', params
+        )
+        return [str(row[-1]) for row in cursor.fetchall()]
+
+
+def problems(sql, plan):
+    """Полный просмотр отмечается только у запросов с условием WHERE:
+    списки без фильтров читают таблицу целиком по определению."""
+    filtered = ' WHERE ' in sql
+    for line in plan:
+        for pattern, kind in SCAN_PATTERNS:
+            found = pattern.search(line.strip())
+            if found and (filtered or kind != SCAN):
+                yield kind, found.group(1)
+
+
+class Command(BaseCommand):
+    """EXPLAIN для SQL-запросов основных маршрутов API."""
+
+    help = ('Выполняет GET-запросы к маршрутам API, показывает планы их '
+            'SQL-запросов и отмечает полные просмотры таблиц.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--fail-on-scan', action='store_true',
+            help='Завершиться с ошибкой, если найден полный просмотр таблицы.',
+        )
+        parser.add_argument(
+            '--ignore', nargs='*', default=(),
+            help='Таблицы, полный просмотр которых допустим.',
+        )
+
+    def handle(self, *args, **options):
+        ids = sample_ids()
+        client = Client()
+        statements = [('rating-aggregate', [rating_aggregate()])]
+        for name, url in ENDPOINTS:
+            recorder = QueryRecorder()
+            with connection.execute_wrapper(recorder):
+                response = client.get(url(ids))
+            if response.status_code != 200:
+                raise CommandError(
+                    f'{name}: {url(ids)} вернул {response.status_code}'
+                )
+            statements.append((name, recorder.queries))
+        scans = sum(
+            self.report(name, queries, options['ignore'],
+                        options['verbosity'])
+            for name, queries in statements
+        )
+        message = f'Полных просмотров таблиц: {scans}'
+        if scans and options['fail_on_scan']:
+            raise CommandError(message)
+        self.stdout.write(self.style.SUCCESS(message))
+
+    def report(self, name, queries, ignore, verbosity):
+        """Печатает планы запросов маршрута, возвращает число просмотров."""
+        scans = 0
+        self.stdout.write(self.style.MIGRATE_HEADING(name))
+        for sql, params in queries:
+            if not sql.lstrip().upper().startswith('SELECT'):
+                continue
+            plan = explain(sql, params)
+            found = [(kind, table) for kind, table in problems(sql, plan)
+                     if table not in ignore]
+            if verbosity > 1 or found:
+                self.stdout.write(f'  {sql[:120]}')
+            if verbosity > 1:
+                for line in plan:
+                    self.stdout.write(f'    {line}')
+            for kind, table in found:
+                self.stdout.write(self.style.WARNING(f'    {kind}: {table}'))
+            scans += sum(kind == SCAN for kind, _ in found)
+        return scans
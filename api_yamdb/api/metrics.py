@@ -0,0 +1,149 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+from django.conf import settings
+
+from .response_cache import response_cache
+
+METRICS_SETTINGS = getattr(settings, 'METRICS', {})
+SECONDS_BUCKETS = tuple(METRICS_SETTINGS.get('SECONDS_BUCKETS', (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5,
+)))
+QUERY_BUCKETS = tuple(METRICS_SETTINGS.get('QUERY_BUCKETS', (
+    0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89,
+)))
+
+# Имя метрики: (границы корзин, описание).
+HISTOGRAMS = {
+    'yamdb_request_duration_seconds': (
+        SECONDS_BUCKETS, 'Полное время обработки запроса.'
+    ),
+    'yamdb_db_duration_seconds': (
+        SECONDS_BUCKETS, 'Время SQL-запросов за один запрос к API.'
+    ),
+    'yamdb_serialize_duration_seconds': (
+        SECONDS_BUCKETS,
+        'Время сериализаторов и планов .values() при сборке данных ответа.'
+    ),
+    'yamdb_render_duration_seconds': (
+        SECONDS_BUCKETS, 'Время рендеринга готовых данных ответа в байты.'
+    ),
+    'yamdb_db_queries': (
+        QUERY_BUCKETS, 'Число SQL-запросов за один запрос к API.'
+    ),
+}
+
+
+class Histogram:
+    """Гистограмма с фиксированными корзинами, как в Prometheus."""
+
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        total = 0
+        for bound, count in zip(self.buckets + ('+Inf',), self.counts):
+            total += count
+            yield bound, total
+
+
+class RouteMetrics:
+    """Метрики маршрутов в памяти процесса.
+
+    Каждый процесс сервера собирает свои метрики; Prometheus суммирует
+    их по экземплярам.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._responses = {}
+
+    def observe(self, route, status, values):
+        with self._lock:
+            histograms = self._histograms.get(route)
+            if histograms is None:
+                histograms = self._histograms[route] = {
+                    name: Histogram(buckets)
+                    for name, (buckets, _) in HISTOGRAMS.items()
+                }
+            for name, value in values.items():
+                histograms[name].observe(value)
+            key = (route, status)
+            self._responses[key] = self._responses.get(key, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            self._histograms.clear()
+            self._responses.clear()
+
+    def render(self):
+        """Текстовый формат Prometheus."""
+        with self._lock:
+            lines = []
+            for name, (_, description) in HISTOGRAMS.items():
+                lines.append(f'# HELP {name} {description}')
+                lines.append(f'# TYPE {name} histogram')
+                for route, histograms in sorted(self._histograms.items()):
+                    histogram = histograms[name]
+                    label = f'route="{escape(route)}"'
+                    for bound, total in histogram.cumulative():
+                        lines.append(
+                            f'{name}_bucket{{{label},le="{bound}"}} {total}'
+                        )
+                    lines.append(f'{name}_sum{{{label}}} {histogram.sum}')
+                    lines.append(f'{name}_count{{{label}}} {histogram.count}')
+            lines.append('# HELP yamdb_responses_total Ответы по статусам.')
+            lines.append('# TYPE yamdb_responses_total counter')
+            for (route, status), total in sorted(self._responses.items()):
+                lines.append(
+                    f'yamdb_responses_total{{route="{escape(route)}",'
+                    f'status="{status}"}} {total}'
+                )
+        cache = response_cache.stats()
+        lines.extend((
+            '# HELP yamdb_response_cache_requests_total '
+            'Обращения к кэшу ответов.',
+            '# TYPE yamdb_response_cache_requests_total counter',
+            f'yamdb_response_cache_requests_total{{result="hit"}} '
+            f'{cache["hits"]}',
+            f'yamdb_response_cache_requests_total{{result="miss"}} '
+            f'{cache["misses"]}',
+        ))
+        return '\n'.join(lines) + '\n'
+
+
+@contextmanager
+def serialization_timer(request):
+    """Добавляет время блока к времени сериализации запроса."""
+    if request is None:
+        yield
+        return
+    request = getattr(request, '_request', request)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        request._serialize_seconds = getattr(
+            request, '_serialize_seconds', 0.0
+        ) + time.perf_counter() - started
+
+
+def escape(value):
+    return (value.replace('\\', '\\\\').replace('"', '\\"')
+            .replace('\n', '\\n'))
+
+
+route_metrics = RouteMetrics()
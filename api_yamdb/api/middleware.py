@@ -0,0 +1,68 @@
+import time
+
+from django.db import connection
+
+from .metrics import route_metrics
+
+UNRESOLVED = 'unresolved'
+
+
+class QueryTimer:
+    """Обёртка execute_wrapper: считает запросы и их суммарное время."""
+
+    __slots__ = ('queries', 'seconds')
+
+    def __init__(self):
+        self.queries = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - started
+            self.queries += 1
+
+
+class MetricsMiddleware:
+    """Собирает по имени маршрута число и время SQL-запросов, время
+    сериализации и рендеринга ответа и полное время обработки.
+
+    Сериализацию замеряют сами представления через serialization_timer.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timer = QueryTimer()
+        request._serialize_seconds = 0.0
+        request._render_seconds = 0.0
+        started = time.perf_counter()
+        with connection.execute_wrapper(timer):
+            response = self.get_response(request)
+        duration = time.perf_counter() - started
+        match = request.resolver_match
+        route_metrics.observe(
+            match.view_name if match else UNRESOLVED,
+            response.status_code,
+            {
+                'yamdb_request_duration_seconds': duration,
+                'yamdb_db_duration_seconds': timer.seconds,
+                'yamdb_serialize_duration_seconds':
+                    request._serialize_seconds,
+                'yamdb_render_duration_seconds': request._render_seconds,
+                'yamdb_db_queries': timer.queries,
+            },
+        )
+        return response
+
+    def process_template_response(self, request, response):
+        started = time.perf_counter()
+
+        def rendered(response):
+            request._render_seconds += time.perf_counter() - started
+
+        response.add_post_render_callback(rendered)
+        return response
@@ -1,8 +1,208 @@
-from rest_framework import mixins, viewsets
+from hashlib import md5
+
+from django.conf import settings
+from django.db.models import Count, Max, Subquery
+from django.utils.cache import get_conditional_response
+from rest_framework import mixins, status, viewsets
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from reviews.models import Change
+
+from .metrics import serialization_timer
+from .response_cache import response_cache
+
+
+class TimedListMixin:
+    """list, в котором время сериализатора замеряется для метрик
+    отдельно от запросов к базе."""
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        if page is None:
+            page = list(queryset)
+            paginated = False
+        else:
+            paginated = True
+        with serialization_timer(request):
+            data = self.get_serializer(page, many=True).data
+        if paginated:
+            return self.get_paginated_response(data)
+        return Response(data)
+
+
+class TimedSerializationMixin(TimedListMixin):
+    """То же для list и retrieve."""
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        with serialization_timer(request):
+            data = self.get_serializer(instance).data
+        return Response(data)
 
 
 class CreateListDestroyViewSet(mixins.CreateModelMixin,
+                               TimedListMixin,
                                mixins.ListModelMixin,
                                mixins.DestroyModelMixin,
                                viewsets.GenericViewSet):
     pass
+
+
+class CachedListMixin:
+    """Отдаёт list из response_cache.
+
+    cache_models — модели, изменение которых делает ответ устаревшим.
+    """
+    cache_models = ()
+
+    def cached_response(self, request, handler, *args, **kwargs):
+        """Ответ handler из response_cache по url и версиям
+        cache_models; кэшируются только ответы 200."""
+        key = response_cache.make_key(
+            self.basename, request,
+            [model._meta.label_lower for model in self.cache_models]
+        )
+        data = response_cache.get(key)
+        if data is not None:
+            return Response(data, headers={'X-Cache': 'HIT'})
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            response_cache.set(key, response.data)
+        response['X-Cache'] = 'MISS'
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(
+            request, super().list, *args, **kwargs
+        )
+
+
+class ConditionalListMixin:
+    """Отвечает 304 на условный GET, не выполняя сериализацию.
+
+    ETag считается одним агрегатом отфильтрованного queryset: количество,
+    максимальный id и последняя запись журнала изменений по
+    cache_models. Журнал лежит в базе, поэтому правку из любого процесса
+    видят все процессы; версии response_cache для этого не годятся, они
+    хранятся в кэше процесса.
+    Last-Modified не отдаётся: дата создания не меняется при правке и
+    удалении, и If-Modified-Since давал бы 304 с устаревшими данными.
+    """
+
+    def get_etag(self, request):
+        queryset = self.filter_queryset(self.get_queryset()).order_by()
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        if lookup_url_kwarg in self.kwargs:
+            queryset = queryset.filter(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+            )
+        last_change = Change.objects.filter(model__in=[
+            model._meta.model_name for model in self.cache_models
+        ]).order_by('-id').values('id')[:1]
+        values = queryset.aggregate(
+            count=Count('pk'), last_id=Max('pk'),
+            last_change=Max(Subquery(last_change)),
+        )
+        state = (request.get_full_path(), values)
+        etag = md5(repr(state).encode('utf-8')).hexdigest()
+        return f'"{etag}"'
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        etag = self.get_etag(request)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        if response.status_code in (status.HTTP_200_OK,
+                                    status.HTTP_304_NOT_MODIFIED):
+            response['ETag'] = etag
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().list, request, *args, **kwargs
+        )
+
+
+class ConditionalListRetrieveMixin(ConditionalListMixin):
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+
+class FacetsMixin:
+    """Добавляет к ответу list счётчики по измерениям из ?facets=.
+
+    Без фильтров счётчики берутся из response_cache с версиями
+    facet_cache_models: они не зависят от страницы и сортировки.
+    """
+    facets = {}
+    facet_cache_models = ()
+    # Параметры, которые не меняют набор объектов.
+    unfiltered_params = frozenset(
+        ('facets', 'limit', 'offset', 'ordering', 'cursor', 'format')
+    )
+
+    def get_requested_facets(self, request):
+        names = [name.strip() for name in
+                 request.query_params.get('facets', '').split(',')
+                 if name.strip()]
+        unknown = sorted(set(names) - set(self.facets))
+        if unknown:
+            raise ValidationError({'facets': (
+                f'Неизвестные измерения: {", ".join(unknown)}. '
+                f'Доступны: {", ".join(self.facets)}'
+            )})
+        return list(dict.fromkeys(names))
+
+    def count_facets(self, request, names):
+        if set(request.query_params) <= self.unfiltered_params:
+            return {name: self.cached_facet(name) for name in names}
+        titles = self.filter_queryset(self.get_queryset())
+        return {name: self.facets[name](titles) for name in names}
+
+    def cached_facet(self, name):
+        key = response_cache.versioned_key(
+            f'{self.basename}-facets',
+            [model._meta.label_lower for model in self.facet_cache_models],
+            name,
+        )
+        data = response_cache.get(key)
+        if data is None:
+            data = self.facets[name](None)
+            response_cache.set(key, data)
+        return data
+
+    def list(self, request, *args, **kwargs):
+        names = self.get_requested_facets(request)
+        response = super().list(request, *args, **kwargs)
+        if names and response.status_code == status.HTTP_200_OK:
+            if not isinstance(response.data, dict):
+                response.data = {'results': response.data}
+            response.data['facets'] = self.count_facets(request, names)
+        return response
+
+
+class FastListMixin:
+    """list через values_plan вместо сериализатора.
+
+    Включается настройкой FAST_LIST_SERIALIZATION.
+    """
+    values_plan = None
+
+    def list(self, request, *args, **kwargs):
+        if self.values_plan is None or not getattr(
+                settings, 'FAST_LIST_SERIALIZATION', False):
+            return super().list(request, *args, **kwargs)
+        queryset = self.values_plan.values(
+            self.filter_queryset(self.get_queryset())
+        )
+        page = self.paginate_queryset(queryset)
+        rows = self.values_plan.load(queryset if page is None else page)
+        with serialization_timer(request):
+            data = self.values_plan.render(rows, loaded=True)
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
@@ -0,0 +1,115 @@
+from base64 import b64decode, b64encode
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db.models import F, Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (BasePagination, LimitOffsetPagination,
+                                       _positive_int)
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """Постраничный вывод по ключу (pub_date, id) без OFFSET и COUNT.
+
+    Курсор хранит дату и id последнего объекта страницы, поэтому
+    стоимость страницы не зависит от того, насколько далеко она от начала.
+    Дата берётся из аннотации запроса, а не из сериализованного ответа:
+    так курсор не зависит от формата дат в выдаче.
+    """
+    position_field = 'keyset_pub_date'
+    cursor_query_param = 'cursor'
+    limit_query_param = 'limit'
+    default_limit = settings.REST_FRAMEWORK['PAGE_SIZE']
+    max_limit = 1000
+    invalid_cursor_message = 'Неверный курсор.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.limit = self.get_limit(request)
+        position = self.decode_cursor(request)
+        queryset = queryset.annotate(
+            **{self.position_field: F('pub_date')}
+        ).order_by('-pub_date', '-id')
+        if position is not None:
+            pub_date, pk = position
+            queryset = queryset.filter(
+                Q(pub_date__lt=pub_date) | Q(pub_date=pub_date, id__lt=pk)
+            )
+        page = list(queryset[:self.limit + 1])
+        self.has_next = len(page) > self.limit
+        self.page = page[:self.limit]
+        self.next_position = (
+            self.get_position(self.page[-1]) if self.has_next else None
+        )
+        return self.page
+
+    def get_position(self, item):
+        """Дата и id объекта модели или строки .values()."""
+        if isinstance(item, dict):
+            return item[self.position_field], item['id']
+        return getattr(item, self.position_field), item.pk
+
+    def get_limit(self, request):
+        try:
+            return _positive_int(
+                request.query_params[self.limit_query_param],
+                strict=True,
+                cutoff=self.max_limit
+            )
+        except (KeyError, ValueError):
+            return self.default_limit
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            raw_date, raw_pk = b64decode(
+                encoded.encode('ascii'), altchars=b'-_'
+            ).decode('ascii').split('|')
+            pub_date = parse_datetime(raw_date)
+            pk = int(raw_pk)
+        except (TypeError, ValueError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+        if pub_date is None:
+            raise NotFound(self.invalid_cursor_message)
+        return pub_date, pk
+
+    def encode_cursor(self, position):
+        pub_date, pk = position
+        raw = f'{pub_date.isoformat()}|{pk}'
+        return b64encode(raw.encode('ascii'), altchars=b'-_').decode('ascii')
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.cursor_query_param,
+            self.encode_cursor(self.next_position)
+        )
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('results', data)
+        ]))
+
+
+class LimitOffsetOrKeysetPagination(LimitOffsetPagination):
+    """LimitOffset по умолчанию, keyset — если в запросе есть `cursor`."""
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if KeysetPagination.cursor_query_param in request.query_params:
+            self.keyset = KeysetPagination()
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
@@ -0,0 +1,48 @@
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+drf_encoder = encoders.JSONEncoder()
+
+
+def encode_default(obj):
+    """Типы, которых нет в JSON: datetime, Decimal, UUID и прочие.
+
+    Кодируются так же, как в JSONEncoder DRF, чтобы ответ не зависел
+    от выбранного рендерера.
+    """
+    return drf_encoder.default(obj)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer на orjson, если он установлен.
+
+    Без orjson и для ответов с отступами работает стандартный рендерер.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or self.ensure_ascii:
+            return super().render(
+                data, accepted_media_type, renderer_context
+            )
+        if data is None:
+            return b''
+        indent = self.get_indent(accepted_media_type,
+                                 renderer_context or {})
+        if indent is not None or not self.compact:
+            return super().render(
+                data, accepted_media_type, renderer_context
+            )
+        ret = orjson.dumps(
+            data,
+            default=encode_default,
+            option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS,
+        )
+        # Как и JSONRenderer, экранируем U+2028 и U+2029.
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(
+            b'\xe2\x80\xa9', b'\\u2029'
+        )
@@ -0,0 +1,112 @@
+import secrets
+import threading
+from hashlib import md5
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+RESPONSE_CACHE_SETTINGS = getattr(settings, 'RESPONSE_CACHE', {})
+GLOBAL_VERSION = 'global'
+
+
+def fresh_version():
+    """Случайная начальная версия модели.
+
+    Если бэкенд вытеснил ключ версии, счёт не начинается заново с нуля,
+    и записи, сохранённые под прежними номерами, не оживают.
+    """
+    return secrets.randbits(48)
+
+
+class ResponseCache:
+    """Кэш ответов list-эндпоинтов с версиями по моделям.
+
+    Ключ ответа включает версии всех моделей, от которых зависит ответ.
+    Изменение модели увеличивает её версию, и старые ключи перестают
+    использоваться, а записи вытесняются бэкендом по таймауту.
+    Бэкенд выбирается алиасом из CACHES.
+    """
+
+    def __init__(self, alias='default', timeout=300, prefix='responses'):
+        self.alias = alias
+        self.timeout = timeout
+        self.prefix = prefix
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @property
+    def backend(self):
+        return caches[self.alias]
+
+    def version_key(self, label):
+        return f'{self.prefix}:version:{label}'
+
+    def versions(self, labels):
+        keys = [self.version_key(label) for label in labels]
+        stored = self.backend.get_many(keys)
+        missing = [key for key in keys if key not in stored]
+        if missing:
+            for key in missing:
+                self.backend.add(key, fresh_version(), timeout=None)
+            stored.update(self.backend.get_many(missing))
+        return [stored.get(key, 0) for key in keys]
+
+    def bump(self, label):
+        """Сменяет версию модели после фиксации текущей транзакции.
+
+        Смена до COMMIT позволила бы параллельному запросу сохранить
+        старые данные под новой версией.
+        """
+        transaction.on_commit(lambda: self.bump_now(label))
+
+    def bump_now(self, label):
+        key = self.version_key(label)
+        try:
+            self.backend.incr(key)
+        except ValueError:
+            self.backend.add(key, fresh_version(), timeout=None)
+
+    def make_key(self, name, request, labels):
+        query = '&'.join(
+            f'{param}={value}'
+            for param in sorted(request.query_params)
+            for value in sorted(request.query_params.getlist(param))
+        )
+        url = request.build_absolute_uri(request.path)
+        digest = md5(f'{url}?{query}'.encode('utf-8')).hexdigest()
+        return self.versioned_key(name, labels, digest)
+
+    def versioned_key(self, name, labels, suffix):
+        labels = [GLOBAL_VERSION, *labels]
+        versions = '.'.join(map(str, self.versions(labels)))
+        return f'{self.prefix}:{name}:{versions}:{suffix}'
+
+    def get(self, key):
+        data = self.backend.get(key)
+        with self._lock:
+            if data is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return data
+
+    def set(self, key, data):
+        self.backend.set(key, data, timeout=self.timeout)
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / total if total else 0.0,
+            }
+
+
+response_cache = ResponseCache(
+    alias=RESPONSE_CACHE_SETTINGS.get('ALIAS', 'default'),
+    timeout=RESPONSE_CACHE_SETTINGS.get('TIMEOUT', 300),
+    prefix=RESPONSE_CACHE_SETTINGS.get('KEY_PREFIX', 'responses'),
+)
@@ -1,8 +1,11 @@
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 from rest_framework.generics import get_object_or_404
+from rest_framework.utils import model_meta
 
-from reviews.models import Category, Comment, Genre, Review, Title, User
+from reviews.models import (Category, Comment, Genre, Review, SimilarTitle,
+                            Title, TitleStats, TrendingTitle, User)
+from reviews.stats import SCORES, score_field
 from reviews.utils import ROLES, USER
 from reviews.validators import username_not_me
 
@@ -103,21 +106,6 @@ class ReviewSerializer(serializers.ModelSerializer):
         model = Review
         fields = ('id', 'text', 'author', 'score', 'pub_date',)
 
-    def validate(self, data):
-        request = self.context['request']
-        title_id = self.context['view'].kwargs.get('title_id')
-        title = get_object_or_404(Title, pk=title_id)
-        if request.method == 'POST':
-            if Review.objects.filter(
-                    title=title,
-                    author=request.user
-            ).exists():
-                raise ValidationError(
-                    'Можно добавить только'
-                    'один отзыв на произведение'
-                )
-        return data
-
 
 class GenreSerializer(serializers.ModelSerializer):
 
@@ -133,10 +121,35 @@ class CategorySerializer(serializers.ModelSerializer):
         model = Category
 
 
-class TitleSerializer(serializers.ModelSerializer):
+class ChangedFieldsUpdateMixin:
+    """Сохраняет при обновлении только переданные поля.
+
+    Полный save() записал бы обратно загруженные значения счётчиков
+    рейтинга и затёр бы их параллельные обновления через F().
+    """
+
+    def update(self, instance, validated_data):
+        relations = model_meta.get_field_info(instance).relations
+        many_to_many = {}
+        for attr, value in validated_data.items():
+            if attr in relations and relations[attr].to_many:
+                many_to_many[attr] = value
+            else:
+                setattr(instance, attr, value)
+        instance.save(update_fields=[
+            attr for attr in validated_data if attr not in many_to_many
+        ])
+        for attr, value in many_to_many.items():
+            getattr(instance, attr).set(value)
+        return instance
+
+
+class TitleSerializer(ChangedFieldsUpdateMixin, serializers.ModelSerializer):
     category = CategorySerializer(read_only=True)
     genre = GenreSerializer(read_only=True, many=True)
-    rating = serializers.IntegerField()
+    rating = serializers.IntegerField(read_only=True)
+    rating_bayesian = serializers.FloatField(read_only=True)
+    rating_decayed = serializers.FloatField(read_only=True)
 
     class Meta:
         fields = (
@@ -144,6 +157,8 @@ class TitleSerializer(serializers.ModelSerializer):
             'name',
             'year',
             'rating',
+            'rating_bayesian',
+            'rating_decayed',
             'description',
             'genre',
             'category'
@@ -151,7 +166,8 @@ class TitleSerializer(serializers.ModelSerializer):
         model = Title
 
 
-class TitleCreateSerializer(serializers.ModelSerializer):
+class TitleCreateSerializer(ChangedFieldsUpdateMixin,
+                            serializers.ModelSerializer):
     genre = serializers.SlugRelatedField(
         slug_field='slug',
         many=True,
@@ -165,3 +181,38 @@ class TitleCreateSerializer(serializers.ModelSerializer):
     class Meta:
         fields = '__all__'
         model = Title
+
+
+class TitleStatsSerializer(serializers.ModelSerializer):
+    """Распределение оценок тайтла."""
+    scores = serializers.SerializerMethodField()
+
+    class Meta:
+        model = TitleStats
+        fields = ('title', 'scores', 'total', 'last_review')
+
+    def get_scores(self, stats):
+        return {str(score): getattr(stats, score_field(score))
+                for score in SCORES}
+
+
+class SimilarTitleSerializer(serializers.ModelSerializer):
+    """Похожее произведение и мера сходства."""
+    id = serializers.IntegerField(source='similar_id')
+    name = serializers.CharField(source='similar.name')
+    year = serializers.IntegerField(source='similar.year')
+
+    class Meta:
+        model = SimilarTitle
+        fields = ('id', 'name', 'year', 'score')
+
+
+class TrendingTitleSerializer(serializers.ModelSerializer):
+    """Популярное произведение: отзывы и средняя оценка за окно."""
+    id = serializers.IntegerField(source='title_id')
+    name = serializers.CharField(source='title.name')
+    year = serializers.IntegerField(source='title.year')
+
+    class Meta:
+        model = TrendingTitle
+        fields = ('id', 'name', 'year', 'reviews', 'score')
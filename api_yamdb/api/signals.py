@@ -0,0 +1,35 @@
+from django.db.models.signals import (m2m_changed, post_delete, post_migrate,
+                                      post_save)
+from django.dispatch import receiver
+from rest_framework_simplejwt.settings import api_settings
+
+from reviews.models import Category, Comment, Genre, Review, Title, User
+
+from .authentication import user_cache
+from .response_cache import GLOBAL_VERSION, response_cache
+
+
+@receiver((post_save, post_delete), sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    user_cache.delete(getattr(instance, api_settings.USER_ID_FIELD))
+
+
+@receiver((post_save, post_delete), sender=Category)
+@receiver((post_save, post_delete), sender=Genre)
+@receiver((post_save, post_delete), sender=Title)
+@receiver((post_save, post_delete), sender=Review)
+@receiver((post_save, post_delete), sender=Comment)
+def invalidate_cached_responses(sender, **kwargs):
+    response_cache.bump(sender._meta.label_lower)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def invalidate_cached_title_genres(sender, action, **kwargs):
+    if action.startswith('post_'):
+        response_cache.bump(Title._meta.label_lower)
+
+
+@receiver(post_migrate)
+def invalidate_all_cached_responses(sender, **kwargs):
+    """После migrate и flush закэшированные ответы недействительны."""
+    response_cache.bump_now(GLOBAL_VERSION)
@@ -1,7 +1,8 @@
-from django.urls import include, path
+from django.urls import include, path, re_path
 from rest_framework.routers import DefaultRouter
 
-from .views import (CategoryViewSet, CommentViewSet, GenreViewSet,
+from .views import (AutocompleteView, CategoryViewSet, ChangesView,
+                    CommentViewSet, ExportView, GenreViewSet, MetricsView,
                     RegistrationViewSet, ReviewViewSet, TitleViewSet,
                     TokenObtainViewset, UserViewSet)
 
@@ -23,5 +24,15 @@ router.register('titles', TitleViewSet, basename='titles')
 urlpatterns = [
     path('v1/', include(router.urls)),
     path('v1/auth/token/', TokenObtainViewset.as_view(
-        actions={'post': 'update'}))
+        actions={'post': 'update'})),
+    re_path(
+        r'^v1/export/(?P<resource>titles|reviews|comments)'
+        r'\.(?P<output>csv|ndjson)$',
+        ExportView.as_view(),
+        name='export'
+    ),
+    path('v1/changes/', ChangesView.as_view(), name='changes'),
+    path('v1/autocomplete/', AutocompleteView.as_view(),
+         name='autocomplete'),
+    path('v1/metrics/', MetricsView.as_view(), name='metrics'),
 ]
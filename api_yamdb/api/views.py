@@ -1,30 +1,51 @@
 import secrets
 
-from django.conf import settings
-from django.core.mail import send_mail
-from django.db import models
-from django.shortcuts import get_object_or_404
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import IntegrityError, transaction
+from django.db.models import Prefetch
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.utils.functional import cached_property
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import mixins, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.filters import SearchFilter
+from rest_framework.generics import get_object_or_404
 from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import RefreshToken
 
-from reviews.models import Category, Genre, Review, Title, User
+from reviews.autocomplete import autocomplete_index
+from reviews.changes import changes_since, cursor_expired, latest_cursor
+from reviews.models import (Category, Comment, Genre, Review, SimilarTitle,
+                            Title, TitleRank, TitleStats, TrendingTitle,
+                            User)
+from reviews.rankings import top_title_ids
+from reviews.stats import restore_title_stats
+from reviews.outbox import enqueue_email
 
-from .filters import TitleFilter
-from .mixins import CreateListDestroyViewSet
+from .changes import build_changes
+from .export import CONTENT_TYPES, STREAMS
+from .filters import TitleFilter, TitleOrderingFilter
+from .facets import TITLE_FACETS
+from .fast_serializers import COMMENT_PLAN, REVIEW_PLAN, TITLE_PLAN
+from .metrics import route_metrics, serialization_timer
+from .mixins import (CachedListMixin, ConditionalListMixin,
+                     ConditionalListRetrieveMixin, CreateListDestroyViewSet,
+                     FacetsMixin, FastListMixin, TimedSerializationMixin)
+from .pagination import LimitOffsetOrKeysetPagination
 from .permissions import (IsAdminOrSuperuser,
                           IsAdminOrSuperuserOrReadOnly,
                           IsAuthorOrAdminOrModerator)
 from .serializers import (AdminRegistrationSerializer, CategorySerializer,
                           CommentSerializer, GenreSerializer,
                           RegistrationSerializer, ReviewSerializer,
-                          TitleCreateSerializer, TitleSerializer,
-                          TokenObtainSerializer, UserSerializer)
+                          SimilarTitleSerializer, TitleCreateSerializer,
+                          TitleSerializer, TitleStatsSerializer,
+                          TokenObtainSerializer, TrendingTitleSerializer,
+                          UserSerializer)
 
 
 class RegistrationViewSet(mixins.CreateModelMixin, viewsets.GenericViewSet):
@@ -39,10 +60,11 @@ class RegistrationViewSet(mixins.CreateModelMixin, viewsets.GenericViewSet):
 
     def perform_create(self, serializer):
         code = secrets.token_urlsafe(nbytes=10)
-        send_mail(subject='Confirmation Code for Yamdb',
-                  message=code, from_email=settings.ADMIN_EMAIL,
-                  recipient_list=[self.request.data['email']])
-        serializer.save(confirmation_code=code)
+        with transaction.atomic():
+            user = serializer.save(confirmation_code=code)
+            enqueue_email(recipient=user.email,
+                          subject='Confirmation Code for Yamdb',
+                          message=code)
 
 
 class TokenObtainViewset(viewsets.GenericViewSet):
@@ -51,12 +73,15 @@ class TokenObtainViewset(viewsets.GenericViewSet):
     def update(self, request):
         serializer = TokenObtainSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        token = RefreshToken.for_user(self.get_object())
+        user = get_object_or_404(
+            User, username=serializer.validated_data['username']
+        )
+        token = RefreshToken.for_user(user)
         return Response({"token": str(token.access_token)},
                         status=status.HTTP_200_OK)
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(TimedSerializationMixin, viewsets.ModelViewSet):
     queryset = User.objects.all()
     lookup_field = 'username'
     permission_classes = (IsAuthenticated, IsAdminOrSuperuser, )
@@ -84,39 +109,65 @@ class UserViewSet(viewsets.ModelViewSet):
             return Response(serializer.data)
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(ConditionalListRetrieveMixin, FastListMixin,
+                    TimedSerializationMixin, viewsets.ModelViewSet):
     serializer_class = ReviewSerializer
-    pagination_class = LimitOffsetPagination
+    pagination_class = LimitOffsetOrKeysetPagination
     permission_classes = (IsAuthorOrAdminOrModerator,)
+    cache_models = (Review,)
+    values_plan = REVIEW_PLAN
+
+    @cached_property
+    def title(self):
+        return get_object_or_404(Title, id=self.kwargs.get('title_id'))
 
     def get_queryset(self):
-        title = get_object_or_404(Title, id=self.kwargs.get('title_id'))
-        return title.reviews.all()
+        return self.title.reviews.select_related('author')
 
     def perform_create(self, serializer):
-        title = get_object_or_404(Title, id=self.kwargs.get('title_id'))
-        serializer.save(author=self.request.user, title=title)
+        try:
+            with transaction.atomic():
+                serializer.save(author=self.request.user, title=self.title)
+        except IntegrityError:
+            # Повторный отзыв проверяется только после ошибки, остальные
+            # нарушения ограничений не маскируются.
+            if not self.title.reviews.filter(
+                    author=self.request.user).exists():
+                raise
+            raise ValidationError({'non_field_errors': [
+                'Можно добавить только один отзыв на произведение'
+            ]})
 
+    @transaction.atomic
+    def perform_update(self, serializer):
+        serializer.save()
 
-class CommentViewSet(viewsets.ModelViewSet):
+
+class CommentViewSet(ConditionalListRetrieveMixin, FastListMixin,
+                     TimedSerializationMixin, viewsets.ModelViewSet):
     serializer_class = CommentSerializer
-    pagination_class = LimitOffsetPagination
+    pagination_class = LimitOffsetOrKeysetPagination
     permission_classes = (IsAuthorOrAdminOrModerator,)
+    cache_models = (Comment,)
+    values_plan = COMMENT_PLAN
+
+    @cached_property
+    def review(self):
+        return get_object_or_404(Review, id=self.kwargs.get('review_id'),
+                                 title_id=self.kwargs.get('title_id'))
 
     def get_queryset(self):
-        review = get_object_or_404(Review, id=self.kwargs.get('review_id'))
-        return review.comments_review.all()
+        return self.review.comments_review.select_related('author')
 
     def perform_create(self, serializer):
-        title_id = self.kwargs.get('title_id')
-        review_id = self.kwargs.get('review_id')
-        review = get_object_or_404(Review, id=review_id, title=title_id)
-        serializer.save(author=self.request.user, review=review)
+        serializer.save(author=self.request.user, review=self.review)
 
 
-class CategoryViewSet(CreateListDestroyViewSet):
+class CategoryViewSet(ConditionalListMixin, CachedListMixin,
+                      CreateListDestroyViewSet):
     lookup_field = 'slug'
     queryset = Category.objects.all()
+    cache_models = (Category,)
     serializer_class = CategorySerializer
     pagination_class = LimitOffsetPagination
     filter_backends = (SearchFilter, )
@@ -124,9 +175,11 @@ class CategoryViewSet(CreateListDestroyViewSet):
     permission_classes = [IsAdminOrSuperuserOrReadOnly, ]
 
 
-class GenreViewSet(CreateListDestroyViewSet):
+class GenreViewSet(ConditionalListMixin, CachedListMixin,
+                   CreateListDestroyViewSet):
     lookup_field = 'slug'
     queryset = Genre.objects.all()
+    cache_models = (Genre,)
     serializer_class = GenreSerializer
     pagination_class = LimitOffsetPagination
     filter_backends = (SearchFilter, )
@@ -134,16 +187,205 @@ class GenreViewSet(CreateListDestroyViewSet):
     permission_classes = [IsAdminOrSuperuserOrReadOnly, ]
 
 
-class TitleViewSet(viewsets.ModelViewSet):
-    queryset = Title.objects.all().annotate(
-        rating=models.Avg('reviews__score')
-    )
+class TitleViewSet(ConditionalListRetrieveMixin, CachedListMixin,
+                   FacetsMixin, FastListMixin, TimedSerializationMixin,
+                   viewsets.ModelViewSet):
+    queryset = Title.objects.select_related('category').prefetch_related(
+        Prefetch('genre', queryset=Genre.objects.order_by('id'))
+    ).order_by('id')
+    cache_models = (Title, Genre, Category, Review)
+    values_plan = TITLE_PLAN
+    facets = TITLE_FACETS
+    facet_cache_models = (Title, Genre, Category)
     pagination_class = LimitOffsetPagination
-    filter_backends = (DjangoFilterBackend,)
+    filter_backends = (DjangoFilterBackend, TitleOrderingFilter)
     filterset_class = TitleFilter
     permission_classes = [IsAdminOrSuperuserOrReadOnly, ]
 
+    top_limit = 10
+    max_top_limit = 100
+
     def get_serializer_class(self):
         if self.request.method in ('POST', 'PATCH',):
             return TitleCreateSerializer
         return TitleSerializer
+
+    def get_board(self):
+        """Рейтинг из параметров: category, genre, year или общий."""
+        params = self.request.query_params
+        given = [name for name in ('category', 'genre', 'year')
+                 if name in params]
+        if len(given) > 1:
+            raise ValidationError(
+                'Укажите только один из параметров: category, genre, year'
+            )
+        if not given:
+            return TitleRank.ALL, 0
+        if given[0] == 'year':
+            try:
+                return TitleRank.YEAR, int(params['year'])
+            except ValueError:
+                raise ValidationError('year должен быть целым числом')
+        model = Category if given[0] == 'category' else Genre
+        return given[0], get_object_or_404(model, slug=params[given[0]]).id
+
+    @action(methods=['get'], detail=False, url_path='top')
+    def top(self, request):
+        """Лучшие тайтлы рейтинга из response_cache: места меняются
+        только вместе с cache_models."""
+        return self.cached_response(request, self.build_top)
+
+    def build_top(self, request):
+        try:
+            limit = int(request.query_params.get('limit', self.top_limit))
+        except ValueError:
+            raise ValidationError('limit должен быть целым числом')
+        ids = top_title_ids(
+            *self.get_board(), limit=max(1, min(limit, self.max_top_limit))
+        )
+        titles = self.get_queryset().in_bulk(ids)
+        with serialization_timer(request):
+            data = self.get_serializer(
+                [titles[pk] for pk in ids if pk in titles], many=True
+            ).data
+        return Response(data)
+
+    @action(methods=['get'], detail=False, url_path='trending')
+    def trending(self, request):
+        """Популярное за окно из списков rollup_trending."""
+        window = request.query_params.get('window', TrendingTitle.DAY)
+        if window not in dict(TrendingTitle.WINDOWS):
+            raise ValidationError(
+                'window должен быть одним из: ' + ', '.join(
+                    dict(TrendingTitle.WINDOWS)
+                )
+            )
+        try:
+            limit = int(request.query_params.get('limit', self.top_limit))
+        except ValueError:
+            raise ValidationError('limit должен быть целым числом')
+        trending = list(TrendingTitle.objects.filter(
+            window=window, rank__lte=max(1, min(limit, self.max_top_limit))
+        ).select_related('title').only(
+            'title_id', 'reviews', 'score', 'title__name', 'title__year'
+        ).order_by('rank'))
+        with serialization_timer(request):
+            data = TrendingTitleSerializer(trending, many=True).data
+        return Response(data)
+
+    @action(methods=['get'], detail=True, url_path='stats')
+    def stats(self, request, pk=None):
+        """Распределение оценок из TitleStats; недостающая строка
+        строится по отзывам тайтла."""
+        try:
+            stats = get_object_or_404(TitleStats, title_id=pk)
+        except Http404:
+            stats = restore_title_stats(get_object_or_404(Title, pk=pk).pk)
+        with serialization_timer(request):
+            data = TitleStatsSerializer(stats).data
+        return Response(data)
+
+    @action(methods=['get'], detail=True, url_path='similar')
+    def similar(self, request, pk=None):
+        """Соседи из build_similar_titles, одним запросом по индексу."""
+        try:
+            pk = Title._meta.pk.to_python(pk)
+        except DjangoValidationError:
+            raise Http404
+        similar = list(SimilarTitle.objects.filter(
+            title_id=pk
+        ).select_related('similar').only(
+            'similar_id', 'score', 'similar__name', 'similar__year'
+        ).order_by('rank'))
+        if not similar:
+            get_object_or_404(Title, pk=pk)
+        with serialization_timer(request):
+            data = SimilarTitleSerializer(similar, many=True).data
+        return Response(data)
+
+
+class ExportView(APIView):
+    """Потоковая выгрузка тайтлов, отзывов и комментариев в csv/ndjson."""
+    permission_classes = (IsAuthenticated, IsAdminOrSuperuser, )
+    default_chunk_size = 500
+    max_chunk_size = 10000
+
+    def get(self, request, resource, output):
+        try:
+            chunk_size = min(
+                int(request.query_params['chunk_size']), self.max_chunk_size
+            )
+        except (KeyError, ValueError):
+            chunk_size = self.default_chunk_size
+        response = StreamingHttpResponse(
+            STREAMS[output](resource, max(chunk_size, 1)),
+            content_type=CONTENT_TYPES[output],
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="{resource}.{output}"'
+        )
+        return response
+
+
+class ChangesView(APIView):
+    """Изменения тайтлов, отзывов, комментариев, жанров и категорий
+    после курсора `since`."""
+    permission_classes = (AllowAny, )
+    default_limit = 100
+    max_limit = 1000
+
+    def get(self, request):
+        try:
+            since = int(request.query_params.get('since', 0))
+            limit = int(request.query_params.get('limit', self.default_limit))
+        except ValueError:
+            raise ValidationError('since и limit должны быть целыми числами')
+        if since < 0 or limit < 1:
+            raise ValidationError(
+                'since должен быть неотрицательным, а limit — положительным'
+            )
+        if cursor_expired(since):
+            return Response({
+                'detail': 'Курсор старше хранимого журнала. Загрузите '
+                          'данные заново и продолжайте с cursor.',
+                'cursor': latest_cursor(),
+            }, status=status.HTTP_410_GONE)
+        cursor, has_more, latest = changes_since(
+            since, min(limit, self.max_limit)
+        )
+        upserts, deletes = build_changes(latest, request)
+        return Response({
+            'cursor': cursor,
+            'has_more': has_more,
+            'upserts': upserts,
+            'deletes': deletes,
+        })
+
+
+class AutocompleteView(APIView):
+    """Подсказки по началу названий тайтлов, жанров и категорий из
+    индекса в памяти, без запросов к базе."""
+    permission_classes = (AllowAny, )
+    default_limit = 10
+    max_limit = 50
+
+    def get(self, request):
+        try:
+            limit = int(request.query_params.get('limit', self.default_limit))
+        except ValueError:
+            raise ValidationError('limit должен быть целым числом')
+        return Response(autocomplete_index.search(
+            request.query_params.get('q', ''),
+            max(1, min(limit, self.max_limit)),
+        ))
+
+
+class MetricsView(APIView):
+    """Метрики маршрутов в текстовом формате Prometheus."""
+    permission_classes = (IsAuthenticated, IsAdminOrSuperuser, )
+
+    def get(self, request):
+        return HttpResponse(
+            route_metrics.render(),
+            content_type='text/plain; version=0.0.4; charset=utf-8',
+        )
@@ -18,12 +18,13 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
     'rest_framework',
     'rest_framework_simplejwt',
-    'api',
-    'reviews',
+    'api.apps.ApiConfig',
+    'reviews.apps.ReviewsConfig',
     'django_filters',
 ]
 
 MIDDLEWARE = [
+    'api.middleware.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -98,7 +99,16 @@ EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.CachedJWTAuthentication',
+    ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'api.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
     ),
     'DEFAULT_PAGINATION_CLASS':
         'rest_framework.pagination.LimitOffsetPagination',
@@ -110,4 +120,55 @@ SIMPLE_JWT = {
     'REFRESH_TOKEN_LIFETIME': timedelta(days=3),
 }
 
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+RESPONSE_CACHE = {
+    'ALIAS': 'default',
+    'TIMEOUT': 300,
+    'KEY_PREFIX': 'responses',
+}
+
+# Списки тайтлов, отзывов и комментариев через .values() без сериализатора.
+FAST_LIST_SERIALIZATION = False
+
+JWT_USER_CACHE = {
+    'MAX_SIZE': 10000,
+    'TTL': 60,
+}
+
+# Журнал изменений: записи моложе SAFE_LAG_SECONDS ещё не отдаются, чтобы
+# не пропустить транзакции, зафиксированные не в порядке id. Команда
+# prune_changes удаляет записи старше RETENTION_DAYS.
+CHANGE_FEED = {
+    'SAFE_LAG_SECONDS': 5,
+    'RETENTION_DAYS': 30,
+}
+
+# Байесовский рейтинг: вес априорной средней в числе отзывов.
+# Рейтинг с затуханием: за период полураспада вес отзыва падает вдвое.
+# После изменения настроек выполните rebuild_title_ratings.
+RATINGS = {
+    'BAYESIAN_PRIOR_WEIGHT': 10,
+    'DECAY_HALF_LIFE_DAYS': 365,
+}
+
+# Границы корзин гистограмм для /api/v1/metrics/.
+METRICS = {
+    'SECONDS_BUCKETS': (
+        0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5,
+    ),
+    'QUERY_BUCKETS': (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89),
+}
+
+# Индекс автодополнения в памяти процесса перестраивается целиком не
+# реже раза в MAX_AGE секунд, чтобы подхватить изменения из других
+# процессов.
+AUTOCOMPLETE = {
+    'MAX_AGE': 300,
+}
+
 ADMIN_EMAIL = 'registration@yamdb.com'
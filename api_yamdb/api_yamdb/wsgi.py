@@ -5,3 +5,9 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
 
 application = get_wsgi_application()
+
+# Индекс подсказок собирается в фоне сразу при старте, а не первым
+# запросом к /autocomplete/.
+from reviews.autocomplete import autocomplete_index  # noqa: E402
+
+autocomplete_index.refresh()
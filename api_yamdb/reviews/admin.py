@@ -1,7 +1,8 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 
-from .models import Category, Comment, Genre, Review, Title, User
+from .models import (Category, Comment, Genre, OutboxEmail, Review, Title,
+                     User)
 
 
 class ReviewAdmin(admin.ModelAdmin):
@@ -52,3 +53,11 @@ class GenreAdmin(admin.ModelAdmin):
 class TitleAdmin(admin.ModelAdmin):
     list_display = ('pk', 'name', 'year', 'description', 'category')
     empty_value_display = '-пусто-'
+
+
+@admin.register(OutboxEmail)
+class OutboxEmailAdmin(admin.ModelAdmin):
+    list_display = ('pk', 'recipient', 'subject', 'created', 'sent_at',
+                    'attempts')
+    list_filter = ('sent_at',)
+    empty_value_display = '-пусто-'
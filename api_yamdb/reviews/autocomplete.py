@@ -0,0 +1,256 @@
+import threading
+import time
+from bisect import bisect_left, insort
+from heapq import nsmallest
+
+from django.conf import settings
+from django.db import connection
+
+from .models import Category, Genre, Title
+from .search import TOKEN_RE
+
+AUTOCOMPLETE_SETTINGS = getattr(settings, 'AUTOCOMPLETE', {})
+# Короткие префиксы совпадают с большой частью индекса, их результаты
+# запоминаются до следующего изменения индекса.
+MEMO_PREFIX_LENGTH = 2
+TITLE = 'title'
+GENRE = 'genre'
+CATEGORY = 'category'
+
+
+def normalize(text):
+    return ' '.join(TOKEN_RE.findall(text.casefold().replace('ё', 'е')))
+
+
+def prefix_keys(name):
+    """Ключи названия: оно само и его хвосты, начиная с каждого слова.
+
+    Так «туда» находит «Поворот туда».
+    """
+    words = normalize(name).split(' ')
+    return {' '.join(words[start:]) for start in range(len(words))} - {''}
+
+
+class IndexData:
+    """Ключи, названия и веса одной сборки индекса.
+
+    Ключи хранятся в отсортированном списке, совпадения по префиксу
+    лежат в нём подряд и находятся двоичным поиском. Вес тайтла — число
+    отзывов, вес жанра и категории — число отзывов на их тайтлы.
+    """
+
+    def __init__(self):
+        self.keys = []
+        self.items = {}
+        self.weights = {}
+        self.links = {}
+        self.memo = {}
+
+    @classmethod
+    def load(cls):
+        """Читает названия и число отзывов из базы."""
+        data = cls()
+        relations = [
+            (kind, list(model.objects.values_list('id', 'name', 'slug')))
+            for model, kind in ((Category, CATEGORY), (Genre, GENRE))
+        ]
+        titles = list(Title.objects.values_list(
+            'id', 'name', 'category_id', 'rating_count'
+        ))
+        genres = {}
+        for title_id, genre_id in Title.genre.through.objects.values_list(
+                'title_id', 'genre_id'):
+            genres.setdefault(title_id, set()).add(genre_id)
+        for kind, rows in relations:
+            for pk, name, slug in rows:
+                data.add((kind, pk), name, slug, keep_sorted=False)
+        for pk, name, category_id, reviews in titles:
+            data.add((TITLE, pk), name, keep_sorted=False)
+            data.links[pk] = (category_id, genres.get(pk, set()))
+            data.add_reviews(pk, reviews)
+        data.keys.sort()
+        return data
+
+    def add(self, item, name, slug=None, keep_sorted=True):
+        self.memo.clear()
+        self.items[item] = (name, slug)
+        self.weights.setdefault(item, 0)
+        for key in prefix_keys(name):
+            if keep_sorted:
+                insort(self.keys, (key, *item))
+            else:
+                self.keys.append((key, *item))
+
+    def remove(self, item):
+        self.memo.clear()
+        name, _ = self.items.pop(item)
+        self.weights.pop(item, None)
+        for key in prefix_keys(name):
+            position = bisect_left(self.keys, (key, *item))
+            if self.keys[position:position + 1] == [(key, *item)]:
+                del self.keys[position]
+
+    def related_items(self, title_id):
+        category_id, genre_ids = self.links[title_id]
+        items = [(GENRE, genre_id) for genre_id in genre_ids]
+        if category_id is not None:
+            items.append((CATEGORY, category_id))
+        return items
+
+    def add_reviews(self, title_id, delta, related_only=False):
+        items = self.related_items(title_id)
+        if not related_only:
+            items.append((TITLE, title_id))
+        self.memo.clear()
+        for item in items:
+            if item in self.weights:
+                self.weights[item] += delta
+
+    def put(self, kind, pk, name, slug=None):
+        weight = self.weights.get((kind, pk), 0)
+        if (kind, pk) in self.items:
+            self.remove((kind, pk))
+        self.add((kind, pk), name, slug)
+        self.weights[(kind, pk)] = weight
+
+    def search(self, prefix, limit):
+        if (prefix, limit) in self.memo:
+            return self.memo[(prefix, limit)]
+        found = set()
+        position = bisect_left(self.keys, (prefix,))
+        while (position < len(self.keys)
+               and self.keys[position][0].startswith(prefix)):
+            found.add(self.keys[position][1:])
+            position += 1
+        best = nsmallest(limit, found, key=lambda item: (
+            -self.weights[item], self.items[item][0], item
+        ))
+        result = [
+            {'type': kind, 'id': pk, 'name': self.items[(kind, pk)][0],
+             'slug': self.items[(kind, pk)][1],
+             'reviews': self.weights[(kind, pk)]}
+            for kind, pk in best
+        ]
+        if len(prefix) <= MEMO_PREFIX_LENGTH:
+            self.memo[(prefix, limit)] = result
+        return result
+
+
+class AutocompleteIndex:
+    """Префиксный индекс названий тайтлов, жанров и категорий в памяти
+    процесса.
+
+    Индекс собирается в фоновом потоке: при старте приложения из wsgi и
+    asgi, после reset() и раз в MAX_AGE секунд, чтобы подхватить
+    изменения из других процессов, сигналы которых сюда не доходят.
+    Запросы только читают готовые данные: устаревший индекс отдаётся,
+    пока не подставлен новый, до первой сборки подсказок нет. Между
+    сборками индекс обновляется сигналами после фиксации транзакций.
+    Изменения, зафиксированные во время сборки, могут дойти до индекса
+    только со следующей сборкой, как и изменения из других процессов.
+    """
+
+    def __init__(self, max_age=300):
+        self.max_age = max_age
+        self._lock = threading.RLock()
+        self.generation = 0
+        self.builder = None
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.generation += 1
+            self.data = None
+            self.built = None
+
+    def build(self):
+        with self._lock:
+            generation = self.generation
+        data = IndexData.load()
+        with self._lock:
+            # Сборку, начатую до reset(), не подставляем: база могла
+            # смениться целиком.
+            if generation == self.generation:
+                self.data = data
+                self.built = time.monotonic()
+
+    def build_in_background(self):
+        try:
+            self.build()
+        finally:
+            connection.close()
+
+    def refresh(self):
+        """Запускает сборку в фоновом потоке, если она ещё не идёт."""
+        with self._lock:
+            # После fork поток родителя в дочернем процессе не жив.
+            if self.builder is None or not self.builder.is_alive():
+                self.builder = threading.Thread(
+                    target=self.build_in_background,
+                    name='autocomplete-index', daemon=True,
+                )
+                self.builder.start()
+            return self.builder
+
+    def wait(self, timeout=None):
+        """Дожидается текущей фоновой сборки."""
+        builder = self.builder
+        if builder is not None:
+            builder.join(timeout)
+
+    def put(self, kind, pk, name, slug=None):
+        with self._lock:
+            if self.data is not None:
+                self.data.put(kind, pk, name, slug)
+
+    def remove(self, kind, pk):
+        with self._lock:
+            data = self.data
+            if data is None or (kind, pk) not in data.items:
+                return
+            if kind == TITLE:
+                data.add_reviews(pk, -data.weights[(kind, pk)])
+                del data.links[pk]
+            data.remove((kind, pk))
+
+    def put_title(self, title_id, name, category_id, genre_ids=None):
+        """Переиндексирует тайтл и переносит его отзывы между жанрами и
+        категориями. genre_ids — новые жанры, если они изменились."""
+        with self._lock:
+            data = self.data
+            if data is None:
+                return
+            weight = data.weights.get((TITLE, title_id), 0)
+            old_genre_ids = set()
+            if title_id in data.links:
+                old_genre_ids = data.links[title_id][1]
+                data.add_reviews(title_id, -weight, related_only=True)
+            data.put(TITLE, title_id, name)
+            data.links[title_id] = (
+                category_id,
+                old_genre_ids if genre_ids is None else set(genre_ids),
+            )
+            data.add_reviews(title_id, weight, related_only=True)
+
+    def add_reviews(self, title_id, delta):
+        with self._lock:
+            if self.data is not None and title_id in self.data.links:
+                self.data.add_reviews(title_id, delta)
+
+    def search(self, query, limit=10):
+        """Самые популярные названия, слова которых начинаются с query."""
+        prefix = normalize(query)
+        if not prefix:
+            return []
+        with self._lock:
+            if self.data is None or (
+                    time.monotonic() - self.built > self.max_age):
+                self.refresh()
+            if self.data is None:
+                return []
+            return self.data.search(prefix, limit)
+
+
+autocomplete_index = AutocompleteIndex(
+    max_age=AUTOCOMPLETE_SETTINGS.get('MAX_AGE', 300),
+)
@@ -0,0 +1,96 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Max, Min
+from django.utils import timezone
+
+from .models import Category, Change, Comment, Genre, Review, Title
+
+TRACKED_MODELS = (Category, Genre, Title, Review, Comment)
+
+
+def feed_setting(name, default):
+    return getattr(settings, 'CHANGE_FEED', {}).get(name, default)
+
+
+def change(model, object_id, action=Change.UPSERT):
+    return Change(
+        model=model._meta.model_name, object_id=object_id, action=action
+    )
+
+
+def record(changes):
+    """Пишет изменения в журнал одним запросом."""
+    Change.objects.bulk_create(changes)
+
+
+def record_changes(model, ids, action=Change.UPSERT):
+    record([change(model, pk, action) for pk in ids])
+
+
+def settled_changes(cursor):
+    """Записи после курсора, которые уже не могут пополниться.
+
+    id выдаются при вставке, а видны записи после COMMIT, поэтому
+    транзакция с меньшим id может зафиксироваться позже уже прочитанных
+    записей. Чтобы её не пропустить, отдаются только записи старше
+    SAFE_LAG_SECONDS и только до первой более свежей записи.
+    """
+    horizon = timezone.now() - timedelta(
+        seconds=feed_setting('SAFE_LAG_SECONDS', 5)
+    )
+    after_cursor = Change.objects.filter(id__gt=cursor)
+    high_water = after_cursor.filter(created__gt=horizon).aggregate(
+        first=Min('id')
+    )['first']
+    settled = after_cursor.filter(created__lte=horizon)
+    if high_water is not None:
+        settled = settled.filter(id__lt=high_water)
+    return settled
+
+
+def changes_since(cursor, limit):
+    """Изменения после курсора, свёрнутые до последнего по каждому объекту.
+
+    Возвращает новый курсор, признак наличия следующей пачки и словарь
+    {(модель, id): действие}.
+    """
+    rows = list(settled_changes(cursor).order_by('id').values_list(
+        'id', 'model', 'object_id', 'action'
+    )[:limit])
+    latest = {}
+    for _, model, object_id, action in rows:
+        latest[model, object_id] = action
+    next_cursor = rows[-1][0] if rows else cursor
+    return next_cursor, len(rows) == limit, latest
+
+
+def latest_cursor():
+    """Курсор, с которого продолжает клиент после полной перезагрузки."""
+    return settled_changes(0).aggregate(last=Max('id'))['last'] or 0
+
+
+def cursor_expired(cursor):
+    """Курсор старше удалённой части журнала: пропущенные изменения уже
+    не восстановить. Нулевой курсор — чтение с начала хранимого журнала."""
+    if not cursor:
+        return False
+    oldest = Change.objects.aggregate(first=Min('id'))['first']
+    return oldest is not None and cursor < oldest - 1
+
+
+def prune_changes(days=None):
+    """Удаляет записи журнала старше RETENTION_DAYS и возвращает их число.
+
+    Граница проводится по id, чтобы журнал оставался непрерывным.
+    """
+    if days is None:
+        days = feed_setting('RETENTION_DAYS', 30)
+    boundary = Change.objects.filter(
+        created__gte=timezone.now() - timedelta(days=days)
+    ).aggregate(first=Min('id'))['first']
+    expired = Change.objects.all()
+    if boundary is not None:
+        expired = expired.filter(id__lt=boundary)
+    deleted, _ = expired.delete()
+    return deleted
@@ -0,0 +1,49 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from reviews.similarity import build_similar_titles
+
+
+class Command(BaseCommand):
+    """Офлайн-расчёт похожих произведений."""
+
+    help = ('Считает для каждого тайтла top-K похожих по оценкам общих '
+            'авторов и по жанрам.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top-k', type=int, default=10)
+        parser.add_argument(
+            '--genre-weight', type=float, default=0.3,
+            help='Доля сходства по жанрам, от 0 до 1.',
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=500,
+            help='Скольким тайтлам записывать соседей за одну транзакцию.',
+        )
+        parser.add_argument(
+            '--genre-candidates', type=int, default=100,
+            help=('Сколько самых обсуждаемых тайтлов каждого жанра '
+                  'рассматривать как соседей по жанру.'),
+        )
+
+    def handle(self, *args, **options):
+        if not 0 <= options['genre_weight'] <= 1:
+            raise CommandError('--genre-weight должен быть от 0 до 1.')
+        if min(options['top_k'], options['chunk_size'],
+               options['genre_candidates']) < 1:
+            raise CommandError(
+                '--top-k, --chunk-size и --genre-candidates должны быть '
+                'положительными.'
+            )
+        started = time.monotonic()
+        written = build_similar_titles(
+            top_k=options['top_k'],
+            genre_weight=options['genre_weight'],
+            chunk_size=options['chunk_size'],
+            genre_candidates=options['genre_candidates'],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Записано соседей: {written} '
+            f'за {time.monotonic() - started:.1f} с'
+        ))
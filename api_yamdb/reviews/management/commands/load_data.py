@@ -0,0 +1,157 @@
+import csv
+import os
+import time
+from contextlib import contextmanager
+from itertools import islice
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+
+from reviews.autocomplete import autocomplete_index
+from reviews.changes import TRACKED_MODELS, record_changes
+from reviews.models import Category, Comment, Genre, Review, Title, User
+from reviews.rankings import rebuild_rankings
+from reviews.ratings import rebuild_title_ratings
+from reviews.search import fts_enabled, rebuild_index
+from reviews.stats import rebuild_title_stats
+from reviews.trending import rebuild_review_buckets, rollup_trending
+
+TitleGenre = Title.genre.through
+
+# Файл, модель и преобразование строки csv в поля модели.
+SOURCES = (
+    ('users.csv', User, lambda row: dict(
+        id=row['id'], username=row['username'], email=row['email'],
+        role=row['role'], bio=row['bio'], first_name=row['first_name'],
+        last_name=row['last_name'],
+    )),
+    ('category.csv', Category, lambda row: dict(
+        id=row['id'], name=row['name'], slug=row['slug'],
+    )),
+    ('genre.csv', Genre, lambda row: dict(
+        id=row['id'], name=row['name'], slug=row['slug'],
+    )),
+    ('titles.csv', Title, lambda row: dict(
+        id=row['id'], name=row['name'], year=row['year'],
+        description=row.get('description', ''),
+        category_id=row['category'] or None,
+    )),
+    ('genre_title.csv', TitleGenre, lambda row: dict(
+        id=row['id'], title_id=row['title_id'], genre_id=row['genre_id'],
+    )),
+    ('review.csv', Review, lambda row: dict(
+        id=row['id'], title_id=row['title_id'], text=row['text'],
+        author_id=row['author'], score=row['score'],
+        pub_date=row['pub_date'],
+    )),
+    ('comments.csv', Comment, lambda row: dict(
+        id=row['id'], review_id=row['review_id'], text=row['text'],
+        author_id=row['author'], pub_date=row['pub_date'],
+    )),
+)
+
+
+def dependency_order(sources):
+    """Сортирует источники так, чтобы модели загружались после тех,
+    на которые они ссылаются внешними ключами."""
+    by_model = {source[1]: source for source in sources}
+    ordered, visited = [], set()
+
+    def visit(model):
+        if model in visited:
+            return
+        visited.add(model)
+        for field in model._meta.concrete_fields:
+            related = field.related_model
+            if related in by_model and related is not model:
+                visit(related)
+        ordered.append(by_model[model])
+
+    for source in sources:
+        visit(source[1])
+    return ordered
+
+
+@contextmanager
+def keep_pub_date(model):
+    """Не даёт auto_now_add затереть дату публикации из csv."""
+    fields = [field for field in model._meta.concrete_fields
+              if getattr(field, 'auto_now_add', False)]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+class Command(BaseCommand):
+    """Пакетная загрузка всех csv файлов в БД.
+
+    bulk_create не отправляет сигналы, поэтому рейтинги, места в рейтингах,
+    статистика оценок, поисковый индекс и журнал изменений обновляются
+    здесь же.
+    """
+
+    help = 'Загружает данные из csv файлов пачками через bulk_create.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            default=os.path.join(settings.BASE_DIR, 'static', 'data'),
+            help='Каталог с csv файлами.',
+        )
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        path = options['path']
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError('--batch-size должен быть положительным.')
+        loaded = []
+        for filename, model, build in dependency_order(SOURCES):
+            filepath = os.path.join(path, filename)
+            if not os.path.exists(filepath):
+                self.stdout.write(f'{filename}: файл не найден, пропуск')
+                continue
+            started = time.monotonic()
+            rows = self.load(filepath, model, build, batch_size)
+            elapsed = max(time.monotonic() - started, 1e-6)
+            loaded.append(model)
+            self.stdout.write(
+                f'{filename}: {rows} строк, {rows / elapsed:.0f} строк/с'
+            )
+        self.reset_sequences(loaded)
+        rebuild_title_ratings(batch_size=batch_size)
+        rebuild_rankings(batch_size=batch_size)
+        rebuild_title_stats(batch_size=batch_size)
+        rebuild_review_buckets()
+        rollup_trending()
+        autocomplete_index.reset()
+        if fts_enabled():
+            rebuild_index()
+        self.stdout.write(self.style.SUCCESS('Загрузка завершена.'))
+
+    def load(self, filepath, model, build, batch_size):
+        rows = 0
+        with open(filepath, encoding='utf-8', newline='') as file:
+            objects = (model(**build(row)) for row in csv.DictReader(file))
+            with transaction.atomic(), keep_pub_date(model):
+                while True:
+                    batch = list(islice(objects, batch_size))
+                    if not batch:
+                        break
+                    model.objects.bulk_create(batch)
+                    if model in TRACKED_MODELS:
+                        record_changes(model, [obj.pk for obj in batch])
+                    rows += len(batch)
+        return rows
+
+    def reset_sequences(self, models):
+        statements = connection.ops.sequence_reset_sql(no_style(), models)
+        with connection.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(statement)
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from reviews.changes import prune_changes
+
+
+class Command(BaseCommand):
+    """Удаление старых записей журнала изменений."""
+
+    help = 'Удаляет записи журнала изменений старше срока хранения.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=None,
+            help='Срок хранения в днях; по умолчанию '
+                 "CHANGE_FEED['RETENTION_DAYS'].",
+        )
+
+    def handle(self, *args, **options):
+        if options['days'] is not None and options['days'] < 0:
+            raise CommandError('--days не может быть отрицательным.')
+        deleted = prune_changes(days=options['days'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Удалено записей журнала: {deleted}'
+        ))
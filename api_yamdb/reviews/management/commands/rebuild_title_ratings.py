@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from reviews.ratings import rebuild_title_ratings
+
+
+class Command(BaseCommand):
+    """Пересчёт сохранённых рейтингов тайтлов по таблице отзывов."""
+
+    help = 'Пересчитывает сумму и количество оценок у всех тайтлов.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        changed = rebuild_title_ratings(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Обновлено рейтингов: {changed}'
+        ))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from reviews.stats import rebuild_title_stats
+
+
+class Command(BaseCommand):
+    """Пересчёт статистики оценок тайтлов по таблице отзывов."""
+
+    help = 'Пересчитывает распределение оценок у всех тайтлов.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        changed = rebuild_title_stats(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Обновлено записей статистики: {changed}'
+        ))
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from reviews.trending import rebuild_review_buckets, rollup_trending
+
+
+class Command(BaseCommand):
+    """Периодическая свёртка часовых счётчиков отзывов в списки
+    популярного за сутки и за неделю."""
+
+    help = 'Пересчитывает списки популярных произведений.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--size', type=int, default=100)
+        parser.add_argument(
+            '--rebuild', action='store_true',
+            help='Сначала пересчитать часовые счётчики по таблице отзывов.'
+        )
+
+    def handle(self, *args, **options):
+        if options['size'] < 1:
+            raise CommandError('--size должен быть положительным.')
+        if options['rebuild']:
+            buckets = rebuild_review_buckets()
+            self.stdout.write(f'Часовых счётчиков: {buckets}')
+        rows = rollup_trending(size=options['size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Записей в списках популярного: {rows}'
+        ))
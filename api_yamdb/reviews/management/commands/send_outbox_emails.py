@@ -0,0 +1,60 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from reviews.outbox import OutboxWorker
+
+
+class Command(BaseCommand):
+    """Воркер, отправляющий письма из очереди OutboxEmail."""
+
+    help = 'Отправляет письма из очереди пачками в пуле потоков.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument('--workers', type=int, default=4)
+        parser.add_argument('--max-attempts', type=int, default=5)
+        parser.add_argument(
+            '--lease', type=int, default=300,
+            help='На сколько секунд воркер занимает пачку писем.',
+        )
+        parser.add_argument(
+            '--retry-delay', type=int, default=60,
+            help='Пауза перед повтором после первой ошибки, в секундах; '
+                 'с каждой попыткой удваивается.',
+        )
+        parser.add_argument(
+            '--interval', type=float, default=1.0,
+            help='Пауза между опросами пустой очереди, в секундах.',
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Разобрать очередь и завершить работу.',
+        )
+
+    def handle(self, *args, **options):
+        worker = OutboxWorker(
+            batch_size=options['batch_size'],
+            workers=options['workers'],
+            max_attempts=options['max_attempts'],
+            lease=options['lease'],
+            retry_delay=options['retry_delay'],
+        )
+        try:
+            while True:
+                if worker.process_batch():
+                    self.report(worker)
+                    continue
+                if options['once']:
+                    break
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
+        self.report(worker)
+
+    def report(self, worker):
+        self.stdout.write(
+            f'Отправлено: {worker.sent}, ошибок: {worker.failed}, '
+            f'в очереди: {worker.backlog}, '
+            f'писем/с: {worker.throughput:.1f}'
+        )
@@ -0,0 +1,39 @@
+from django.db import migrations
+
+# Копия reviews.search на момент миграции: миграции не импортируют
+# модули приложения, которые потом меняются.
+FTS_TABLE = 'reviews_title_fts'
+
+
+def create_title_fts(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != 'sqlite':
+        return
+    title_table = apps.get_model('reviews', 'Title')._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} '
+            f'USING fts5(name, description)'
+        )
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, name, description) '
+            f'SELECT id, name, description FROM {title_table}'
+        )
+
+
+def drop_title_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0010_outbox_email'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_title_fts, drop_title_fts),
+    ]
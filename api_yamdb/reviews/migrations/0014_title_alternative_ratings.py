@@ -0,0 +1,102 @@
+# Generated by Django 2.2.16 on 2026-10-18 03:56
+
+from datetime import datetime
+
+from django.conf import settings
+from django.db import migrations, models
+from django.utils.timezone import utc
+
+# Копия формул reviews.ratings на момент миграции: миграции не
+# импортируют модули приложения, которые потом меняются.
+RATINGS_SETTINGS = getattr(settings, 'RATINGS', {})
+PRIOR_WEIGHT = RATINGS_SETTINGS.get('BAYESIAN_PRIOR_WEIGHT', 10)
+HALF_LIFE_DAYS = RATINGS_SETTINGS.get('DECAY_HALF_LIFE_DAYS', 365)
+DECAY_EPOCH = datetime(2020, 1, 1, tzinfo=utc)
+
+
+def decay_weight(pub_date):
+    days = (pub_date - DECAY_EPOCH).total_seconds() / 86400
+    return 2 ** (days / HALF_LIFE_DAYS)
+
+
+def bayesian(rating_sum, rating_count, prior_mean):
+    return ((PRIOR_WEIGHT * prior_mean + rating_sum)
+            / (PRIOR_WEIGHT + rating_count))
+
+
+def fill_alternative_ratings(apps, schema_editor):
+    RatingPrior = apps.get_model('reviews', 'RatingPrior')
+    Review = apps.get_model('reviews', 'Review')
+    Title = apps.get_model('reviews', 'Title')
+    totals = {}
+    rows = Review.objects.order_by().values_list('title_id', 'score',
+                                                 'pub_date')
+    for title_id, score, pub_date in rows.iterator():
+        weight = decay_weight(pub_date)
+        total = totals.setdefault(title_id, [0, 0, 0.0, 0.0])
+        total[0] += score
+        total[1] += 1
+        total[2] += score * weight
+        total[3] += weight
+    count = sum(total[1] for total in totals.values())
+    mean = sum(total[0] for total in totals.values()) / count if count else 0
+    RatingPrior.objects.create(pk=1, mean=mean)
+    for title_id, (score_sum, score_count, decay_sum, weights) in (
+            totals.items()):
+        Title.objects.filter(pk=title_id).update(
+            decay_score_sum=decay_sum,
+            decay_weight=weights,
+            rating_bayesian=bayesian(score_sum, score_count, mean),
+            rating_decayed=decay_sum / weights,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0013_title_review_covering_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RatingPrior',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('mean', models.FloatField(default=0, verbose_name='Средняя оценка')),
+                ('updated', models.DateTimeField(auto_now=True, verbose_name='Дата пересчёта')),
+            ],
+            options={
+                'verbose_name': 'Априорный рейтинг',
+                'verbose_name_plural': 'Априорный рейтинг',
+            },
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='decay_score_sum',
+            field=models.FloatField(default=0, verbose_name='Сумма оценок с весами затухания'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='decay_weight',
+            field=models.FloatField(default=0, verbose_name='Сумма весов затухания'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='rating_bayesian',
+            field=models.FloatField(blank=True, null=True, verbose_name='Байесовский рейтинг'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='rating_decayed',
+            field=models.FloatField(blank=True, null=True, verbose_name='Рейтинг с затуханием по времени'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['rating_bayesian', 'id'], name='title_rating_bayesian_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['rating_decayed', 'id'], name='title_rating_decayed_idx'),
+        ),
+        migrations.RunPython(fill_alternative_ratings, migrations.RunPython.noop),
+    ]
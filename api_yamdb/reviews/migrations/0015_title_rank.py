@@ -0,0 +1,59 @@
+# Generated by Django 2.2.16 on 2026-10-18 04:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def fill_title_ranks(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    TitleRank = apps.get_model('reviews', 'TitleRank')
+    genres = {}
+    for title_id, genre_id in Title.genre.through.objects.values_list(
+            'title_id', 'genre_id'):
+        genres.setdefault(title_id, []).append(genre_id)
+    ranks = []
+    for title in Title.objects.all():
+        boards = [('all', 0), ('year', title.year)]
+        if title.category_id is not None:
+            boards.append(('category', title.category_id))
+        boards.extend(('genre', genre_id)
+                      for genre_id in genres.get(title.id, ()))
+        ranks.extend(
+            TitleRank(dimension=dimension, key=key, title_id=title.id,
+                      score=title.rating_bayesian)
+            for dimension, key in boards
+        )
+    TitleRank.objects.bulk_create(ranks)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0014_title_alternative_ratings'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TitleRank',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dimension', models.CharField(choices=[('all', 'Все тайтлы'), ('category', 'Категория'), ('genre', 'Жанр'), ('year', 'Год')], max_length=8, verbose_name='Измерение')),
+                ('key', models.IntegerField(default=0, verbose_name='id категории или жанра, год')),
+                ('score', models.FloatField(null=True, verbose_name='Рейтинг')),
+                ('title', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ranks', to='reviews.Title', verbose_name='Произведение')),
+            ],
+            options={
+                'verbose_name': 'Место в рейтинге',
+                'verbose_name_plural': 'Места в рейтингах',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='titlerank',
+            index=models.Index(fields=['dimension', 'key', '-score', '-title'], name='title_rank_board_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='titlerank',
+            constraint=models.UniqueConstraint(fields=('dimension', 'key', 'title'), name='unique_title_rank'),
+        ),
+        migrations.RunPython(fill_title_ranks, migrations.RunPython.noop),
+    ]
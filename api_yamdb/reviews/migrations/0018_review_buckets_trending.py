@@ -0,0 +1,79 @@
+# Generated by Django 2.2.16 on 2026-10-18 04:09
+
+from datetime import timedelta
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncHour
+from django.utils import timezone
+import django.db.models.deletion
+
+
+def fill_review_buckets(apps, schema_editor):
+    Review = apps.get_model('reviews', 'Review')
+    ReviewBucket = apps.get_model('reviews', 'ReviewBucket')
+    since = timezone.now().replace(
+        minute=0, second=0, microsecond=0
+    ) - timedelta(days=7, hours=-1)
+    ReviewBucket.objects.bulk_create(
+        ReviewBucket(title_id=title_id, hour=hour, count=count,
+                     score_sum=score_sum)
+        for title_id, hour, count, score_sum in Review.objects.filter(
+            pub_date__gte=since
+        ).order_by().values_list(
+            'title_id', TruncHour('pub_date')
+        ).annotate(count=Count('id'), score_sum=Sum('score'))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0017_similar_title'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrendingTitle',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('window', models.CharField(choices=[('24h', 'Сутки'), ('7d', 'Неделя')], max_length=3, verbose_name='Окно')),
+                ('rank', models.PositiveSmallIntegerField(verbose_name='Место')),
+                ('reviews', models.PositiveIntegerField(verbose_name='Отзывов за окно')),
+                ('score', models.FloatField(verbose_name='Средняя оценка за окно')),
+                ('title', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='reviews.Title', verbose_name='Произведение')),
+            ],
+            options={
+                'verbose_name': 'Популярное произведение',
+                'verbose_name_plural': 'Популярные произведения',
+                'ordering': ('window', 'rank'),
+            },
+        ),
+        migrations.CreateModel(
+            name='ReviewBucket',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hour', models.DateTimeField(verbose_name='Час')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='Отзывов')),
+                ('score_sum', models.PositiveIntegerField(default=0, verbose_name='Сумма оценок')),
+                ('title', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='review_buckets', to='reviews.Title', verbose_name='Произведение')),
+            ],
+            options={
+                'verbose_name': 'Отзывы за час',
+                'verbose_name_plural': 'Отзывы по часам',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='trendingtitle',
+            constraint=models.UniqueConstraint(fields=('window', 'rank'), name='unique_trending_rank'),
+        ),
+        migrations.AddIndex(
+            model_name='reviewbucket',
+            index=models.Index(fields=['hour'], name='review_bucket_hour_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='reviewbucket',
+            constraint=models.UniqueConstraint(fields=('title', 'hour'), name='unique_review_bucket'),
+        ),
+        migrations.RunPython(fill_review_buckets, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 2.2.16 on 2026-10-18 04:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0019_sync_field_options'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='title',
+            name='decay_score_sum',
+            field=models.FloatField(default=0, editable=False, verbose_name='Сумма оценок с весами затухания'),
+        ),
+        migrations.AlterField(
+            model_name='title',
+            name='decay_weight',
+            field=models.FloatField(default=0, editable=False, verbose_name='Сумма весов затухания'),
+        ),
+        migrations.AlterField(
+            model_name='title',
+            name='rating_bayesian',
+            field=models.FloatField(blank=True, editable=False, null=True, verbose_name='Байесовский рейтинг'),
+        ),
+        migrations.AlterField(
+            model_name='title',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество оценок'),
+        ),
+        migrations.AlterField(
+            model_name='title',
+            name='rating_decayed',
+            field=models.FloatField(blank=True, editable=False, null=True, verbose_name='Рейтинг с затуханием по времени'),
+        ),
+        migrations.AlterField(
+            model_name='title',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Сумма оценок'),
+        ),
+    ]
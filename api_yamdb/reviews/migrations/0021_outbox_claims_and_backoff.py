@@ -0,0 +1,29 @@
+# Generated by Django 2.2.16 on 2026-10-18 04:21
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0020_title_counters_not_editable'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='outboxemail',
+            name='claim',
+            field=models.CharField(blank=True, max_length=32, verbose_name='Метка воркера, взявшего письмо'),
+        ),
+        migrations.AddField(
+            model_name='outboxemail',
+            name='claimed_until',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Письмо занято воркером до'),
+        ),
+        migrations.AddField(
+            model_name='outboxemail',
+            name='next_attempt_at',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now, verbose_name='Не раньше'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 2.2.16 on 2026-10-18 04:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0021_outbox_claims_and_backoff'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ratingprior',
+            name='decay_shift',
+            field=models.FloatField(default=0, help_text='Число периодов полураспада от DECAY_EPOCH, от которого отсчитываются веса отзывов в суммах тайтлов', verbose_name='Сдвиг весов затухания'),
+        ),
+    ]
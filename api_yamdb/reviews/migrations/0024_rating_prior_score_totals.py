@@ -0,0 +1,41 @@
+# Generated by Django 2.2.16 on 2026-10-18 04:51
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def fill_score_totals(apps, schema_editor):
+    RatingPrior = apps.get_model('reviews', 'RatingPrior')
+    Review = apps.get_model('reviews', 'Review')
+    totals = Review.objects.aggregate(
+        score_sum=Sum('score'), score_count=Count('id')
+    )
+    RatingPrior.objects.update_or_create(pk=1, defaults={
+        'score_sum': totals['score_sum'] or 0,
+        'score_count': totals['score_count'],
+    })
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0023_change_model_id_index'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='ratingprior',
+            name='mean',
+        ),
+        migrations.AddField(
+            model_name='ratingprior',
+            name='score_count',
+            field=models.BigIntegerField(default=0, verbose_name='Количество оценок'),
+        ),
+        migrations.AddField(
+            model_name='ratingprior',
+            name='score_sum',
+            field=models.BigIntegerField(default=0, verbose_name='Сумма оценок'),
+        ),
+        migrations.RunPython(fill_score_totals, migrations.RunPython.noop),
+    ]
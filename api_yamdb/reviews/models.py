@@ -2,6 +2,7 @@ from django.contrib.auth.models import AbstractUser
 from django.contrib.auth.validators import UnicodeUsernameValidator
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
+from django.utils import timezone
 
 from .utils import ADMIN, MODERATOR, USER
 from .validators import username_not_me, validate_year
@@ -94,14 +95,291 @@ class Title(models.Model):
         related_name="titles",
         verbose_name='Категория'
     )
+    rating_sum = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Сумма оценок'
+    )
+    rating_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество оценок'
+    )
+    rating_bayesian = models.FloatField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name='Байесовский рейтинг'
+    )
+    decay_score_sum = models.FloatField(
+        default=0,
+        editable=False,
+        verbose_name='Сумма оценок с весами затухания'
+    )
+    decay_weight = models.FloatField(
+        default=0,
+        editable=False,
+        verbose_name='Сумма весов затухания'
+    )
+    rating_decayed = models.FloatField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name='Рейтинг с затуханием по времени'
+    )
 
     class Meta:
+        indexes = (
+            models.Index(fields=('category', 'year'),
+                         name='title_category_year_idx'),
+            models.Index(fields=('year',), name='title_year_idx'),
+            models.Index(fields=('rating_bayesian', 'id'),
+                         name='title_rating_bayesian_idx'),
+            models.Index(fields=('rating_decayed', 'id'),
+                         name='title_rating_decayed_idx'),
+        )
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
 
     def __str__(self):
         return self.name[:20]
 
+    @property
+    def rating(self):
+        """Средняя оценка по сохранённым сумме и количеству оценок."""
+        if not self.rating_count:
+            return None
+        return self.rating_sum / self.rating_count
+
+
+class RatingPrior(models.Model):
+    """Средняя оценка по всем отзывам — априорное значение для
+    байесовского рейтинга. Хранится одной строкой: сумма и число оценок
+    сдвигаются при каждой записи отзыва, rebuild_title_ratings
+    пересчитывает их вместе со сдвигом весов затухания."""
+    score_sum = models.BigIntegerField(
+        default=0,
+        verbose_name='Сумма оценок'
+    )
+    score_count = models.BigIntegerField(
+        default=0,
+        verbose_name='Количество оценок'
+    )
+    decay_shift = models.FloatField(
+        default=0,
+        verbose_name='Сдвиг весов затухания',
+        help_text='Число периодов полураспада от DECAY_EPOCH, от которого '
+                  'отсчитываются веса отзывов в суммах тайтлов'
+    )
+    updated = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Дата пересчёта'
+    )
+
+    class Meta:
+        verbose_name = 'Априорный рейтинг'
+        verbose_name_plural = 'Априорный рейтинг'
+
+    def __str__(self):
+        return f'{self.mean:.2f}' if self.mean is not None else '—'
+
+    @property
+    def mean(self):
+        if not self.score_count:
+            return None
+        return self.score_sum / self.score_count
+
+
+class TitleStats(models.Model):
+    """Распределение оценок тайтла, обновляется вместе с отзывами."""
+    title = models.OneToOneField(
+        'Title',
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats',
+        verbose_name='Произведение'
+    )
+    score_1 = models.PositiveIntegerField(default=0, verbose_name='Оценок 1')
+    score_2 = models.PositiveIntegerField(default=0, verbose_name='Оценок 2')
+    score_3 = models.PositiveIntegerField(default=0, verbose_name='Оценок 3')
+    score_4 = models.PositiveIntegerField(default=0, verbose_name='Оценок 4')
+    score_5 = models.PositiveIntegerField(default=0, verbose_name='Оценок 5')
+    score_6 = models.PositiveIntegerField(default=0, verbose_name='Оценок 6')
+    score_7 = models.PositiveIntegerField(default=0, verbose_name='Оценок 7')
+    score_8 = models.PositiveIntegerField(default=0, verbose_name='Оценок 8')
+    score_9 = models.PositiveIntegerField(default=0, verbose_name='Оценок 9')
+    score_10 = models.PositiveIntegerField(default=0, verbose_name='Оценок 10')
+    total = models.PositiveIntegerField(default=0, verbose_name='Отзывов')
+    last_review = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Дата последнего отзыва'
+    )
+
+    class Meta:
+        verbose_name = 'Статистика оценок'
+        verbose_name_plural = 'Статистика оценок'
+
+    def __str__(self):
+        return f'{self.title_id}: {self.total}'
+
+
+class TitleRank(models.Model):
+    """Место тайтла в рейтинге по одному измерению.
+
+    Индекс (dimension, key, -score) хранит каждый рейтинг отсортированным,
+    поэтому первые N мест читаются без сортировки и агрегации.
+    """
+    ALL = 'all'
+    CATEGORY = 'category'
+    GENRE = 'genre'
+    YEAR = 'year'
+    DIMENSIONS = (
+        (ALL, 'Все тайтлы'),
+        (CATEGORY, 'Категория'),
+        (GENRE, 'Жанр'),
+        (YEAR, 'Год'),
+    )
+
+    dimension = models.CharField(
+        max_length=8,
+        choices=DIMENSIONS,
+        verbose_name='Измерение'
+    )
+    key = models.IntegerField(
+        default=0,
+        verbose_name='id категории или жанра, год'
+    )
+    title = models.ForeignKey(
+        'Title',
+        on_delete=models.CASCADE,
+        related_name='ranks',
+        verbose_name='Произведение'
+    )
+    score = models.FloatField(null=True, verbose_name='Рейтинг')
+
+    class Meta:
+        constraints = (
+            models.UniqueConstraint(fields=('dimension', 'key', 'title'),
+                                    name='unique_title_rank'),
+        )
+        indexes = (
+            models.Index(fields=('dimension', 'key', '-score', '-title'),
+                         name='title_rank_board_idx'),
+        )
+        verbose_name = 'Место в рейтинге'
+        verbose_name_plural = 'Места в рейтингах'
+
+    def __str__(self):
+        return f'{self.dimension}:{self.key} {self.title_id}'
+
+
+class SimilarTitle(models.Model):
+    """Сосед тайтла по сходству оценок и жанров.
+
+    Строится командой build_similar_titles.
+    """
+    title = models.ForeignKey(
+        'Title',
+        on_delete=models.CASCADE,
+        related_name='similar_titles',
+        verbose_name='Произведение'
+    )
+    similar = models.ForeignKey(
+        'Title',
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name='Похожее произведение'
+    )
+    rank = models.PositiveSmallIntegerField(verbose_name='Место')
+    score = models.FloatField(verbose_name='Сходство')
+
+    class Meta:
+        constraints = (
+            models.UniqueConstraint(fields=('title', 'rank'),
+                                    name='unique_similar_title_rank'),
+        )
+        verbose_name = 'Похожее произведение'
+        verbose_name_plural = 'Похожие произведения'
+        ordering = ('title', 'rank')
+
+    def __str__(self):
+        return f'{self.title_id} -> {self.similar_id}'
+
+
+class ReviewBucket(models.Model):
+    """Количество отзывов тайтла и сумма их оценок за один час.
+
+    Пишется вместе с отзывом, хранится не дольше самого длинного окна
+    популярности.
+    """
+    title = models.ForeignKey(
+        'Title',
+        on_delete=models.CASCADE,
+        related_name='review_buckets',
+        verbose_name='Произведение'
+    )
+    hour = models.DateTimeField(verbose_name='Час')
+    count = models.PositiveIntegerField(default=0, verbose_name='Отзывов')
+    score_sum = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Сумма оценок'
+    )
+
+    class Meta:
+        constraints = (
+            models.UniqueConstraint(fields=('title', 'hour'),
+                                    name='unique_review_bucket'),
+        )
+        indexes = (
+            models.Index(fields=('hour',), name='review_bucket_hour_idx'),
+        )
+        verbose_name = 'Отзывы за час'
+        verbose_name_plural = 'Отзывы по часам'
+
+    def __str__(self):
+        return f'{self.title_id} {self.hour:%Y-%m-%d %H}: {self.count}'
+
+
+class TrendingTitle(models.Model):
+    """Место тайтла среди популярных за окно времени.
+
+    Строится командой rollup_trending по часовым счётчикам отзывов.
+    """
+    DAY = '24h'
+    WEEK = '7d'
+    WINDOWS = (
+        (DAY, 'Сутки'),
+        (WEEK, 'Неделя'),
+    )
+
+    window = models.CharField(
+        max_length=3,
+        choices=WINDOWS,
+        verbose_name='Окно'
+    )
+    rank = models.PositiveSmallIntegerField(verbose_name='Место')
+    title = models.ForeignKey(
+        'Title',
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name='Произведение'
+    )
+    reviews = models.PositiveIntegerField(verbose_name='Отзывов за окно')
+    score = models.FloatField(verbose_name='Средняя оценка за окно')
+
+    class Meta:
+        constraints = (
+            models.UniqueConstraint(fields=('window', 'rank'),
+                                    name='unique_trending_rank'),
+        )
+        verbose_name = 'Популярное произведение'
+        verbose_name_plural = 'Популярные произведения'
+        ordering = ('window', 'rank')
+
+    def __str__(self):
+        return f'{self.window} #{self.rank}: {self.title_id}'
+
 
 class Review(models.Model):
     title = models.ForeignKey(
@@ -136,6 +414,13 @@ class Review(models.Model):
         constraints = (
             models.UniqueConstraint(fields=('author', 'title'),
                                     name='unique_review'),)
+        indexes = (
+            models.Index(fields=('title', '-pub_date', '-id'),
+                         name='review_title_pub_date_idx'),
+            # Покрывающий индекс для пересчёта рейтингов по тайтлам.
+            models.Index(fields=('title', 'score'),
+                         name='review_title_score_idx'),
+        )
         verbose_name = 'Отзыв'
         verbose_name_plural = 'Отзывы'
         ordering = ('-pub_date',)
@@ -164,9 +449,90 @@ class Comment(models.Model):
     )
 
     class Meta:
+        indexes = (
+            models.Index(fields=('review', '-pub_date', '-id'),
+                         name='comment_review_pub_date_idx'),
+        )
         verbose_name = "Комментарий к отзыву"
         verbose_name_plural = "Комментарии к отзыву"
         ordering = ('-pub_date',)
 
     def __str__(self):
         return self.text[:15]
+
+
+class OutboxEmail(models.Model):
+    recipient = models.EmailField(verbose_name='Получатель')
+    subject = models.CharField(max_length=255, verbose_name='Тема')
+    message = models.TextField(verbose_name='Текст письма')
+    created = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Дата постановки в очередь'
+    )
+    sent_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        db_index=True,
+        verbose_name='Дата отправки'
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name='Попыток отправки'
+    )
+    last_error = models.TextField(blank=True, verbose_name='Последняя ошибка')
+    next_attempt_at = models.DateTimeField(
+        default=timezone.now,
+        db_index=True,
+        verbose_name='Не раньше'
+    )
+    claim = models.CharField(
+        max_length=32,
+        blank=True,
+        verbose_name='Метка воркера, взявшего письмо'
+    )
+    claimed_until = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Письмо занято воркером до'
+    )
+
+    class Meta:
+        verbose_name = 'Письмо в очереди'
+        verbose_name_plural = 'Очередь писем'
+        ordering = ('id',)
+
+    def __str__(self):
+        return f'{self.recipient}: {self.subject}'
+
+
+class Change(models.Model):
+    """Запись журнала изменений для /api/v1/changes/."""
+    UPSERT = 'upsert'
+    DELETE = 'delete'
+    ACTIONS = (
+        (UPSERT, 'Создание или изменение'),
+        (DELETE, 'Удаление'),
+    )
+
+    model = models.CharField(max_length=20, verbose_name='Модель')
+    object_id = models.PositiveIntegerField(verbose_name='id объекта')
+    action = models.CharField(
+        max_length=6,
+        choices=ACTIONS,
+        verbose_name='Действие'
+    )
+    created = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Дата изменения'
+    )
+
+    class Meta:
+        verbose_name = 'Изменение'
+        verbose_name_plural = 'Журнал изменений'
+        ordering = ('id',)
+        indexes = [
+            models.Index(fields=('model', 'id'), name='change_model_id_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.id}: {self.action} {self.model} {self.object_id}'
@@ -0,0 +1,161 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import OutboxEmail
+
+
+def enqueue_email(recipient, subject, message):
+    """Ставит письмо в очередь; отправкой занимается OutboxWorker."""
+    return OutboxEmail.objects.create(
+        recipient=recipient, subject=subject, message=message
+    )
+
+
+def pending_emails(max_attempts):
+    return OutboxEmail.objects.filter(
+        sent_at__isnull=True, attempts__lt=max_attempts
+    )
+
+
+def claimable_emails(max_attempts, now):
+    """Письма, которые пора отправлять и которые не заняты другим
+    воркером: метки с истёкшим сроком не учитываются."""
+    return pending_emails(max_attempts).filter(
+        Q(claimed_until__isnull=True) | Q(claimed_until__lt=now),
+        next_attempt_at__lte=now,
+    )
+
+
+def send_chunk(emails):
+    """Отправляет письма через одно соединение с почтовым сервером.
+
+    Возвращает id отправленных писем и словарь ошибок по id.
+    """
+    sent, failed = [], {}
+    mail_connection = get_connection()
+    try:
+        mail_connection.open()
+        for email in emails:
+            message = EmailMessage(
+                subject=email.subject,
+                body=email.message,
+                from_email=settings.ADMIN_EMAIL,
+                to=[email.recipient],
+                connection=mail_connection,
+            )
+            try:
+                message.send()
+            except Exception as error:
+                failed[email.id] = str(error)
+            else:
+                sent.append(email.id)
+    except Exception as error:
+        failed.update(
+            (email.id, str(error)) for email in emails
+            if email.id not in sent
+        )
+    finally:
+        mail_connection.close()
+    return sent, failed
+
+
+class OutboxWorker:
+    """Разбирает очередь писем пачками в пуле потоков.
+
+    Пачка занимается короткой транзакцией: письма получают метку воркера
+    и срок аренды lease. Отправка идёт вне транзакции, результаты
+    записываются второй короткой транзакцией и только для писем с меткой
+    этого воркера. Неудачная отправка откладывается на retry_delay
+    секунд, с каждой попыткой вдвое дольше, но не больше max_retry_delay.
+    Потоки только отправляют письма, вся работа с БД идёт в основном
+    потоке. Счётчики sent/failed и throughput накапливаются за всё
+    время работы воркера.
+    """
+
+    def __init__(self, batch_size=100, workers=4, max_attempts=5,
+                 lease=300, retry_delay=60, max_retry_delay=3600):
+        self.batch_size = batch_size
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.lease = timedelta(seconds=lease)
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.sent = 0
+        self.failed = 0
+        self.started = time.monotonic()
+
+    @property
+    def backlog(self):
+        return pending_emails(self.max_attempts).count()
+
+    @property
+    def throughput(self):
+        elapsed = max(time.monotonic() - self.started, 1e-6)
+        return self.sent / elapsed
+
+    def backoff(self, attempts):
+        """Пауза перед следующей попыткой после attempts неудачных."""
+        return timedelta(seconds=min(
+            self.retry_delay * 2 ** (attempts - 1), self.max_retry_delay
+        ))
+
+    def claim_batch(self):
+        """Занимает пачку писем и возвращает метку и письма."""
+        now = timezone.now()
+        claim = uuid4().hex
+        with transaction.atomic():
+            candidates = claimable_emails(self.max_attempts, now).order_by(
+                'next_attempt_at', 'id'
+            )
+            if connection.features.has_select_for_update_skip_locked:
+                candidates = candidates.select_for_update(skip_locked=True)
+            ids = list(candidates.values_list('id', flat=True)[
+                :self.batch_size
+            ])
+            # Условие повторяется в UPDATE: без skip_locked другой воркер
+            # мог занять те же письма между чтением и записью.
+            claimable_emails(self.max_attempts, now).filter(
+                pk__in=ids
+            ).update(claim=claim, claimed_until=now + self.lease)
+        return claim, list(OutboxEmail.objects.filter(
+            claim=claim, sent_at__isnull=True
+        ))
+
+    def record_results(self, claim, batch, results):
+        now = timezone.now()
+        attempts = {email.id: email.attempts + 1 for email in batch}
+        sent_ids = [pk for sent, _ in results for pk in sent]
+        with transaction.atomic():
+            OutboxEmail.objects.filter(pk__in=sent_ids, claim=claim).update(
+                sent_at=now, attempts=F('attempts') + 1, claim='',
+                claimed_until=None
+            )
+            for _, failed in results:
+                for pk, error in failed.items():
+                    OutboxEmail.objects.filter(pk=pk, claim=claim).update(
+                        attempts=F('attempts') + 1, last_error=error,
+                        next_attempt_at=now + self.backoff(attempts[pk]),
+                        claim='', claimed_until=None
+                    )
+                self.failed += len(failed)
+        self.sent += len(sent_ids)
+
+    def process_batch(self):
+        """Отправляет одну пачку писем и возвращает её размер."""
+        claim, batch = self.claim_batch()
+        if not batch:
+            return 0
+        chunks = [batch[index::self.workers]
+                  for index in range(self.workers)]
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            results = list(pool.map(send_chunk, filter(None, chunks)))
+        self.record_results(claim, batch, results)
+        return len(batch)
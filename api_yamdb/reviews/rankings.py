@@ -0,0 +1,75 @@
+from itertools import islice
+
+from django.db.models import OuterRef, Subquery
+
+from .models import Title, TitleRank
+
+
+def title_boards(title, genre_ids):
+    boards = [(TitleRank.ALL, 0), (TitleRank.YEAR, title.year)]
+    if title.category_id is not None:
+        boards.append((TitleRank.CATEGORY, title.category_id))
+    boards.extend((TitleRank.GENRE, genre_id) for genre_id in genre_ids)
+    return boards
+
+
+def sync_title_ranks(title):
+    """Переносит тайтл в рейтинги его года, категории и жанров.
+
+    Рейтинг читается из базы вместе с жанрами: в экземпляре он мог
+    устареть после UPDATE через F() в apply_rating_delta.
+    """
+    rows = list(Title.objects.filter(pk=title.pk).values_list(
+        'rating_bayesian', 'genre'
+    ))
+    TitleRank.objects.filter(title=title).delete()
+    if not rows:
+        return
+    score = rows[0][0]
+    genre_ids = [genre_id for _, genre_id in rows if genre_id is not None]
+    TitleRank.objects.bulk_create(
+        TitleRank(dimension=dimension, key=key, title=title, score=score)
+        for dimension, key in title_boards(title, genre_ids)
+    )
+
+
+def refresh_rank_scores(title_id=None):
+    """Копирует байесовский рейтинг тайтлов в их места в рейтингах."""
+    ranks = TitleRank.objects.all()
+    if title_id is not None:
+        ranks = ranks.filter(title_id=title_id)
+    ranks.update(score=Subquery(
+        Title.objects.filter(pk=OuterRef('title_id')).values(
+            'rating_bayesian'
+        )[:1]
+    ))
+
+
+def rebuild_rankings(batch_size=1000):
+    """Заново строит все рейтинги по тайтлам и их жанрам."""
+    genres = {}
+    for title_id, genre_id in Title.genre.through.objects.values_list(
+            'title_id', 'genre_id').iterator(chunk_size=batch_size):
+        genres.setdefault(title_id, []).append(genre_id)
+    TitleRank.objects.all().delete()
+    titles = Title.objects.only('id', 'year', 'category_id',
+                                'rating_bayesian')
+    ranks = (
+        TitleRank(dimension=dimension, key=key, title=title,
+                  score=title.rating_bayesian)
+        for title in titles.iterator(chunk_size=batch_size)
+        for dimension, key in title_boards(title, genres.get(title.id, ()))
+    )
+    while True:
+        batch = list(islice(ranks, batch_size))
+        if not batch:
+            break
+        TitleRank.objects.bulk_create(batch)
+
+
+def top_title_ids(dimension, key=0, limit=10):
+    return list(TitleRank.objects.filter(
+        dimension=dimension, key=key, score__isnull=False
+    ).order_by('-score', '-title_id').values_list(
+        'title_id', flat=True
+    )[:limit])
@@ -0,0 +1,186 @@
+import math
+from collections import defaultdict
+from datetime import datetime
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import (Case, ExpressionWrapper, F, FloatField,
+                              Subquery, Value, When)
+from django.db.models.functions import Cast, Coalesce, Power
+from django.utils import timezone
+from django.utils.timezone import utc
+
+from .models import RatingPrior, Review, Title
+from .rankings import refresh_rank_scores
+
+RATINGS_SETTINGS = getattr(settings, 'RATINGS', {})
+PRIOR_WEIGHT = RATINGS_SETTINGS.get('BAYESIAN_PRIOR_WEIGHT', 10)
+# Априорная средняя, пока отзывов нет: середина шкалы 1–10.
+DEFAULT_PRIOR_MEAN = RATINGS_SETTINGS.get('BAYESIAN_DEFAULT_MEAN', 5.5)
+HALF_LIFE_DAYS = RATINGS_SETTINGS.get('DECAY_HALF_LIFE_DAYS', 365)
+# Вес отзыва растёт вдвое за каждый период полураспада, поэтому среднее
+# sum(score * w) / sum(w) не зависит от текущей даты и обновляется
+# прибавлением вклада одного отзыва. Веса отсчитываются не от
+# DECAY_EPOCH, а от RatingPrior.decay_shift: rebuild_title_ratings
+# переносит сдвиг к текущей дате, и веса не растут без предела.
+DECAY_EPOCH = datetime(2020, 1, 1, tzinfo=utc)
+
+
+def decay_exponent(moment):
+    """Двоичный логарифм веса от DECAY_EPOCH, растёт линейно."""
+    days = (moment - DECAY_EPOCH).total_seconds() / 86400
+    return days / HALF_LIFE_DAYS
+
+
+def decay_weight(pub_date, shift=0.0):
+    return 2 ** (decay_exponent(pub_date) - shift)
+
+
+def current_decay_shift(now=None):
+    """Сдвиг для пересчёта: целое число периодов до now, так что веса
+    свежих отзывов лежат между 1 и 2."""
+    return float(math.floor(decay_exponent(now or timezone.now())))
+
+
+def bayesian(rating_sum, rating_count, prior_mean):
+    return ((PRIOR_WEIGHT * prior_mean + rating_sum)
+            / (PRIOR_WEIGHT + rating_count))
+
+
+def prior_mean():
+    """Подзапрос к априорной средней, чтобы не читать её отдельно."""
+    return Coalesce(
+        Subquery(RatingPrior.objects.filter(score_count__gt=0).annotate(
+            mean=ExpressionWrapper(
+                Cast('score_sum', FloatField()) / F('score_count'),
+                output_field=FloatField(),
+            )
+        ).values('mean')[:1]),
+        Value(DEFAULT_PRIOR_MEAN),
+    )
+
+
+def decay_shift():
+    return Coalesce(
+        Subquery(RatingPrior.objects.values('decay_shift')[:1]), Value(0.0)
+    )
+
+
+def apply_prior_delta(score_delta, count_delta):
+    """Сдвигает сумму и число всех оценок.
+
+    Строка создаётся первым отзывом, если её ещё нет.
+    """
+    prior = RatingPrior.objects.filter(pk=1)
+    changes = {
+        'score_sum': F('score_sum') + score_delta,
+        'score_count': F('score_count') + count_delta,
+    }
+    if prior.update(**changes):
+        return
+    RatingPrior.objects.bulk_create([RatingPrior(pk=1)],
+                                    ignore_conflicts=True)
+    prior.update(**changes)
+
+
+def apply_rating_delta(title_id, score_delta, count_delta, pub_date):
+    """Атомарно сдвигает сохранённые суммы оценок тайтла и одним же
+    UPDATE пересчитывает байесовский рейтинг и рейтинг с затуханием,
+    затем переносит новый рейтинг в места тайтла в рейтингах.
+
+    Сначала сдвигаются общие суммы оценок: байесовский рейтинг тайтла
+    считается уже от новой средней. Вес отзыва считается в том же
+    UPDATE от текущего сдвига, поэтому он согласован с суммами."""
+    apply_prior_delta(score_delta, count_delta)
+    weight = ExpressionWrapper(
+        Power(Value(2.0), Value(decay_exponent(pub_date)) - decay_shift()),
+        output_field=FloatField(),
+    )
+    rating_sum = F('rating_sum') + score_delta
+    rating_count = F('rating_count') + count_delta
+    decay_score_sum = F('decay_score_sum') + score_delta * weight
+    decay_weights = F('decay_weight') + count_delta * weight
+    has_reviews = {'rating_count__gt': -count_delta}
+    Title.objects.filter(pk=title_id).update(
+        rating_sum=rating_sum,
+        rating_count=rating_count,
+        decay_score_sum=decay_score_sum,
+        decay_weight=decay_weights,
+        rating_bayesian=Case(
+            When(then=ExpressionWrapper(
+                bayesian(rating_sum, rating_count, prior_mean()),
+                output_field=FloatField(),
+            ), **has_reviews),
+            default=None, output_field=FloatField(),
+        ),
+        rating_decayed=Case(
+            When(then=ExpressionWrapper(
+                decay_score_sum / decay_weights, output_field=FloatField(),
+            ), **has_reviews),
+            default=None, output_field=FloatField(),
+        ),
+    )
+    refresh_rank_scores(title_id)
+
+
+def rebuild_title_ratings(batch_size=1000):
+    """Пересчитывает априорную среднюю и все рейтинги тайтлов по таблице
+    отзывов.
+
+    Чтение отзывов, новый сдвиг и запись сумм идут в одной транзакции
+    под блокировкой строки RatingPrior. apply_rating_delta первым делом
+    обновляет ту же строку, поэтому запись отзыва в транзакции ждёт
+    пересчёта, и её сдвиг не теряется и не смешивается со старым сдвигом
+    весов. Возвращает количество тайтлов, у которых рейтинг изменился.
+    """
+    with transaction.atomic():
+        RatingPrior.objects.select_for_update().get_or_create(pk=1)
+        return rebuild_locked_title_ratings(batch_size)
+
+
+def rebuild_locked_title_ratings(batch_size):
+    shift = current_decay_shift()
+    totals = defaultdict(lambda: [0, 0, 0.0, 0.0])
+    reviews = Review.objects.order_by().values_list(
+        'title_id', 'score', 'pub_date'
+    )
+    for title_id, score, pub_date in reviews.iterator(chunk_size=batch_size):
+        weight = decay_weight(pub_date, shift)
+        total = totals[title_id]
+        total[0] += score
+        total[1] += 1
+        total[2] += score * weight
+        total[3] += weight
+    score_sum = sum(total[0] for total in totals.values())
+    score_count = sum(total[1] for total in totals.values())
+    mean = score_sum / score_count if score_count else DEFAULT_PRIOR_MEAN
+    RatingPrior.objects.update_or_create(pk=1, defaults={
+        'score_sum': score_sum, 'score_count': score_count,
+        'decay_shift': shift,
+    })
+
+    fields = ('rating_sum', 'rating_count', 'decay_score_sum',
+              'decay_weight', 'rating_bayesian', 'rating_decayed')
+    changed = []
+    titles = Title.objects.only('id', *fields)
+    for title in titles.iterator(chunk_size=batch_size):
+        total = totals.get(title.id, (0, 0, 0.0, 0.0))
+        stored = (
+            *total,
+            bayesian(total[0], total[1], mean) if total[1] else None,
+            total[2] / total[3] if total[1] else None,
+        )
+        current = tuple(getattr(title, field) for field in fields)
+        if not all(map(same_value, current, stored)):
+            for field, value in zip(fields, stored):
+                setattr(title, field, value)
+            changed.append(title)
+    Title.objects.bulk_update(changed, fields, batch_size=batch_size)
+    refresh_rank_scores()
+    return len(changed)
+
+
+def same_value(current, stored):
+    if current is None or stored is None:
+        return current is stored
+    return math.isclose(current, stored, rel_tol=1e-9)
@@ -0,0 +1,97 @@
+import re
+
+from django.db import connection
+from django.db.models import AutoField, Lookup, Q
+
+from .models import Title
+
+FTS_TABLE = 'reviews_title_fts'
+TOKEN_RE = re.compile(r'\w+')
+
+
+@AutoField.register_lookup
+class TitleFtsMatch(Lookup):
+    """id__title_fts=выражение: id есть среди совпадений FTS5.
+
+    Столбец подставляет компилятор, поэтому условие верно и внутри
+    подзапросов, где таблица тайтлов получает псевдоним.
+    """
+    lookup_name = 'title_fts'
+    prepare_rhs = False
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return (f'{lhs} IN (SELECT rowid FROM {FTS_TABLE} '
+                f'WHERE {FTS_TABLE} MATCH {rhs})', lhs_params + rhs_params)
+
+
+def fts_enabled(db_connection=connection):
+    """Полнотекстовый индекс FTS5 поддерживается только на SQLite."""
+    return db_connection.vendor == 'sqlite'
+
+
+def create_index(db_connection=connection):
+    with db_connection.cursor() as cursor:
+        cursor.execute(
+            f'CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} '
+            f'USING fts5(name, description)'
+        )
+
+
+def drop_index(db_connection=connection):
+    with db_connection.cursor() as cursor:
+        cursor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+def rebuild_index(db_connection=connection):
+    with db_connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE}')
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, name, description) '
+            f'SELECT id, name, description FROM {Title._meta.db_table}'
+        )
+
+
+def index_title(title):
+    if not fts_enabled():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s',
+                       [title.pk])
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, name, description) '
+            f'VALUES (%s, %s, %s)',
+            [title.pk, title.name, title.description]
+        )
+
+
+def unindex_title(title_id):
+    if not fts_enabled():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s',
+                       [title_id])
+
+
+def match_expression(query):
+    """Превращает пользовательский ввод в безопасный запрос FTS5.
+
+    Каждое слово ищется как префикс, слова объединяются через AND.
+    """
+    tokens = TOKEN_RE.findall(query)
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
+def search_titles(queryset, query):
+    expression = match_expression(query)
+    if not expression:
+        return queryset.none()
+    if not fts_enabled():
+        words = TOKEN_RE.findall(query)
+        condition = Q()
+        for word in words:
+            condition &= (Q(name__icontains=word)
+                          | Q(description__icontains=word))
+        return queryset.filter(condition)
+    return queryset.filter(id__title_fts=expression)
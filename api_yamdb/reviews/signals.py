@@ -0,0 +1,301 @@
+from functools import partial
+
+from django.apps import apps as global_apps
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models.signals import (m2m_changed, post_delete,
+                                      post_migrate, post_save, pre_delete,
+                                      pre_save)
+from django.dispatch import receiver
+
+from .autocomplete import CATEGORY, GENRE, TITLE, autocomplete_index
+from .changes import TRACKED_MODELS, change, record, record_changes
+from .models import (Category, Change, Genre, Review, Title, TitleRank,
+                     TitleStats)
+from .rankings import sync_title_ranks
+from .ratings import apply_rating_delta
+from .search import index_title, unindex_title
+from .stats import apply_score_counts
+from .trending import apply_bucket_delta
+
+
+@receiver(pre_save, sender=Review)
+def remember_previous_review(sender, instance, raw=False, **kwargs):
+    """Запоминает тайтл, оценку и дату отзыва до изменения."""
+    instance._previous = None
+    if raw or instance.pk is None:
+        return
+    instance._previous = Review.objects.filter(pk=instance.pk).values_list(
+        'title_id', 'score', 'pub_date'
+    ).first()
+
+
+@receiver(post_save, sender=Review)
+def update_rating_on_review_save(sender, instance, raw=False, **kwargs):
+    """Обновляет рейтинги, статистику оценок и часовые счётчики тайтла
+    в транзакции записи отзыва."""
+    if raw:
+        return
+    previous = getattr(instance, '_previous', None)
+    if previous is None:
+        apply_rating_delta(
+            instance.title_id, instance.score, 1, instance.pub_date
+        )
+        apply_score_counts(instance.title_id, {instance.score: 1})
+        apply_bucket_delta(
+            instance.title_id, instance.pub_date, 1, instance.score
+        )
+        return
+    previous_title_id, previous_score, previous_pub_date = previous
+    if (previous_title_id != instance.title_id
+            or previous_pub_date != instance.pub_date):
+        apply_rating_delta(
+            previous_title_id, -previous_score, -1, previous_pub_date
+        )
+        apply_rating_delta(
+            instance.title_id, instance.score, 1, instance.pub_date
+        )
+        apply_score_counts(previous_title_id, {previous_score: -1})
+        apply_score_counts(instance.title_id, {instance.score: 1})
+        apply_bucket_delta(
+            previous_title_id, previous_pub_date, -1, -previous_score
+        )
+        apply_bucket_delta(
+            instance.title_id, instance.pub_date, 1, instance.score
+        )
+    elif previous_score != instance.score:
+        apply_rating_delta(
+            instance.title_id, instance.score - previous_score, 0,
+            instance.pub_date
+        )
+        apply_score_counts(
+            instance.title_id, {previous_score: -1, instance.score: 1}
+        )
+        apply_bucket_delta(
+            instance.title_id, instance.pub_date, 0,
+            instance.score - previous_score
+        )
+
+
+@receiver(post_delete, sender=Review)
+def update_rating_on_review_delete(sender, instance, **kwargs):
+    apply_rating_delta(
+        instance.title_id, -instance.score, -1, instance.pub_date
+    )
+    apply_score_counts(instance.title_id, {instance.score: -1})
+    apply_bucket_delta(
+        instance.title_id, instance.pub_date, -1, -instance.score
+    )
+
+
+@receiver(post_save, sender=Title)
+def create_stats_on_title_save(sender, instance, created, raw=False,
+                               **kwargs):
+    if created and not raw:
+        TitleStats.objects.create(title=instance)
+
+
+@receiver(post_save, sender=Title)
+def index_title_on_save(sender, instance, raw=False, **kwargs):
+    if not raw:
+        index_title(instance)
+
+
+@receiver(post_delete, sender=Title)
+def unindex_title_on_delete(sender, instance, **kwargs):
+    unindex_title(instance.pk)
+
+
+@receiver(post_save)
+def record_change_on_save(sender, instance, raw=False, **kwargs):
+    if raw or sender not in TRACKED_MODELS:
+        return
+    changes = [change(sender, instance.pk)]
+    if sender is Review:
+        # Рейтинг тайтла входит в его представление.
+        previous = getattr(instance, '_previous', None)
+        if previous is not None and previous[0] != instance.title_id:
+            changes.append(change(Title, previous[0]))
+        changes.append(change(Title, instance.title_id))
+    record(changes)
+
+
+@receiver(post_delete)
+def record_change_on_delete(sender, instance, **kwargs):
+    if sender not in TRACKED_MODELS:
+        return
+    changes = [change(sender, instance.pk, Change.DELETE)]
+    if sender is Review:
+        changes.append(change(Title, instance.title_id))
+    record(changes)
+
+
+@receiver(pre_delete, sender=Category)
+@receiver(pre_delete, sender=Genre)
+def record_titles_on_relation_delete(sender, instance, **kwargs):
+    """Удаление категории или жанра меняет тайтлы без их сигналов."""
+    field = 'category' if sender is Category else 'genre'
+    record_changes(
+        Title, Title.objects.filter(**{field: instance}).values_list(
+            'id', flat=True
+        )
+    )
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def remember_cleared_genre_titles(sender, instance, action, reverse,
+                                  **kwargs):
+    """Обратный clear() не передаёт pk_set, поэтому тайтлы жанра
+    запоминаются до очистки."""
+    if reverse and action == 'pre_clear':
+        instance._cleared_title_ids = list(
+            instance.titles.values_list('id', flat=True)
+        )
+
+
+def genre_change_title_ids(instance, action, pk_set):
+    """Тайтлы, затронутые обратным изменением связи жанр — тайтл."""
+    if action == 'post_clear':
+        return getattr(instance, '_cleared_title_ids', [])
+    return pk_set or []
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def record_change_on_title_genres(sender, instance, action, reverse,
+                                  pk_set, **kwargs):
+    if not action.startswith('post_'):
+        return
+    if not reverse:
+        record_changes(Title, [instance.pk])
+    else:
+        title_ids = genre_change_title_ids(instance, action, pk_set)
+        if title_ids:
+            record_changes(Title, title_ids)
+
+
+@receiver(post_save, sender=Title)
+def sync_ranks_on_title_save(sender, instance, raw=False, **kwargs):
+    if not raw:
+        sync_title_ranks(instance)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def sync_ranks_on_title_genres(sender, instance, action, reverse, pk_set,
+                               **kwargs):
+    if not action.startswith('post_'):
+        return
+    if not reverse:
+        sync_title_ranks(instance)
+        return
+    title_ids = genre_change_title_ids(instance, action, pk_set)
+    if title_ids:
+        for title in Title.objects.filter(pk__in=title_ids):
+            sync_title_ranks(title)
+
+
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Genre)
+def drop_ranks_on_relation_delete(sender, instance, **kwargs):
+    TitleRank.objects.filter(
+        dimension=sender._meta.model_name, key=instance.pk
+    ).delete()
+
+
+# Индекс подсказок общий для всех запросов процесса, поэтому изменения
+# попадают в него только после COMMIT: откат не оставит в нём названий
+# и отзывов, которых нет в базе.
+def on_commit(function, *args):
+    transaction.on_commit(partial(function, *args))
+
+
+@receiver(post_save, sender=Title)
+def autocomplete_title_on_save(sender, instance, raw=False, **kwargs):
+    if not raw:
+        on_commit(autocomplete_index.put_title, instance.pk, instance.name,
+                  instance.category_id)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Genre)
+def autocomplete_relation_on_save(sender, instance, raw=False, **kwargs):
+    if not raw:
+        on_commit(
+            autocomplete_index.put,
+            CATEGORY if sender is Category else GENRE,
+            instance.pk, instance.name, instance.slug
+        )
+
+
+@receiver(post_delete, sender=Title)
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Genre)
+def autocomplete_remove_on_delete(sender, instance, **kwargs):
+    kinds = {Title: TITLE, Category: CATEGORY, Genre: GENRE}
+    on_commit(autocomplete_index.remove, kinds[sender], instance.pk)
+
+
+def put_title_genres(title_ids):
+    """Переиндексирует тайтлы с их жанрами после COMMIT.
+
+    Жанры читаются, только если индекс уже построен.
+    """
+    if autocomplete_index.built is None:
+        return
+    genres = {}
+    for title_id, genre_id in Title.genre.through.objects.filter(
+            title_id__in=title_ids).values_list('title_id', 'genre_id'):
+        genres.setdefault(title_id, []).append(genre_id)
+    for title_id, name, category_id in Title.objects.filter(
+            pk__in=title_ids).values_list('id', 'name', 'category_id'):
+        autocomplete_index.put_title(
+            title_id, name, category_id, genres.get(title_id, [])
+        )
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def autocomplete_title_genres(sender, instance, action, reverse, pk_set,
+                              **kwargs):
+    if not action.startswith('post_'):
+        return
+    if not reverse:
+        on_commit(put_title_genres, [instance.pk])
+        return
+    title_ids = list(genre_change_title_ids(instance, action, pk_set))
+    if title_ids:
+        on_commit(put_title_genres, title_ids)
+
+
+@receiver(post_save, sender=Review)
+def autocomplete_reviews_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, '_previous', None)
+    if previous is None:
+        on_commit(autocomplete_index.add_reviews, instance.title_id, 1)
+    elif previous[0] != instance.title_id:
+        on_commit(autocomplete_index.add_reviews, previous[0], -1)
+        on_commit(autocomplete_index.add_reviews, instance.title_id, 1)
+
+
+@receiver(post_delete, sender=Review)
+def autocomplete_reviews_on_delete(sender, instance, **kwargs):
+    on_commit(autocomplete_index.add_reviews, instance.title_id, -1)
+
+
+@receiver(post_migrate)
+def reset_autocomplete(sender, **kwargs):
+    """После migrate и flush индекс строится заново."""
+    autocomplete_index.reset()
+
+
+@receiver(post_migrate)
+def ensure_rating_prior(sender, using=DEFAULT_DB_ALIAS, apps=global_apps,
+                        **kwargs):
+    """Строка общей средней есть всегда, в том числе после flush: иначе
+    первый отзыв создавал бы её лишними запросами."""
+    if sender.name != 'reviews':
+        return
+    try:
+        prior = apps.get_model('reviews', 'RatingPrior')
+    except LookupError:
+        return
+    prior.objects.using(using).get_or_create(pk=1)
@@ -0,0 +1,115 @@
+import heapq
+import math
+from collections import defaultdict
+from itertools import combinations, groupby, islice
+from operator import itemgetter
+
+from django.db import transaction
+from django.db.models import F, Sum
+
+from .models import Review, SimilarTitle, Title
+
+TitleGenre = Title.genre.through
+
+
+def batches(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def score_norms():
+    """Длина вектора оценок каждого тайтла: sqrt(sum(score ** 2))."""
+    rows = Review.objects.order_by().values('title').annotate(
+        squares=Sum(F('score') * F('score'))
+    )
+    return {row['title']: math.sqrt(row['squares']) for row in rows}
+
+
+def genre_index(per_genre):
+    """Жанры каждого тайтла и кандидаты в соседи по жанру: не больше
+    per_genre тайтлов жанра с наибольшим числом отзывов."""
+    genres, titles = defaultdict(set), defaultdict(list)
+    rows = TitleGenre.objects.order_by(
+        '-title__rating_count', 'title_id'
+    ).values_list('title_id', 'genre_id')
+    for title_id, genre_id in rows.iterator():
+        genres[title_id].add(genre_id)
+        if len(titles[genre_id]) < per_genre:
+            titles[genre_id].append(title_id)
+    return genres, titles
+
+
+def review_dot_products():
+    """Скалярные произведения векторов оценок тайтлов с общими авторами.
+
+    Отзывы читаются одним проходом в порядке авторов: каждый автор
+    добавляет произведения своих оценок ко всем парам своих тайтлов.
+    """
+    dots = defaultdict(lambda: defaultdict(int))
+    rows = Review.objects.order_by('author_id').values_list(
+        'author_id', 'title_id', 'score'
+    )
+    for _, reviews in groupby(rows.iterator(), key=itemgetter(0)):
+        reviews = [(title_id, score) for _, title_id, score in reviews]
+        for (title_id, score), (other_id, other_score) in combinations(
+                reviews, 2):
+            dots[title_id][other_id] += score * other_score
+            dots[other_id][title_id] += score * other_score
+    return dots
+
+
+def build_similar_titles(top_k=10, genre_weight=0.3, chunk_size=500,
+                         genre_candidates=100):
+    """Считает косинусное сходство тайтлов по оценкам и жанрам и хранит
+    top_k соседей каждого тайтла.
+
+    Сходство = (1 - genre_weight) * cos(оценки) + genre_weight * cos(жанры).
+    Кандидаты в соседи — тайтлы с общими авторами и genre_candidates
+    самых обсуждаемых тайтлов каждого жанра тайтла, а не все тайтлы его
+    жанров. Соседи записываются порциями по chunk_size тайтлов.
+    Возвращает количество записанных соседей.
+    """
+    norms = score_norms()
+    genres, genre_titles = genre_index(genre_candidates)
+    dots = review_dot_products()
+    written = 0
+    title_ids = Title.objects.order_by('id').values_list('id', flat=True)
+    for chunk in batches(list(title_ids), chunk_size):
+        neighbours = []
+        for title_id in chunk:
+            scores = {
+                other_id: (1 - genre_weight) * dot / (
+                    norms[title_id] * norms[other_id]
+                )
+                for other_id, dot in dots.pop(title_id, {}).items()
+            }
+            title_genres = genres.get(title_id, set())
+            candidates = set(scores)
+            for genre_id in title_genres:
+                candidates.update(genre_titles[genre_id])
+            candidates.discard(title_id)
+            for other_id in candidates:
+                overlap = len(title_genres & genres.get(other_id, set()))
+                if overlap:
+                    scores[other_id] = scores.get(other_id, 0) + (
+                        genre_weight * overlap / math.sqrt(
+                            len(title_genres) * len(genres[other_id])
+                        )
+                    )
+            best = heapq.nlargest(
+                top_k, scores.items(), key=lambda item: (item[1], -item[0])
+            )
+            neighbours.extend(
+                SimilarTitle(title_id=title_id, similar_id=other_id,
+                             rank=rank, score=score)
+                for rank, (other_id, score) in enumerate(best, 1)
+            )
+        with transaction.atomic():
+            SimilarTitle.objects.filter(title_id__in=chunk).delete()
+            SimilarTitle.objects.bulk_create(neighbours)
+        written += len(neighbours)
+    return written
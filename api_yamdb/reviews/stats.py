@@ -0,0 +1,89 @@
+import logging
+
+from django.db.models import Count, F, Max, OuterRef, Subquery
+
+from .models import Review, Title, TitleStats
+
+logger = logging.getLogger(__name__)
+
+SCORES = range(1, 11)
+
+
+def score_field(score):
+    return f'score_{score}'
+
+
+def last_review_date():
+    return Subquery(Review.objects.filter(
+        title_id=OuterRef('title_id')
+    ).order_by('-pub_date').values('pub_date')[:1])
+
+
+def apply_score_counts(title_id, counts):
+    """Сдвигает счётчики оценок тайтла одним UPDATE.
+
+    counts — словарь {оценка: изменение количества}.
+    """
+    TitleStats.objects.filter(title_id=title_id).update(
+        total=F('total') + sum(counts.values()),
+        last_review=last_review_date(),
+        **{score_field(score): F(score_field(score)) + delta
+           for score, delta in counts.items() if delta},
+    )
+
+
+def restore_title_stats(title_id):
+    """Строит недостающую статистику одного тайтла одним GROUP BY по его
+    отзывам.
+
+    Строка создаётся вместе с тайтлом, поэтому её отсутствие — расхождение
+    данных: оно пишется в лог.
+    """
+    logger.error('У тайтла %s нет статистики оценок, строится заново',
+                 title_id)
+    counts, last_reviews = {}, []
+    for score, count, last in Review.objects.filter(
+            title_id=title_id).order_by().values_list('score').annotate(
+            count=Count('id'), last=Max('pub_date')):
+        counts[score] = count
+        last_reviews.append(last)
+    stats, _ = TitleStats.objects.get_or_create(title_id=title_id, defaults={
+        'total': sum(counts.values()),
+        'last_review': max(last_reviews, default=None),
+        **{score_field(score): counts.get(score, 0) for score in SCORES},
+    })
+    return stats
+
+
+def rebuild_title_stats(batch_size=1000):
+    """Пересчитывает статистику оценок всех тайтлов по таблице отзывов.
+
+    Возвращает количество созданных или исправленных записей.
+    """
+    counts = {}
+    for title_id, score, count in Review.objects.order_by().values_list(
+            'title_id', 'score').annotate(count=Count('id')):
+        counts.setdefault(title_id, {})[score] = count
+    last_reviews = dict(Review.objects.order_by().values_list(
+        'title_id').annotate(last=Max('pub_date')))
+    fields = [score_field(score) for score in SCORES]
+    fields += ['total', 'last_review']
+    existing = TitleStats.objects.in_bulk()
+    created, changed = [], []
+    for title_id in Title.objects.values_list('id', flat=True).iterator(
+            chunk_size=batch_size):
+        title_counts = counts.get(title_id, {})
+        values = [title_counts.get(score, 0) for score in SCORES]
+        values += [sum(title_counts.values()), last_reviews.get(title_id)]
+        stats = existing.get(title_id)
+        if stats is None:
+            created.append(TitleStats(title_id=title_id, **dict(
+                zip(fields, values)
+            )))
+        elif [getattr(stats, field) for field in fields] != values:
+            for field, value in zip(fields, values):
+                setattr(stats, field, value)
+            changed.append(stats)
+    TitleStats.objects.bulk_create(created)
+    TitleStats.objects.bulk_update(changed, fields, batch_size=batch_size)
+    return len(created) + len(changed)
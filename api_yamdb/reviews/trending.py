@@ -0,0 +1,99 @@
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncHour
+from django.utils import timezone
+
+from .models import Review, ReviewBucket, TrendingTitle
+
+WINDOWS = {
+    TrendingTitle.DAY: timedelta(hours=24),
+    TrendingTitle.WEEK: timedelta(days=7),
+}
+RETENTION = max(WINDOWS.values())
+
+
+def bucket_hour(moment):
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+def oldest_hour(now=None):
+    """Начало самой старой корзины, которая ещё входит в окна."""
+    return bucket_hour(now or timezone.now()) - RETENTION + timedelta(hours=1)
+
+
+def apply_bucket_delta(title_id, pub_date, count_delta, score_delta):
+    """Сдвигает счётчики часовой корзины тайтла.
+
+    Обычно это один UPDATE; корзина создаётся первым отзывом за час.
+    """
+    hour = bucket_hour(pub_date)
+    if hour < oldest_hour():
+        return
+    bucket = ReviewBucket.objects.filter(title_id=title_id, hour=hour)
+    changes = {
+        'count': F('count') + count_delta,
+        'score_sum': F('score_sum') + score_delta,
+    }
+    if bucket.update(**changes) or count_delta <= 0:
+        return
+    # Пустая корзина не затирает ту, что успел создать параллельный запрос.
+    ReviewBucket.objects.bulk_create(
+        [ReviewBucket(title_id=title_id, hour=hour)], ignore_conflicts=True
+    )
+    bucket.update(**changes)
+
+
+def rebuild_review_buckets(now=None):
+    """Заново строит часовые корзины по отзывам за самое длинное окно.
+
+    Возвращает количество корзин.
+    """
+    buckets = [
+        ReviewBucket(title_id=title_id, hour=hour, count=count,
+                     score_sum=score_sum)
+        for title_id, hour, count, score_sum in Review.objects.filter(
+            pub_date__gte=oldest_hour(now)
+        ).order_by().values_list(
+            'title_id', TruncHour('pub_date')
+        ).annotate(count=Count('id'), score_sum=Sum('score'))
+    ]
+    with transaction.atomic():
+        ReviewBucket.objects.all().delete()
+        ReviewBucket.objects.bulk_create(buckets)
+    return len(buckets)
+
+
+def rollup_trending(size=100, now=None):
+    """Сворачивает часовые корзины в списки популярного по окнам.
+
+    Тайтлы упорядочены по числу отзывов за окно, затем по средней
+    оценке. Корзины, вышедшие за все окна, удаляются.
+    Возвращает количество записей в списках.
+    """
+    current = bucket_hour(now or timezone.now())
+    ReviewBucket.objects.filter(hour__lt=oldest_hour(now)).delete()
+    trending = []
+    for window, length in WINDOWS.items():
+        totals = sorted(
+            (
+                (title_id, reviews, scores / reviews)
+                for title_id, reviews, scores in ReviewBucket.objects.filter(
+                    hour__gt=current - length, count__gt=0
+                ).order_by().values_list('title_id').annotate(
+                    reviews=Sum('count'), scores=Sum('score_sum')
+                )
+            ),
+            key=lambda total: (total[1], total[2], total[0]),
+            reverse=True,
+        )[:size]
+        trending.extend(
+            TrendingTitle(window=window, rank=rank, title_id=title_id,
+                          reviews=reviews, score=score)
+            for rank, (title_id, reviews, score) in enumerate(totals, 1)
+        )
+    with transaction.atomic():
+        TrendingTitle.objects.all().delete()
+        TrendingTitle.objects.bulk_create(trending)
+    return len(trending)
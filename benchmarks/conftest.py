@@ -0,0 +1,179 @@
+import gc
+import json
+import os
+import statistics
+import time
+import tracemalloc
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .seed import seed
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baseline.json')
+# Запас по задержке, чтобы шум на быстрых маршрутах не ронял прогон.
+LATENCY_SLACK_MS = 5
+RESULTS = {}
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('benchmarks')
+    group.addoption('--bench-titles', type=int, default=200)
+    group.addoption('--bench-users', type=int, default=50)
+    group.addoption('--bench-genres', type=int, default=20)
+    group.addoption('--bench-categories', type=int, default=5)
+    group.addoption('--bench-reviews-per-title', type=int, default=10)
+    group.addoption('--bench-comments-per-review', type=int, default=2)
+    group.addoption('--bench-iterations', type=int, default=50)
+    group.addoption(
+        '--bench-warmup', type=int, default=3,
+        help='Прогревочные запросы: учитываются в числе запросов к БД, '
+             'но не в задержке.',
+    )
+    group.addoption(
+        '--bench-tolerance', type=float, default=1.5,
+        help='Во сколько раз p95 и память могут превысить базовые.',
+    )
+    group.addoption(
+        '--bench-min-speedup', type=float, default=3.0,
+        help='Минимальное ускорение values-плана над сериализатором.',
+    )
+    group.addoption(
+        '--bench-baseline', default=BASELINE_PATH,
+        help='JSON с базовыми значениями по маршрутам.',
+    )
+    group.addoption(
+        '--bench-update-baseline', action='store_true',
+        help='Записать результаты прогона как новые базовые значения.',
+    )
+
+
+@pytest.fixture(scope='session')
+def django_db_setup(django_db_setup, django_db_blocker, request):
+    option = request.config.getoption
+    with django_db_blocker.unblock():
+        return seed(
+            titles=option('--bench-titles'),
+            users=option('--bench-users'),
+            genres=option('--bench-genres'),
+            categories=option('--bench-categories'),
+            reviews_per_title=option('--bench-reviews-per-title'),
+            comments_per_review=option('--bench-comments-per-review'),
+        )
+
+
+@pytest.fixture(scope='session')
+def bench_data(django_db_setup):
+    return django_db_setup
+
+
+@pytest.fixture(scope='session')
+def baseline(request):
+    path = request.config.getoption('--bench-baseline')
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as file:
+        return json.load(file)
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def measure(send, iterations, warmup):
+    """Замеряет запросы к БД, задержку и пиковую память маршрута.
+
+    Число запросов — максимум по всем вызовам, включая первый холодный,
+    чтобы кэши не прятали N+1.
+    """
+    queries = 0
+    latencies = []
+    gc.collect()
+    for number in range(warmup + iterations):
+        with CaptureQueriesContext(connection) as context:
+            started = time.perf_counter()
+            response = send()
+            elapsed = (time.perf_counter() - started) * 1000
+        assert response.status_code < 400, (
+            f'Маршрут вернул статус {response.status_code}'
+        )
+        queries = max(queries, len(context.captured_queries))
+        if number >= warmup:
+            latencies.append(elapsed)
+    tracemalloc.start()
+    try:
+        send()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {
+        'queries': queries,
+        'p50_ms': round(statistics.median(latencies), 3),
+        'p95_ms': round(percentile(latencies, 0.95), 3),
+        'peak_kb': round(peak / 1024, 1),
+    }
+
+
+@pytest.fixture
+def benchmark_route(request, baseline):
+    iterations = request.config.getoption('--bench-iterations')
+    warmup = request.config.getoption('--bench-warmup')
+    tolerance = request.config.getoption('--bench-tolerance')
+
+    def run(name, send):
+        result = measure(send, iterations, warmup)
+        RESULTS[name] = result
+        expected = baseline.get(name)
+        if expected is None or request.config.getoption(
+                '--bench-update-baseline'):
+            return result
+        problems = []
+        if result['queries'] > expected['queries']:
+            problems.append(
+                f'запросов {result["queries"]} > {expected["queries"]}'
+            )
+        if result['p95_ms'] > expected['p95_ms'] * tolerance + (
+                LATENCY_SLACK_MS):
+            problems.append(
+                f'p95 {result["p95_ms"]} мс > {expected["p95_ms"]} мс '
+                f'x {tolerance}'
+            )
+        if result['peak_kb'] > expected['peak_kb'] * tolerance:
+            problems.append(
+                f'память {result["peak_kb"]} КБ > {expected["peak_kb"]} КБ '
+                f'x {tolerance}'
+            )
+        if problems:
+            pytest.fail(f'{name}: ' + ', '.join(problems))
+        return result
+
+    return run
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    if not RESULTS:
+        return
+    terminalreporter.section('API benchmarks')
+    terminalreporter.write_line(
+        f'{"route":<32}{"queries":>8}{"p50 ms":>10}{"p95 ms":>10}'
+        f'{"peak KB":>10}'
+    )
+    for name, result in sorted(RESULTS.items()):
+        terminalreporter.write_line(
+            f'{name:<32}{result["queries"]:>8}{result["p50_ms"]:>10}'
+            f'{result["p95_ms"]:>10}{result["peak_kb"]:>10}'
+        )
+    if config.getoption('--bench-update-baseline'):
+        path = config.getoption('--bench-baseline')
+        stored = {}
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as file:
+                stored = json.load(file)
+        stored.update(RESULTS)
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(stored, file, indent=4, sort_keys=True)
+            file.write('\n')
+        terminalreporter.write_line(f'Базовые значения записаны в {path}')
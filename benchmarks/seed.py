@@ -0,0 +1,94 @@
+import random
+
+from django.utils import timezone
+
+from reviews.autocomplete import autocomplete_index
+from reviews.models import Category, Comment, Genre, Review, Title, User
+from reviews.rankings import rebuild_rankings
+from reviews.ratings import rebuild_title_ratings
+from reviews.search import fts_enabled, rebuild_index
+from reviews.similarity import build_similar_titles
+from reviews.stats import rebuild_title_stats
+from reviews.trending import rebuild_review_buckets, rollup_trending
+
+ADMIN_USERNAME = 'bench_admin'
+CONFIRMATION_CODE = 'bench-code'
+
+
+def seed(titles=200, users=50, genres=20, categories=5,
+         reviews_per_title=10, comments_per_review=2, batch_size=1000):
+    """Заполняет БД синтетическими данными заданного объёма.
+
+    Возвращает словарь с объектами, на которые ссылаются маршруты.
+    """
+    rnd = random.Random(42)
+    admin = User.objects.create_user(
+        username=ADMIN_USERNAME, email='bench_admin@yamdb.fake',
+        role='admin', confirmation_code=CONFIRMATION_CODE,
+    )
+    User.objects.bulk_create(
+        [User(username=f'bench{number}', email=f'bench{number}@yamdb.fake',
+              confirmation_code=CONFIRMATION_CODE)
+         for number in range(users)]
+    )
+    Category.objects.bulk_create(
+        [Category(name=f'Категория {number}', slug=f'category-{number}')
+         for number in range(categories)]
+    )
+    Genre.objects.bulk_create(
+        [Genre(name=f'Жанр {number}', slug=f'genre-{number}')
+         for number in range(genres)]
+    )
+    category_ids = list(Category.objects.values_list('id', flat=True))
+    genre_ids = list(Genre.objects.values_list('id', flat=True))
+    this_year = timezone.now().year
+    Title.objects.bulk_create(
+        [Title(name=f'Произведение {number}',
+               year=rnd.randint(1900, this_year),
+               description=f'Описание произведения номер {number}',
+               category_id=rnd.choice(category_ids))
+         for number in range(titles)]
+    )
+    title_ids = list(Title.objects.values_list('id', flat=True))
+    TitleGenre = Title.genre.through
+    TitleGenre.objects.bulk_create(
+        [TitleGenre(title_id=title_id, genre_id=genre_id)
+         for title_id in title_ids
+         for genre_id in rnd.sample(genre_ids, min(2, len(genre_ids)))]
+    )
+    user_ids = list(User.objects.values_list('id', flat=True))
+    Review.objects.bulk_create(
+        [Review(title_id=title_id, author_id=author_id,
+                text=f'Отзыв {author_id} на {title_id}',
+                score=rnd.randint(1, 10))
+         for title_id in title_ids
+         for author_id in rnd.sample(
+             user_ids, min(reviews_per_title, len(user_ids)))]
+    )
+    review_ids = list(Review.objects.values_list('id', flat=True))
+    Comment.objects.bulk_create(
+        [Comment(review_id=review_id, author_id=rnd.choice(user_ids),
+                 text=f'Комментарий к отзыву {review_id}')
+         for review_id in review_ids
+         for _ in range(comments_per_review)]
+    )
+    rebuild_title_ratings(batch_size=batch_size)
+    rebuild_rankings(batch_size=batch_size)
+    rebuild_title_stats(batch_size=batch_size)
+    rebuild_review_buckets()
+    rollup_trending()
+    autocomplete_index.build()
+    build_similar_titles()
+    if fts_enabled():
+        rebuild_index()
+
+    review = Review.objects.order_by('id').first()
+    return {
+        'admin': admin,
+        'user': User.objects.exclude(pk=admin.pk).order_by('id').first(),
+        'category': Category.objects.order_by('id').first(),
+        'genre': Genre.objects.order_by('id').first(),
+        'title': review.title,
+        'review': review,
+        'comment': review.comments_review.order_by('id').first(),
+    }
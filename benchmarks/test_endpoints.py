@@ -0,0 +1,114 @@
+from itertools import count
+
+import pytest
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.urls import router
+
+from .seed import CONFIRMATION_CODE
+
+signup_numbers = count()
+
+
+def title_url(data):
+    return f'/api/v1/titles/{data["title"].id}/'
+
+
+def review_url(data):
+    return f'{title_url(data)}reviews/{data["review"].id}/'
+
+
+# Имя маршрута: (префикс в api/urls.py, метод, url, тело запроса).
+ROUTES = {
+    'users-list': ('users', 'get', lambda d: '/api/v1/users/', None),
+    'users-detail': ('users', 'get',
+                     lambda d: f'/api/v1/users/{d["user"].username}/', None),
+    'users-me': ('users', 'get', lambda d: '/api/v1/users/me/', None),
+    'auth-signup': ('auth/signup', 'post', lambda d: '/api/v1/auth/signup/',
+                    lambda d: {'username': f'signup{next(signup_numbers)}',
+                               'email': f'signup{next(signup_numbers)}'
+                                        '@yamdb.fake'}),
+    'auth-token': ('auth/token/', 'post', lambda d: '/api/v1/auth/token/',
+                   lambda d: {'username': d['user'].username,
+                              'confirmation_code': CONFIRMATION_CODE}),
+    'categories-list': ('categories', 'get',
+                        lambda d: '/api/v1/categories/', None),
+    'genres-list': ('genres', 'get', lambda d: '/api/v1/genres/', None),
+    'titles-list': ('titles', 'get', lambda d: '/api/v1/titles/', None),
+    'titles-filter-genre': (
+        'titles', 'get',
+        lambda d: f'/api/v1/titles/?genre={d["genre"].slug}', None),
+    'titles-search': ('titles', 'get',
+                      lambda d: '/api/v1/titles/?search=произведение', None),
+    'titles-order-bayesian': (
+        'titles', 'get',
+        lambda d: '/api/v1/titles/?ordering=-rating_bayesian', None),
+    'titles-facets': (
+        'titles', 'get',
+        lambda d: '/api/v1/titles/?facets=genre,category,decade', None),
+    'titles-facets-filtered': (
+        'titles', 'get',
+        lambda d: f'/api/v1/titles/?genre={d["genre"].slug}'
+                  '&facets=category,decade', None),
+    'titles-top': ('titles', 'get', lambda d: '/api/v1/titles/top/', None),
+    'titles-top-genre': (
+        'titles', 'get',
+        lambda d: f'/api/v1/titles/top/?genre={d["genre"].slug}', None),
+    'titles-detail': ('titles', 'get', title_url, None),
+    'titles-trending': ('titles', 'get',
+                        lambda d: '/api/v1/titles/trending/?window=7d', None),
+    'titles-similar': ('titles', 'get',
+                       lambda d: f'{title_url(d)}similar/', None),
+    'titles-stats': ('titles', 'get', lambda d: f'{title_url(d)}stats/',
+                     None),
+    'reviews-list': (r'^titles/(?P<title_id>\d+)/reviews', 'get',
+                     lambda d: f'{title_url(d)}reviews/', None),
+    'reviews-cursor': (r'^titles/(?P<title_id>\d+)/reviews', 'get',
+                       lambda d: f'{title_url(d)}reviews/?cursor=', None),
+    'reviews-detail': (r'^titles/(?P<title_id>\d+)/reviews', 'get',
+                       review_url, None),
+    'comments-list': (
+        r'^titles/(?P<title_id>\d+)/reviews/(?P<review_id>\d+)/comments',
+        'get', lambda d: f'{review_url(d)}comments/', None),
+    'comments-detail': (
+        r'^titles/(?P<title_id>\d+)/reviews/(?P<review_id>\d+)/comments',
+        'get',
+        lambda d: f'{review_url(d)}comments/{d["comment"].id}/', None),
+    'changes': ('changes', 'get', lambda d: '/api/v1/changes/?since=0', None),
+    'metrics': ('metrics', 'get', lambda d: '/api/v1/metrics/', None),
+    'autocomplete': ('autocomplete', 'get',
+                     lambda d: '/api/v1/autocomplete/?q=произведение+1', None),
+    'export-reviews-csv': ('export', 'get',
+                           lambda d: '/api/v1/export/reviews.csv', None),
+    'export-titles-ndjson': ('export', 'get',
+                             lambda d: '/api/v1/export/titles.ndjson', None),
+}
+
+
+def test_every_route_is_benchmarked():
+    prefixes = {prefix for prefix, _, _ in router.registry}
+    prefixes.add('auth/token/')
+    covered = {route[0] for route in ROUTES.values()}
+    assert prefixes <= covered, (
+        f'Нет бенчмарка для маршрутов: {sorted(prefixes - covered)}'
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('name', sorted(ROUTES))
+def test_route(name, bench_data, benchmark_route):
+    _, method, url, body = ROUTES[name]
+    token = AccessToken.for_user(bench_data['admin'])
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def send():
+        data = body(bench_data) if body else None
+        response = getattr(client, method)(url(bench_data), data=data)
+        if response.streaming:
+            for _ in response.streaming_content:
+                pass
+        return response
+
+    benchmark_route(name, send)
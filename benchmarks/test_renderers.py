@@ -0,0 +1,36 @@
+import time
+
+import pytest
+from rest_framework.renderers import JSONRenderer
+
+from api.fast_serializers import REVIEW_PLAN, TITLE_PLAN
+from api.renderers import FastJSONRenderer, orjson
+from reviews.models import Review, Title
+
+REPEAT = 20
+
+
+def best_time(render, data):
+    timings = []
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        render(data)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+@pytest.mark.skipif(orjson is None, reason='orjson не установлен')
+@pytest.mark.django_db
+@pytest.mark.parametrize('name', ['titles', 'reviews'])
+def test_fast_renderer_speedup(name, bench_data):
+    if name == 'titles':
+        results = TITLE_PLAN.render(TITLE_PLAN.values(Title.objects.all()))
+    else:
+        results = REVIEW_PLAN.render(REVIEW_PLAN.values(Review.objects.all()))
+    data = {'count': len(results), 'next': None, 'previous': None,
+            'results': results}
+    stdlib, fast = JSONRenderer().render, FastJSONRenderer().render
+    assert fast(data) == stdlib(data)
+    speedup = best_time(stdlib, data) / best_time(fast, data)
+    print(f'\n{name}: {len(results)} объектов, ускорение x{speedup:.1f}')
+    assert speedup > 1, f'{name}: FastJSONRenderer не быстрее JSONRenderer'
@@ -0,0 +1,65 @@
+import time
+
+import pytest
+from django.db.models import Prefetch
+
+from api.fast_serializers import COMMENT_PLAN, REVIEW_PLAN, TITLE_PLAN
+from api.serializers import (CommentSerializer, ReviewSerializer,
+                             TitleSerializer)
+from reviews.models import Comment, Genre, Review, Title
+
+ROWS = 500
+REPEAT = 7
+
+# Сортировка по первичному ключу, чтобы сортировка без индекса по всей
+# таблице не размывала стоимость строки (эндпоинты читают по индексу).
+
+CASES = {
+    'titles': (
+        lambda: Title.objects.select_related('category').prefetch_related(
+            Prefetch('genre', queryset=Genre.objects.order_by('id'))
+        ).order_by('id'),
+        TitleSerializer, TITLE_PLAN,
+    ),
+    'reviews': (
+        lambda: Review.objects.select_related('author').order_by('-id'),
+        ReviewSerializer, REVIEW_PLAN,
+    ),
+    'comments': (
+        lambda: Comment.objects.select_related('author').order_by('-id'),
+        CommentSerializer, COMMENT_PLAN,
+    ),
+}
+
+
+def best_time(run):
+    timings = []
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('name', sorted(CASES))
+def test_values_plan_speedup(name, bench_data, request):
+    make_queryset, serializer_class, plan = CASES[name]
+    queryset = make_queryset()[:ROWS]
+    rows = len(queryset)
+
+    def serializer_path():
+        return serializer_class(list(make_queryset()[:ROWS]), many=True).data
+
+    def plan_path():
+        return plan.render(plan.values(make_queryset())[:ROWS])
+
+    assert plan_path() == [dict(item) for item in serializer_path()]
+    slow = best_time(serializer_path) / rows * 1e6
+    fast = best_time(plan_path) / rows * 1e6
+    speedup = slow / fast
+    print(f'\n{name}: {slow:.1f} мкс/строка -> {fast:.1f} мкс/строка, '
+          f'x{speedup:.1f}')
+    assert speedup >= request.config.getoption('--bench-min-speedup'), (
+        f'{name}: ускорение x{speedup:.1f} меньше требуемого'
+    )
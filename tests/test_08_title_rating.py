@@ -0,0 +1,59 @@
+import pytest
+from django.core.management import call_command
+
+from .common import create_reviews
+
+
+class Test08TitleRating:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_rating_follows_review_changes(self, admin_client, admin):
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        title_url = f'/api/v1/titles/{titles[0]["id"]}/'
+        reviews_url = f'{title_url}reviews/'
+        assert admin_client.get(title_url).json().get('rating') == 4, (
+            'Проверьте, что рейтинг тайтла пересчитывается при создании отзыва'
+        )
+        admin_client.patch(f'{reviews_url}{reviews[0]["id"]}/', data={'score': 8})
+        assert admin_client.get(title_url).json().get('rating') == 5, (
+            'Проверьте, что рейтинг тайтла пересчитывается при изменении оценки отзыва'
+        )
+        for review in reviews:
+            admin_client.delete(f'{reviews_url}{review["id"]}/')
+        assert admin_client.get(title_url).json().get('rating') is None, (
+            'Проверьте, что после удаления всех отзывов `rating` тайтла равен `None`'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_rebuild_command(self, admin_client, admin):
+        from reviews.models import Title
+
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        Title.objects.update(rating_sum=0, rating_count=0)
+        call_command('rebuild_title_ratings')
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert (title.rating_sum, title.rating_count) == (12, 3), (
+            'Проверьте, что команда `rebuild_title_ratings` пересчитывает рейтинги по отзывам'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_title_update_keeps_counters(self, admin_client, admin):
+        from api.serializers import TitleCreateSerializer
+        from reviews.models import Title
+
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        title_id = titles[0]['id']
+        stale = Title.objects.get(pk=title_id)
+        Title.objects.filter(pk=title_id).update(rating_sum=20, rating_count=4)
+        serializer = TitleCreateSerializer(stale, data={'name': 'Новое название'}, partial=True)
+        assert serializer.is_valid(), serializer.errors
+        serializer.save()
+        title = Title.objects.get(pk=title_id)
+        assert (title.name, title.rating_sum, title.rating_count) == ('Новое название', 20, 4), (
+            'Проверьте, что изменение тайтла не затирает счётчики рейтинга, обновлённые параллельно'
+        )
+        admin_client.patch(f'/api/v1/titles/{title_id}/', data={'rating_sum': 0, 'rating_count': 0})
+        title.refresh_from_db()
+        assert (title.rating_sum, title.rating_count) == (20, 4), (
+            'Проверьте, что счётчики рейтинга нельзя изменить через API'
+        )
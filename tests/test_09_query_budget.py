@@ -0,0 +1,80 @@
+import pytest
+
+from .common import create_comments, create_titles
+
+
+class Test09QueryBudget:
+
+    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.parametrize('extra_titles', [0, 10])
+    def test_01_titles_list(self, admin_client, client, django_assert_num_queries, extra_titles):
+        titles, categories, genres = create_titles(admin_client)
+        for number in range(extra_titles):
+            admin_client.post('/api/v1/titles/', data={
+                'name': f'Тайтл {number}', 'year': 2000, 'category': categories[0]['slug'],
+                'genre': [genre['slug'] for genre in genres],
+            })
+        # агрегат для ETag, COUNT для пагинации, тайтлы с категориями, жанры
+        with django_assert_num_queries(4):
+            response = client.get('/api/v1/titles/')
+        assert len(response.json()['results']) == len(titles) + extra_titles, (
+            'Проверьте, что при GET запросе `/api/v1/titles/` возвращаются все тайтлы'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_title_detail(self, admin_client, client, django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        with django_assert_num_queries(3):
+            client.get(f'/api/v1/titles/{titles[0]["id"]}/')
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_review_create(self, admin_client, user_client, django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        user_client.get('/api/v1/users/me/')
+        # BEGIN, тайтл, вставка отзыва, общая средняя, пересчёт рейтинга,
+        # места в рейтингах, статистика оценок, журнал изменений;
+        # первый за час отзыв ещё создаёт часовой счётчик (три запроса)
+        with django_assert_num_queries(11):
+            response = user_client.post(url, data={'text': 'Текст', 'score': 7})
+        assert response.status_code == 201
+        response = user_client.post(url, data={'text': 'Текст', 'score': 7})
+        assert response.status_code == 400, (
+            'Проверьте, что повторный отзыв на произведение возвращает статус 400'
+        )
+        assert list(response.json()) == ['non_field_errors'], (
+            'Проверьте, что ошибка повторного отзыва возвращается в `non_field_errors`'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_comments_of_foreign_title(self, admin_client, admin):
+        _, reviews, titles, _, _ = create_comments(admin_client, admin)
+        url = f'/api/v1/titles/{titles[1]["id"]}/reviews/{reviews[0]["id"]}/comments/'
+        assert admin_client.get(url).status_code == 404, (
+            'Проверьте, что комментарии отзыва недоступны по адресу чужого произведения'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.parametrize('authors', [1, 10])
+    def test_05_reviews_and_comments_list(self, admin_client, client, django_user_model,
+                                          django_assert_num_queries, authors):
+        from reviews.models import Comment, Review
+
+        titles, _, _ = create_titles(admin_client)
+        users = [
+            django_user_model.objects.create_user(username=f'author{number}', email=f'author{number}@yamdb.fake')
+            for number in range(authors)
+        ]
+        for user in users:
+            review = Review.objects.create(title_id=titles[0]['id'], author=user, text='Текст', score=5)
+            Comment.objects.create(review=review, author=user, text='Текст')
+        for comment_user in users:
+            Comment.objects.create(review=review, author=comment_user, text='Ещё')
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        # тайтл, агрегат для ETag, COUNT, отзывы с авторами
+        with django_assert_num_queries(4):
+            response = client.get(url)
+        assert len(response.json()['results']) == authors
+        # отзыв, агрегат для ETag, COUNT, комментарии с авторами
+        with django_assert_num_queries(4):
+            client.get(f'{url}{review.id}/comments/')
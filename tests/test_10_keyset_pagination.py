@@ -0,0 +1,62 @@
+import pytest
+
+from .common import create_comments, create_reviews
+
+
+class Test10KeysetPagination:
+
+    def walk(self, client, url):
+        seen = []
+        while url:
+            response = client.get(url)
+            assert response.status_code == 200, (
+                f'Проверьте, что GET запрос `{url}` возвращает статус 200'
+            )
+            data = response.json()
+            assert 'count' not in data, (
+                'Проверьте, что в режиме курсора не выполняется подсчёт `count`'
+            )
+            seen.extend(item['id'] for item in data['results'])
+            url = data['next']
+        return seen
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_reviews_cursor(self, admin_client, admin):
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        seen = self.walk(admin_client, f'{url}?cursor=&limit=2')
+        expected = [item['id'] for item in admin_client.get(url).json()['results']]
+        assert seen == expected, (
+            'Проверьте, что обход отзывов по курсору возвращает все отзывы '
+            'в том же порядке и без повторов'
+        )
+        assert len(seen) == len(reviews)
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_comments_cursor(self, admin_client, admin):
+        comments, reviews, titles, _, _ = create_comments(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/comments/'
+        seen = self.walk(admin_client, f'{url}?cursor=&limit=1')
+        assert sorted(seen) == sorted(comment['id'] for comment in comments), (
+            'Проверьте, что обход комментариев по курсору возвращает все комментарии'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_invalid_cursor(self, admin_client, admin):
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        response = admin_client.get(f'/api/v1/titles/{titles[0]["id"]}/reviews/?cursor=broken')
+        assert response.status_code == 404, (
+            'Проверьте, что при неверном курсоре возвращается статус 404'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.parametrize('fast', [False, True])
+    def test_04_cursor_independent_of_date_format(self, admin_client, admin, settings, fast):
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        settings.FAST_LIST_SERIALIZATION = fast
+        settings.REST_FRAMEWORK = {**settings.REST_FRAMEWORK, 'DATETIME_FORMAT': '%d.%m.%Y'}
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        seen = self.walk(admin_client, f'{url}?cursor=&limit=1')
+        assert sorted(seen) == sorted(review['id'] for review in reviews), (
+            'Проверьте, что курсор строится по полям модели, а не по формату дат в ответе'
+        )
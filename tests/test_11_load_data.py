@@ -0,0 +1,38 @@
+import csv
+import os
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from .conftest import MANAGE_PATH
+
+DATA_PATH = os.path.join(MANAGE_PATH, 'static', 'data')
+
+
+def csv_rows(filename):
+    with open(os.path.join(DATA_PATH, filename), encoding='utf-8', newline='') as file:
+        return list(csv.DictReader(file))
+
+
+class Test11LoadData:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_load_data(self):
+        from reviews.models import Comment, Review, Title
+
+        call_command('load_data', batch_size=7, stdout=StringIO())
+        assert Title.objects.count() == len(csv_rows('titles.csv'))
+        assert Title.genre.through.objects.count() == len(csv_rows('genre_title.csv'))
+        assert Comment.objects.count() == len(csv_rows('comments.csv'))
+        reviews = csv_rows('review.csv')
+        assert Review.objects.count() == len(reviews)
+        review = Review.objects.get(pk=reviews[0]['id'])
+        assert review.pub_date.isoformat().startswith(reviews[0]['pub_date'][:19]), (
+            'Проверьте, что `load_data` сохраняет дату публикации из csv'
+        )
+        title = review.title
+        scores = [int(row['score']) for row in reviews if row['title_id'] == str(title.id)]
+        assert (title.rating_sum, title.rating_count) == (sum(scores), len(scores)), (
+            'Проверьте, что после загрузки пересчитываются рейтинги тайтлов'
+        )
@@ -0,0 +1,31 @@
+import pytest
+
+
+class Test12CachedAuthentication:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_no_user_query_when_cached(self, admin_client, django_assert_num_queries):
+        admin_client.get('/api/v1/users/me/')
+        with django_assert_num_queries(0):
+            response = admin_client.get('/api/v1/users/me/')
+        assert response.status_code == 200
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_cache_invalidated_on_user_change(self, admin_client, user, user_client):
+        response = user_client.post('/api/v1/categories/', data={'name': 'Игры', 'slug': 'games'})
+        assert response.status_code == 403, (
+            'Проверьте, что обычный пользователь не может создавать категории'
+        )
+        admin_client.patch(f'/api/v1/users/{user.username}/', data={'role': 'admin'})
+        response = user_client.post('/api/v1/categories/', data={'name': 'Игры', 'slug': 'games'})
+        assert response.status_code == 201, (
+            'Проверьте, что смена роли пользователя сбрасывает закэшированного пользователя'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_deleted_user_rejected(self, admin_client, user, user_client):
+        assert user_client.get('/api/v1/users/me/').status_code == 200
+        admin_client.delete(f'/api/v1/users/{user.username}/')
+        assert user_client.get('/api/v1/users/me/').status_code == 401, (
+            'Проверьте, что удалённый пользователь не проходит аутентификацию из кэша'
+        )
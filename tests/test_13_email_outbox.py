@@ -0,0 +1,73 @@
+from io import StringIO
+
+import pytest
+from django.core import mail
+from django.core.management import call_command
+
+
+class Test13EmailOutbox:
+    url_signup = '/api/v1/auth/signup/'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_signup_queues_email(self, client):
+        from reviews.models import OutboxEmail
+
+        outbox_before_count = len(mail.outbox)
+        for number in range(5):
+            response = client.post(self.url_signup, data={
+                'email': f'user{number}@yamdb.fake', 'username': f'user{number}'
+            })
+            assert response.status_code == 200
+        assert len(mail.outbox) == outbox_before_count, (
+            'Проверьте, что при регистрации письмо ставится в очередь, а не отправляется в запросе'
+        )
+        assert OutboxEmail.objects.filter(sent_at__isnull=True).count() == 5
+
+        out = StringIO()
+        call_command('send_outbox_emails', once=True, batch_size=2, workers=2, stdout=out)
+        assert len(mail.outbox) == outbox_before_count + 5, (
+            'Проверьте, что воркер отправляет все письма из очереди'
+        )
+        assert not OutboxEmail.objects.filter(sent_at__isnull=True).exists()
+        assert 'в очереди: 0' in out.getvalue()
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_claimed_emails_are_not_sent_twice(self):
+        from reviews.outbox import OutboxWorker, enqueue_email
+
+        for number in range(3):
+            enqueue_email(f'user{number}@yamdb.fake', 'Тема', 'Текст')
+        first, second = OutboxWorker(batch_size=2), OutboxWorker(batch_size=10)
+        _, claimed = first.claim_batch()
+        _, rest = second.claim_batch()
+        assert len(claimed) == 2 and len(rest) == 1, (
+            'Проверьте, что письма, занятые одним воркером, не достаются другому'
+        )
+        assert not {email.id for email in claimed} & {email.id for email in rest}
+        assert second.claim_batch()[1] == []
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_failed_emails_back_off(self, settings):
+        from django.utils import timezone
+        from reviews.models import OutboxEmail
+        from reviews.outbox import OutboxWorker, enqueue_email
+
+        settings.EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+        settings.EMAIL_HOST, settings.EMAIL_PORT = '127.0.0.1', 1
+        email = enqueue_email('user@yamdb.fake', 'Тема', 'Текст')
+        worker = OutboxWorker(retry_delay=60)
+        assert worker.process_batch() == 1
+        email.refresh_from_db()
+        assert (email.attempts, email.sent_at, email.claim) == (1, None, '')
+        assert email.last_error
+        assert email.next_attempt_at > timezone.now(), (
+            'Проверьте, что неудачная отправка откладывается'
+        )
+        assert worker.process_batch() == 0, (
+            'Проверьте, что письмо не отправляется повторно до истечения паузы'
+        )
+        OutboxEmail.objects.update(next_attempt_at=timezone.now())
+        assert worker.process_batch() == 1
+        email.refresh_from_db()
+        assert email.attempts == 2
+        assert worker.backoff(2).total_seconds() == 120
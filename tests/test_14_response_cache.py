@@ -0,0 +1,78 @@
+import pytest
+
+from .common import create_categories, create_reviews
+
+
+class Test14ResponseCache:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_category_list_cached(self, admin_client, client, django_assert_num_queries):
+        create_categories(admin_client)
+        first = client.get('/api/v1/categories/')
+        assert first['X-Cache'] == 'MISS'
+        # только агрегат для ETag
+        with django_assert_num_queries(1):
+            second = client.get('/api/v1/categories/')
+        assert second['X-Cache'] == 'HIT'
+        assert second.json() == first.json()
+        assert client.get('/api/v1/categories/?limit=1')['X-Cache'] == 'MISS', (
+            'Проверьте, что параметры запроса входят в ключ кэша'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_invalidated_on_change(self, admin_client, client):
+        categories = create_categories(admin_client)
+        client.get('/api/v1/categories/')
+        admin_client.delete(f'/api/v1/categories/{categories[0]["slug"]}/')
+        response = client.get('/api/v1/categories/')
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['count'] == len(categories) - 1, (
+            'Проверьте, что удаление категории сбрасывает кэш списка категорий'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_title_list_follows_reviews(self, admin_client, admin, client):
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/?name={titles[1]["name"]}'
+        assert client.get(url).json()['results'][0]['rating'] is None
+        admin_client.post(f'/api/v1/titles/{titles[1]["id"]}/reviews/', data={'text': 'ok', 'score': 6})
+        assert client.get(url).json()['results'][0]['rating'] == 6, (
+            'Проверьте, что новый отзыв сбрасывает кэш списка тайтлов'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_version_bumped_after_commit(self):
+        from django.db import transaction
+
+        from api.response_cache import response_cache
+
+        label = 'reviews.category'
+        before = response_cache.versions([label])
+        with transaction.atomic():
+            response_cache.bump(label)
+            assert response_cache.versions([label]) == before, (
+                'Проверьте, что версия меняется только после фиксации транзакции'
+            )
+        assert response_cache.versions([label]) != before
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                response_cache.bump(label)
+                raise RuntimeError
+        assert response_cache.versions([label]) == [before[0] + 1], (
+            'Проверьте, что откат транзакции не меняет версию'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_evicted_version_does_not_restart(self):
+        from api.response_cache import response_cache
+
+        label = 'reviews.genre'
+        seen = set()
+        for _ in range(3):
+            response_cache.backend.delete(response_cache.version_key(label))
+            seen.add(response_cache.versions([label])[0])
+            response_cache.bump_now(label)
+            seen.add(response_cache.versions([label])[0])
+        assert len(seen) == 6, (
+            'Проверьте, что после вытеснения ключа версии она не повторяет прежние значения'
+        )
@@ -0,0 +1,77 @@
+import pytest
+
+from .common import create_comments, create_reviews
+
+
+class Test15ConditionalGet:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_reviews_etag(self, admin_client, admin, user_client):
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{titles[1]["id"]}/reviews/'
+        response = admin_client.get(url)
+        etag = response['ETag']
+        assert response.status_code == 200 and etag, (
+            f'Проверьте, что GET запрос `{url}` возвращает заголовок ETag'
+        )
+        response = admin_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304, (
+            'Проверьте, что при совпадении If-None-Match возвращается статус 304'
+        )
+        assert not response.content
+        user_client.post(url, data={'text': 'new', 'score': 2})
+        response = admin_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            'Проверьте, что после добавления отзыва ETag меняется'
+        )
+        assert response['ETag'] != etag
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_review_edit_changes_etag(self, admin_client, admin):
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/'
+        etag = admin_client.get(url)['ETag']
+        admin_client.patch(url, data={'text': 'changed'})
+        assert admin_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200, (
+            'Проверьте, что после изменения отзыва ETag меняется'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_if_modified_since_not_stale(self, admin_client, admin):
+        _, reviews, titles, _, _ = create_comments(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        response = admin_client.get(url)
+        assert 'Last-Modified' not in response, (
+            'Проверьте, что списки не отдают Last-Modified по дате создания'
+        )
+        admin_client.delete(f'{url}{reviews[0]["id"]}/')
+        response = admin_client.get(url, HTTP_IF_MODIFIED_SINCE='Fri, 01 Jan 2100 00:00:00 GMT')
+        assert response.status_code == 200, (
+            'Проверьте, что после удаления отзыва If-Modified-Since не даёт 304 с устаревшими данными'
+        )
+        assert len(response.json()['results']) == len(reviews) - 1
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_catalog_etag(self, admin_client, client):
+        for url in ('/api/v1/categories/', '/api/v1/genres/', '/api/v1/titles/'):
+            etag = client.get(url)['ETag']
+            assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304, (
+                f'Проверьте, что GET запрос `{url}` поддерживает If-None-Match'
+            )
+        etag = client.get('/api/v1/genres/')['ETag']
+        admin_client.post('/api/v1/genres/', data={'name': 'Рок', 'slug': 'rock'})
+        assert client.get('/api/v1/genres/', HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_etag_follows_edits_from_other_processes(self, admin_client, admin, monkeypatch):
+        from api.response_cache import response_cache
+
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        etag = admin_client.get(url)['ETag']
+        # Версии кэша другого процесса правка не меняет.
+        monkeypatch.setattr(response_cache, 'bump', lambda label: None)
+        admin_client.patch(f'{url}{reviews[0]["id"]}/', data={'text': 'changed'})
+        assert admin_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200, (
+            'Проверьте, что ETag строится по состоянию базы, а не по кэшу процесса'
+        )
@@ -0,0 +1,44 @@
+import pytest
+
+from .common import create_titles
+
+
+class Test16TitleSearch:
+
+    def names(self, client, query):
+        response = client.get(f'/api/v1/titles/?{query}')
+        assert response.status_code == 200
+        return sorted(title['name'] for title in response.json()['results'])
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_search(self, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        assert self.names(admin_client, 'search=драма') == [titles[1]['name']], (
+            'Проверьте, что `search` ищет по описанию тайтла'
+        )
+        assert self.names(admin_client, 'search=повор') == [titles[0]['name']], (
+            'Проверьте, что `search` ищет по префиксу слова без учёта регистра'
+        )
+        assert self.names(admin_client, 'search="*') == []
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_search_index_follows_changes(self, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        admin_client.patch(f'/api/v1/titles/{titles[0]["id"]}/', data={'description': 'Космос'})
+        assert self.names(admin_client, 'search=космос') == [titles[0]['name']], (
+            'Проверьте, что изменение тайтла обновляет поисковый индекс'
+        )
+        admin_client.delete(f'/api/v1/titles/{titles[0]["id"]}/')
+        assert self.names(admin_client, 'search=космос') == []
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_exact_and_prefix_filters(self, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        assert self.names(admin_client, 'name=Проек') == [titles[1]['name']]
+        assert self.names(admin_client, 'name=роект') == [], (
+            'Проверьте, что фильтр `name` ищет по началу названия'
+        )
+        assert self.names(admin_client, f'category={categories[0]["slug"][:-1]}') == [], (
+            'Проверьте, что фильтр `category` сравнивает slug целиком'
+        )
+        assert self.names(admin_client, f'genre={genres[0]["slug"]}') == [titles[0]['name']]
@@ -0,0 +1,38 @@
+import pytest
+
+from .common import create_comments
+
+
+class Test17FastSerializers:
+
+    def compare(self, client, settings, url):
+        from api.response_cache import GLOBAL_VERSION, response_cache
+
+        settings.FAST_LIST_SERIALIZATION = False
+        expected = client.get(url).content
+        response_cache.bump(GLOBAL_VERSION)
+        settings.FAST_LIST_SERIALIZATION = True
+        actual = client.get(url).content
+        assert actual == expected, (
+            f'Проверьте, что быстрый список `{url}` совпадает с ответом сериализатора'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_same_output(self, admin_client, admin, settings):
+        from reviews.models import Title
+
+        _, reviews, titles, _, _ = create_comments(admin_client, admin)
+        Title.objects.create(name='Без категории', year=1999)
+        review_url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        for url in ('/api/v1/titles/', '/api/v1/titles/?limit=1&offset=1',
+                    review_url, f'{review_url}?cursor=&limit=2',
+                    f'{review_url}{reviews[0]["id"]}/comments/'):
+            self.compare(admin_client, settings, url)
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_same_output_outside_utc(self, admin_client, admin, settings):
+        settings.TIME_ZONE = 'Europe/Moscow'
+        _, reviews, titles, _, _ = create_comments(admin_client, admin)
+        review_url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        for url in (review_url, f'{review_url}{reviews[0]["id"]}/comments/'):
+            self.compare(admin_client, settings, url)
@@ -0,0 +1,36 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from rest_framework.renderers import JSONRenderer
+
+from .common import create_titles
+
+
+class Test18Renderers:
+
+    def test_01_same_bytes_as_json_renderer(self):
+        from api.renderers import FastJSONRenderer
+
+        data = {
+            'pub_date': datetime(2020, 1, 13, 23, 20, 2, 422000, tzinfo=timezone.utc),
+            'price': Decimal('9.50'),
+            'text': 'Отзыв с переносом',
+            'results': [{'id': 1, 'rating': None}],
+            1: 'int key',
+        }
+        assert FastJSONRenderer().render(data) == JSONRenderer().render(data), (
+            'Проверьте, что FastJSONRenderer выдаёт те же байты, что и JSONRenderer'
+        )
+        assert FastJSONRenderer().render(None) == b''
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_json_request_body(self, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        response = admin_client.post(url, data={'text': 'Текст', 'score': 9}, format='json')
+        assert response.status_code == 201, (
+            'Проверьте, что API принимает тело запроса в JSON'
+        )
+        response = admin_client.post(url, data='{"text": ', content_type='application/json')
+        assert response.status_code == 400
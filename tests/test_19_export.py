@@ -0,0 +1,61 @@
+import csv
+import json
+import os
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from .conftest import MANAGE_PATH
+
+DATA_PATH = os.path.join(MANAGE_PATH, 'static', 'data')
+EXPORTS = (
+    ('titles', 'titles.csv'),
+    ('reviews', 'review.csv'),
+    ('comments', 'comments.csv'),
+)
+
+
+def csv_rows(filename):
+    with open(os.path.join(DATA_PATH, filename), encoding='utf-8', newline='') as file:
+        return sorted(csv.DictReader(file), key=lambda row: int(row['id']))
+
+
+def streamed(response):
+    assert response.streaming, 'Проверьте, что выгрузка отдаётся потоком'
+    return b''.join(response.streaming_content).decode()
+
+
+class Test19Export:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_csv_matches_source_layout(self, admin_client):
+        call_command('load_data', stdout=StringIO())
+        for resource, filename in EXPORTS:
+            response = admin_client.get(f'/api/v1/export/{resource}.csv?chunk_size=5')
+            assert response.status_code == 200
+            assert response['Content-Type'].startswith('text/csv')
+            assert list(csv.DictReader(StringIO(streamed(response)))) == csv_rows(filename), (
+                f'Проверьте, что выгрузка `{resource}` совпадает с `{filename}`'
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_ndjson(self, admin_client):
+        call_command('load_data', stdout=StringIO())
+        response = admin_client.get('/api/v1/export/titles.ndjson')
+        assert response.status_code == 200
+        rows = [json.loads(line) for line in streamed(response).splitlines()]
+        expected = csv_rows('titles.csv')
+        assert len(rows) == len(expected)
+        assert {key: str(value) for key, value in rows[0].items()} == expected[0], (
+            'Проверьте, что строки ndjson содержат те же колонки, что и csv'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_admin_only(self, client, user_client, moderator_client):
+        assert client.get('/api/v1/export/titles.csv').status_code == 401
+        for api_client in (user_client, moderator_client):
+            assert api_client.get('/api/v1/export/reviews.csv').status_code == 403, (
+                'Проверьте, что выгрузка доступна только администратору'
+            )
+        assert client.get('/api/v1/export/users.csv').status_code == 404
@@ -0,0 +1,134 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from .common import create_reviews, create_titles
+
+
+@pytest.fixture(autouse=True)
+def no_feed_lag(settings):
+    settings.CHANGE_FEED = {**settings.CHANGE_FEED, 'SAFE_LAG_SECONDS': 0}
+
+
+class Test20Changes:
+
+    def changes(self, client, since=0, **params):
+        params = ''.join(f'&{key}={value}' for key, value in params.items())
+        response = client.get(f'/api/v1/changes/?since={since}{params}')
+        assert response.status_code == 200
+        return response.json()
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_upserts(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        data = self.changes(client)
+        assert sorted(title['id'] for title in data['upserts']['titles']) == sorted(
+            title['id'] for title in titles
+        ), 'Проверьте, что созданные тайтлы попадают в upserts'
+        assert {item['slug'] for item in data['upserts']['categories']} == {
+            category['slug'] for category in categories
+        }
+        assert len(data['upserts']['genres']) == len(genres)
+        assert data['has_more'] is False
+        assert self.changes(client, data['cursor'])['upserts']['titles'] == [], (
+            'Проверьте, что после курсора возвращаются только новые изменения'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_tombstones_and_related_titles(self, client, admin_client, admin):
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        cursor = self.changes(client)['cursor']
+        admin_client.delete(f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/')
+        data = self.changes(client, cursor)
+        assert data['deletes']['reviews'] == [reviews[0]['id']], (
+            'Проверьте, что удалённый отзыв возвращается в deletes'
+        )
+        assert [title['id'] for title in data['upserts']['titles']] == [titles[0]['id']], (
+            'Проверьте, что удаление отзыва отмечает изменение рейтинга тайтла'
+        )
+        cursor = data['cursor']
+        admin_client.delete(f'/api/v1/titles/{titles[0]["id"]}/')
+        data = self.changes(client, cursor)
+        assert data['deletes']['titles'] == [titles[0]['id']]
+        assert data['upserts']['titles'] == [], (
+            'Проверьте, что для удалённого объекта возвращается только tombstone'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_batches(self, client, admin_client):
+        create_titles(admin_client)
+        data = self.changes(client, limit=2)
+        assert data['has_more'] is True
+        seen = 0
+        while data['has_more']:
+            seen += 1
+            data = self.changes(client, data['cursor'], limit=2)
+        assert seen > 1
+        assert client.get('/api/v1/changes/?since=abc').status_code == 400
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_load_data(self, client):
+        from reviews.models import Review
+
+        call_command('load_data', stdout=StringIO())
+        data = self.changes(client, limit=1000)
+        assert len(data['upserts']['reviews']) == Review.objects.count(), (
+            'Проверьте, что `load_data` записывает загруженные объекты в журнал'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_unsettled_changes_wait(self, client, admin_client, settings):
+        from datetime import timedelta
+
+        from django.utils import timezone
+        from reviews.models import Change
+
+        create_titles(admin_client)
+        settings.CHANGE_FEED = {**settings.CHANGE_FEED, 'SAFE_LAG_SECONDS': 60}
+        assert self.changes(client)['cursor'] == 0, (
+            'Проверьте, что свежие записи журнала не отдаются до истечения SAFE_LAG_SECONDS'
+        )
+        ids = list(Change.objects.order_by('id').values_list('id', flat=True))
+        Change.objects.update(created=timezone.now() - timedelta(minutes=5))
+        # Запись с меньшим id ещё «свежая»: всё, что после неё, ждёт.
+        Change.objects.filter(id=ids[2]).update(created=timezone.now())
+        assert self.changes(client)['cursor'] == ids[1], (
+            'Проверьте, что журнал отдаётся только до первой несвежей записи'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_06_reverse_genre_clear(self, client, admin_client):
+        from reviews.models import Genre
+
+        titles, _, genres = create_titles(admin_client)
+        cursor = self.changes(client)['cursor']
+        Genre.objects.get(slug=genres[0]['slug']).titles.clear()
+        data = self.changes(client, cursor)
+        assert [title['id'] for title in data['upserts']['titles']] == [titles[0]['id']], (
+            'Проверьте, что очистка тайтлов жанра записывается в журнал'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_07_prune(self, client, admin_client):
+        from datetime import timedelta
+
+        from django.utils import timezone
+        from reviews.models import Change
+
+        create_titles(admin_client)
+        latest = self.changes(client)['cursor']
+        first = Change.objects.order_by('id').first()
+        Change.objects.filter(id__lt=first.id + 3).update(
+            created=timezone.now() - timedelta(days=31)
+        )
+        call_command('prune_changes', stdout=StringIO())
+        assert Change.objects.order_by('id').first().id == first.id + 3, (
+            'Проверьте, что `prune_changes` удаляет записи старше срока хранения'
+        )
+        response = client.get(f'/api/v1/changes/?since={first.id}')
+        assert response.status_code == 410, (
+            'Проверьте, что курсор старше хранимого журнала возвращает статус 410'
+        )
+        assert response.json()['cursor'] == latest
+        assert self.changes(client, first.id + 2)['cursor'] == latest
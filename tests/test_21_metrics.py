@@ -0,0 +1,52 @@
+import re
+
+import pytest
+
+from .common import create_titles
+
+
+def metric(text, name, **labels):
+    selector = ','.join(f'{key}="{value}"' for key, value in labels.items())
+    found = re.search(rf'^{name}{{{re.escape(selector)}}} (\S+)$', text, re.M)
+    return float(found.group(1)) if found else None
+
+
+class Test21Metrics:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_route_histograms(self, client, admin_client):
+        from api.metrics import route_metrics
+
+        create_titles(admin_client)
+        route_metrics.clear()
+        for _ in range(3):
+            assert client.get('/api/v1/titles/').status_code == 200
+        client.get('/api/v1/missing/')
+        response = admin_client.get('/api/v1/metrics/')
+        assert response.status_code == 200
+        assert response['Content-Type'].startswith('text/plain')
+        text = response.content.decode()
+        assert metric(text, 'yamdb_request_duration_seconds_count', route='titles-list') == 3, (
+            'Проверьте, что время запросов собирается по имени маршрута'
+        )
+        assert metric(
+            text, 'yamdb_request_duration_seconds_bucket', route='titles-list', le='+Inf'
+        ) == 3
+        queries = metric(text, 'yamdb_db_queries_sum', route='titles-list')
+        assert queries is not None and queries > 0, (
+            'Проверьте, что считаются SQL-запросы маршрута'
+        )
+        assert metric(text, 'yamdb_render_duration_seconds_count', route='titles-list') == 3
+        assert metric(text, 'yamdb_serialize_duration_seconds_count', route='titles-list') == 3
+        assert metric(text, 'yamdb_serialize_duration_seconds_sum', route='titles-list') > 0, (
+            'Проверьте, что время сериализаторов замеряется отдельно от рендеринга'
+        )
+        assert metric(text, 'yamdb_responses_total', route='unresolved', status='404') == 1
+        assert 'yamdb_response_cache_requests_total{result="hit"}' in text
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_admin_only(self, client, user_client):
+        assert client.get('/api/v1/metrics/').status_code == 401
+        assert user_client.get('/api/v1/metrics/').status_code == 403, (
+            'Проверьте, что метрики доступны только администратору'
+        )
@@ -0,0 +1,26 @@
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+
+
+class Test22ExplainQueries:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_no_full_scans(self):
+        call_command('load_data', stdout=StringIO())
+        out = StringIO()
+        call_command('explain_queries', fail_on_scan=True, verbosity=2, stdout=out)
+        output = out.getvalue()
+        assert 'USING COVERING INDEX review_title_score_idx' in output, (
+            'Проверьте, что пересчёт рейтингов читает только индекс отзывов'
+        )
+        assert 'title_category_year_idx' in output, (
+            'Проверьте, что фильтр по категории и году использует составной индекс'
+        )
+        assert 'Полных просмотров таблиц: 0' in output
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_empty_database(self):
+        with pytest.raises(CommandError):
+            call_command('explain_queries', stdout=StringIO())
@@ -0,0 +1,121 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from .common import create_reviews
+
+
+class Test23AlternativeRatings:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_bayesian_rating(self, admin_client, admin):
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        title_url = f'/api/v1/titles/{titles[0]["id"]}/'
+        call_command('rebuild_title_ratings')
+        # Априорная средняя 4, вес 10: (10 * 4 + 12) / (10 + 3)
+        assert admin_client.get(title_url).json()['rating_bayesian'] == pytest.approx(4.0), (
+            'Проверьте, что байесовский рейтинг считается с априорной средней'
+        )
+        admin_client.patch(f'{title_url}reviews/{reviews[0]["id"]}/', data={'score': 8})
+        # Общая средняя сдвигается вместе с отзывом: 15 / 3 = 5.
+        assert admin_client.get(title_url).json()['rating_bayesian'] == pytest.approx(65 / 13), (
+            'Проверьте, что байесовский рейтинг и общая средняя обновляются при изменении отзыва'
+        )
+        assert admin_client.get(title_url).json()['rating_decayed'] == pytest.approx(5, rel=1e-3)
+        for review in reviews:
+            admin_client.delete(f'{title_url}reviews/{review["id"]}/')
+        data = admin_client.get(title_url).json()
+        assert (data['rating_bayesian'], data['rating_decayed']) == (None, None), (
+            'Проверьте, что без отзывов альтернативные рейтинги равны `None`'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_prior_without_rebuild(self, admin_client, admin):
+        from reviews.models import RatingPrior
+
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        assert RatingPrior.objects.get().mean == pytest.approx(4.0), (
+            'Проверьте, что общая средняя обновляется при записи отзывов без пересчёта'
+        )
+        rating = admin_client.get(f'/api/v1/titles/{titles[0]["id"]}/').json()['rating_bayesian']
+        assert rating == pytest.approx(4.0), (
+            'Проверьте, что байесовский рейтинг сглаживается к общей средней, а не к нулю'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_decayed_rating_prefers_recent_reviews(self, admin_client, admin):
+        from reviews.models import Review, Title
+
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        Review.objects.filter(pk=reviews[0]['id']).update(
+            pub_date=timezone.now() - timedelta(days=3650)
+        )
+        call_command('rebuild_title_ratings')
+        title = Title.objects.get(pk=titles[0]['id'])
+        # Старая оценка 5 почти не влияет: среднее близко к (3 + 4) / 2.
+        assert title.rating_decayed == pytest.approx(3.5, abs=0.01), (
+            'Проверьте, что рейтинг с затуханием уменьшает вес старых отзывов'
+        )
+        assert title.rating_decayed < title.rating, (
+            'Проверьте, что рейтинг с затуханием отличается от среднего'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_ordering(self, admin_client, admin):
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        for key in ('rating_bayesian', 'rating_decayed'):
+            response = admin_client.get(f'/api/v1/titles/?ordering=-{key}')
+            assert response.status_code == 200
+            results = response.json()['results']
+            assert results[0]['id'] == titles[0]['id'], (
+                f'Проверьте, что список тайтлов сортируется по `{key}`'
+            )
+            assert [title[key] for title in results[1:]] == [None] * (len(results) - 1)
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_decay_weights_are_rebased(self, admin_client, admin, monkeypatch):
+        from reviews import ratings
+        from reviews.models import RatingPrior, Title
+
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        later = timezone.now() + timedelta(days=365 * 500)
+        monkeypatch.setattr(ratings.timezone, 'now', lambda: later)
+        call_command('rebuild_title_ratings')
+        assert RatingPrior.objects.get().decay_shift == pytest.approx(
+            ratings.current_decay_shift(later)
+        ), 'Проверьте, что пересчёт переносит сдвиг весов к текущей дате'
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert 0 < title.decay_weight < 3 * 2.0 ** -490, (
+            'Проверьте, что веса затухания считаются от сдвига, а не от фиксированной даты'
+        )
+        admin_client.patch(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/', data={'score': 8}
+        )
+        title.refresh_from_db()
+        assert title.rating_decayed == pytest.approx(5, rel=1e-3), (
+            'Проверьте, что изменение отзыва учитывает сдвиг весов'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_06_rebuild_is_atomic(self, admin_client, admin, monkeypatch):
+        from reviews import ratings
+        from reviews.models import RatingPrior, Title
+
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        Title.objects.filter(pk=titles[0]['id']).update(rating_bayesian=1)
+        before = RatingPrior.objects.values_list('score_sum', 'score_count', 'decay_shift').get()
+
+        def fail(title_id=None):
+            raise RuntimeError
+
+        monkeypatch.setattr(ratings, 'refresh_rank_scores', fail)
+        later = timezone.now() + timedelta(days=3650)
+        monkeypatch.setattr(ratings.timezone, 'now', lambda: later)
+        with pytest.raises(RuntimeError):
+            ratings.rebuild_title_ratings()
+        assert RatingPrior.objects.values_list(
+            'score_sum', 'score_count', 'decay_shift'
+        ).get() == before, 'Проверьте, что пересчёт рейтингов выполняется в одной транзакции'
+        assert Title.objects.get(pk=titles[0]['id']).rating_bayesian == 1
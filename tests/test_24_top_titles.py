@@ -0,0 +1,83 @@
+import pytest
+from django.core.management import call_command
+
+from .common import create_reviews
+
+
+class Test24TopTitles:
+
+    def top(self, client, query=''):
+        response = client.get(f'/api/v1/titles/top/{query}')
+        assert response.status_code == 200
+        return [title['id'] for title in response.json()]
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_boards(self, client, admin_client, admin):
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        admin_client.post(f'/api/v1/titles/{titles[1]["id"]}/reviews/',
+                          data={'text': 'Шедевр', 'score': 10})
+        call_command('rebuild_title_ratings')
+        first, second = titles[0]['id'], titles[1]['id']
+        assert self.top(client) == [second, first], (
+            'Проверьте, что `/api/v1/titles/top/` сортирует тайтлы по байесовскому рейтингу'
+        )
+        assert self.top(client, '?limit=1') == [second]
+        assert client.get('/api/v1/titles/top/?limit=1')['X-Cache'] == 'HIT', (
+            'Проверьте, что рейтинг отдаётся из кэша ответов'
+        )
+        assert self.top(client, f'?category={titles[0]["category"]}') == [first], (
+            'Проверьте рейтинг по категории'
+        )
+        assert self.top(client, f'?genre={titles[1]["genre"][0]}') == [second], (
+            'Проверьте рейтинг по жанру'
+        )
+        assert self.top(client, '?year=2000') == [first], 'Проверьте рейтинг по году'
+        assert self.top(client, '?year=1999') == []
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_boards_follow_changes(self, client, admin_client, admin):
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        first, second = titles[0]['id'], titles[1]['id']
+        assert self.top(client) == [first], (
+            'Проверьте, что тайтлы без отзывов не попадают в рейтинг'
+        )
+        admin_client.post(f'/api/v1/titles/{second}/reviews/', data={'text': 'Шедевр', 'score': 10})
+        admin_client.patch(f'/api/v1/titles/{second}/', data={'category': titles[0]['category']})
+        assert set(self.top(client, f'?category={titles[0]["category"]}')) == {first, second}, (
+            'Проверьте, что смена категории переносит тайтл в её рейтинг'
+        )
+        assert self.top(client, f'?category={titles[1]["category"]}') == []
+        for review in reviews:
+            admin_client.delete(f'/api/v1/titles/{first}/reviews/{review["id"]}/')
+        assert self.top(client) == [second], (
+            'Проверьте, что удаление отзывов обновляет рейтинг'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_stale_instance_and_genre_clear(self, client, admin_client, admin):
+        from reviews.models import Genre, Review, Title, TitleRank
+
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        second = titles[1]['id']
+        title = Title.objects.get(pk=second)
+        Review.objects.create(title_id=second, author=admin, text='Шедевр', score=10)
+        title.name = 'Новое название'
+        title.save(update_fields=['name'])
+        rating = Title.objects.get(pk=second).rating_bayesian
+        assert rating is not None
+        assert set(TitleRank.objects.filter(title_id=second).values_list(
+            'score', flat=True
+        )) == {rating}, (
+            'Проверьте, что перенос в рейтинги берёт рейтинг из базы, а не из устаревшего экземпляра'
+        )
+        genre = Genre.objects.get(slug=titles[1]['genre'][0])
+        genre.titles.clear()
+        assert self.top(client, f'?genre={genre.slug}') == [], (
+            'Проверьте, что очистка тайтлов жанра убирает их из рейтинга жанра'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_bad_params(self, client):
+        assert client.get('/api/v1/titles/top/?category=missing').status_code == 404
+        assert client.get('/api/v1/titles/top/?year=1&genre=x').status_code == 400
+        assert client.get('/api/v1/titles/top/?year=abc').status_code == 400
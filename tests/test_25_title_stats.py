@@ -0,0 +1,70 @@
+import logging
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from .common import create_reviews, create_titles
+
+
+class Test25TitleStats:
+
+    def stats(self, client, title_id):
+        response = client.get(f'/api/v1/titles/{title_id}/stats/')
+        assert response.status_code == 200
+        return response.json()
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_stats_follow_reviews(self, client, admin_client, admin):
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        title_id = titles[0]['id']
+        data = self.stats(client, title_id)
+        assert data['total'] == 3
+        assert {score: count for score, count in data['scores'].items() if count} == {
+            '3': 1, '4': 1, '5': 1
+        }, 'Проверьте, что `/stats/` возвращает распределение оценок тайтла'
+        assert set(data['scores']) == {str(score) for score in range(1, 11)}
+        assert data['last_review'] is not None
+        reviews_url = f'/api/v1/titles/{title_id}/reviews/'
+        admin_client.patch(f'{reviews_url}{reviews[0]["id"]}/', data={'score': 3})
+        assert self.stats(client, title_id)['scores']['3'] == 2, (
+            'Проверьте, что изменение оценки переносит отзыв в другую корзину'
+        )
+        for review in reviews:
+            admin_client.delete(f'{reviews_url}{review["id"]}/')
+        data = self.stats(client, title_id)
+        assert (data['total'], data['last_review']) == (0, None), (
+            'Проверьте, что удаление отзывов обновляет статистику'
+        )
+        assert not any(data['scores'].values())
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_rebuild_command(self, client, admin_client, admin, caplog):
+        from reviews.models import TitleStats
+
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        TitleStats.objects.all().delete()
+        with caplog.at_level(logging.ERROR, logger='reviews.stats'):
+            data = self.stats(client, titles[0]['id'])
+        assert (data['total'], data['scores']['5']) == (3, 1), (
+            'Проверьте, что недостающая статистика строится по отзывам тайтла'
+        )
+        assert data['last_review'] is not None
+        assert TitleStats.objects.filter(title_id=titles[0]['id']).exists()
+        assert any('статистики' in record.getMessage() for record in caplog.records), (
+            'Проверьте, что расхождение данных пишется в лог'
+        )
+        TitleStats.objects.all().delete()
+        call_command('rebuild_title_stats', stdout=StringIO())
+        assert TitleStats.objects.get(title_id=titles[0]['id']).total == 3, (
+            'Проверьте, что `rebuild_title_stats` пересчитывает статистику по отзывам'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_missing_title(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        assert self.stats(client, titles[1]['id'])['total'] == 0
+        assert client.get('/api/v1/titles/0/stats/').status_code == 404
+        assert client.get('/api/v1/titles/abc/stats/').status_code == 404, (
+            'Проверьте, что нечисловой id тайтла возвращает 404'
+        )
@@ -0,0 +1,66 @@
+import pytest
+
+from .common import create_titles
+
+
+class Test26Facets:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_facets_without_filters(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        response = client.get('/api/v1/titles/?facets=genre,category,year,decade')
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data['results']) == len(titles)
+        facets = data['facets']
+        assert {row['slug']: row['count'] for row in facets['genre']} == {
+            genres[0]['slug']: 1, genres[1]['slug']: 1, genres[2]['slug']: 1
+        }, 'Проверьте счётчики тайтлов по жанрам'
+        assert {row['slug'] for row in facets['category']} == {
+            categories[0]['slug'], categories[1]['slug']
+        }
+        assert facets['year'] == [{'value': 2000, 'count': 1}, {'value': 2020, 'count': 1}]
+        assert facets['decade'] == [{'value': 2000, 'count': 1}, {'value': 2020, 'count': 1}], (
+            'Проверьте счётчики тайтлов по десятилетиям'
+        )
+        assert 'facets' not in client.get('/api/v1/titles/').json(), (
+            'Проверьте, что счётчики возвращаются только по запросу'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_facets_follow_filters_and_changes(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        data = client.get(f'/api/v1/titles/?category={categories[0]["slug"]}&facets=genre').json()
+        assert sorted(row['slug'] for row in data['facets']['genre']) == sorted(
+            titles[0]['genre']
+        ), 'Проверьте, что счётчики считаются по отфильтрованному списку'
+        client.get('/api/v1/titles/?facets=year')
+        admin_client.post('/api/v1/titles/', data={
+            'name': 'Новый', 'year': 2000, 'genre': [genres[2]['slug']],
+            'category': categories[0]['slug'],
+        })
+        data = client.get('/api/v1/titles/?facets=year&limit=1').json()
+        assert data['facets']['year'][0] == {'value': 2000, 'count': 2}, (
+            'Проверьте, что закэшированные счётчики сбрасываются при изменении тайтлов'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_unknown_facet(self, client):
+        assert client.get('/api/v1/titles/?facets=author').status_code == 400
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_facets_with_search(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        response = client.get('/api/v1/titles/?search=поворот&facets=genre,category,year,decade')
+        assert response.status_code == 200, (
+            'Проверьте, что счётчики можно запрашивать вместе с поиском'
+        )
+        data = response.json()
+        assert [title['id'] for title in data['results']] == [titles[0]['id']]
+        facets = data['facets']
+        assert sorted(row['slug'] for row in facets['genre']) == sorted(titles[0]['genre']), (
+            'Проверьте, что счётчики по жанрам считаются по найденным тайтлам'
+        )
+        assert [row['slug'] for row in facets['category']] == [categories[0]['slug']]
+        assert facets['year'] == [{'value': 2000, 'count': 1}]
+        assert facets['decade'] == [{'value': 2000, 'count': 1}]
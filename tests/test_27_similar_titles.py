@@ -0,0 +1,69 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from .common import create_reviews, create_titles
+
+
+class Test27SimilarTitles:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_similar_titles(self, client, django_assert_num_queries):
+        from reviews.models import SimilarTitle
+
+        call_command('load_data', stdout=StringIO())
+        call_command('build_similar_titles', chunk_size=1000, stdout=StringIO())
+        expected = list(SimilarTitle.objects.values_list('title_id', 'similar_id', 'rank'))
+        call_command('build_similar_titles', chunk_size=7, stdout=StringIO())
+        assert list(SimilarTitle.objects.values_list('title_id', 'similar_id', 'rank')) == expected, (
+            'Проверьте, что результат не зависит от размера порции'
+        )
+        with django_assert_num_queries(1):
+            response = client.get('/api/v1/titles/1/similar/')
+        assert response.status_code == 200
+        data = response.json()
+        assert 0 < len(data) <= 10
+        assert set(data[0]) == {'id', 'name', 'year', 'score'}
+        scores = [item['score'] for item in data]
+        assert scores == sorted(scores, reverse=True), (
+            'Проверьте, что похожие произведения отсортированы по сходству'
+        )
+        assert 1 not in [item['id'] for item in data]
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_genre_similarity(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        response = admin_client.post('/api/v1/titles/', data={
+            'name': 'Близнец', 'year': 2001, 'genre': [genres[0]['slug']],
+            'category': categories[0]['slug'],
+        })
+        twin = response.json()['id']
+        call_command('build_similar_titles', top_k=5, stdout=StringIO())
+        data = client.get(f'/api/v1/titles/{titles[0]["id"]}/similar/').json()
+        assert [item['id'] for item in data] == [twin], (
+            'Проверьте, что тайтлы с общими жанрами считаются похожими'
+        )
+        assert client.get(f'/api/v1/titles/{titles[1]["id"]}/similar/').json() == []
+        assert client.get('/api/v1/titles/0/similar/').status_code == 404
+        assert client.get('/api/v1/titles/abc/similar/').status_code == 404, (
+            'Проверьте, что нечисловой id тайтла возвращает 404'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_genre_candidates_are_capped(self, client, admin_client, admin):
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        twins = [
+            admin_client.post('/api/v1/titles/', data={
+                'name': name, 'year': 2001, 'genre': ['horror'], 'category': 'films',
+            }).json()['id']
+            for name in ('Близнец', 'Тень')
+        ]
+        call_command('build_similar_titles', stdout=StringIO())
+        data = client.get(f'/api/v1/titles/{twins[0]}/similar/').json()
+        assert {item['id'] for item in data} == {titles[0]['id'], twins[1]}
+        call_command('build_similar_titles', genre_candidates=1, stdout=StringIO())
+        data = client.get(f'/api/v1/titles/{twins[0]}/similar/').json()
+        assert [item['id'] for item in data] == [titles[0]['id']], (
+            'Проверьте, что по жанру сравниваются только самые обсуждаемые тайтлы жанра'
+        )
@@ -0,0 +1,81 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from .common import create_reviews
+
+
+class Test28Trending:
+
+    def trending(self, client, **params):
+        response = client.get('/api/v1/titles/trending/', params)
+        assert response.status_code == 200
+        return [(item['id'], item['reviews'], item['score']) for item in response.json()]
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_buckets_follow_reviews(self, client, admin_client, admin):
+        from reviews.models import ReviewBucket
+
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        first, second = titles[0]['id'], titles[1]['id']
+        admin_client.post(f'/api/v1/titles/{second}/reviews/', data={'text': 'Текст', 'score': 10})
+        assert list(ReviewBucket.objects.order_by('title_id').values_list(
+            'title_id', 'count', 'score_sum'
+        )) == [(first, 3, 12), (second, 1, 10)], (
+            'Проверьте, что новый отзыв увеличивает часовой счётчик тайтла'
+        )
+        assert self.trending(client) == [], (
+            'Проверьте, что `/trending/` читает только свёрнутые данные'
+        )
+        call_command('rollup_trending', stdout=StringIO())
+        assert self.trending(client) == [(first, 3, 4.0), (second, 1, 10.0)], (
+            'Проверьте, что популярное упорядочено по числу отзывов за окно'
+        )
+        reviews_url = f'/api/v1/titles/{first}/reviews/'
+        admin_client.patch(f'{reviews_url}{reviews[1]["id"]}/', data={'score': 9})
+        admin_client.delete(f'{reviews_url}{reviews[0]["id"]}/')
+        admin_client.delete(f'{reviews_url}{reviews[2]["id"]}/')
+        assert ReviewBucket.objects.filter(title_id=first).values_list(
+            'count', 'score_sum'
+        ).get() == (1, 9), 'Проверьте, что удаление и изменение отзыва обновляют счётчик'
+        call_command('rollup_trending', stdout=StringIO())
+        assert self.trending(client) == [(second, 1, 10.0), (first, 1, 9.0)], (
+            'Проверьте, что при равном числе отзывов выше тайтл с большей средней оценкой'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_windows(self, client, admin_client, admin, django_assert_num_queries):
+        from reviews.models import Review
+
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        first, second = titles[0]['id'], titles[1]['id']
+        admin_client.post(f'/api/v1/titles/{second}/reviews/', data={'text': 'Текст', 'score': 8})
+        now = timezone.now()
+        Review.objects.filter(title_id=first).update(pub_date=now - timedelta(days=3))
+        Review.objects.filter(title_id=first, score=5).update(pub_date=now - timedelta(days=8))
+        call_command('rollup_trending', rebuild=True, stdout=StringIO())
+        with django_assert_num_queries(1):
+            assert self.trending(client, window='24h') == [(second, 1, 8.0)], (
+                'Проверьте, что окно 24h не включает отзывы старше суток'
+            )
+        assert self.trending(client, window='7d') == [(first, 2, 3.5), (second, 1, 8.0)], (
+            'Проверьте, что окно 7d включает отзывы за неделю'
+        )
+        assert self.trending(client, window='7d', limit=1) == [(first, 2, 3.5)]
+        response = client.get('/api/v1/titles/trending/', {'window': '1y'})
+        assert response.status_code == 400
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_rollup_prunes_old_buckets(self, admin_client, admin):
+        from reviews.models import ReviewBucket
+        from reviews.trending import rollup_trending
+
+        create_reviews(admin_client, admin)
+        assert ReviewBucket.objects.count() == 1
+        rollup_trending(now=timezone.now() + timedelta(days=8))
+        assert not ReviewBucket.objects.exists(), (
+            'Проверьте, что свёртка удаляет счётчики старше самого длинного окна'
+        )
@@ -0,0 +1,134 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from .common import create_reviews
+
+
+class Test29Autocomplete:
+
+    def suggest(self, client, query, **params):
+        response = client.get('/api/v1/autocomplete/', {'q': query, **params})
+        assert response.status_code == 200
+        return [(item['type'], item['name'], item['reviews']) for item in response.json()]
+
+    def build_index(self, client):
+        from reviews.autocomplete import autocomplete_index
+
+        # Первый запрос запускает фоновую сборку и не ждёт её.
+        self.suggest(client, 'а')
+        autocomplete_index.wait(timeout=5)
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_prefix_and_popularity(self, client, admin_client, admin, django_assert_num_queries):
+        create_reviews(admin_client, admin)
+        self.build_index(client)
+        assert self.suggest(client, 'п') == [
+            ('title', 'Поворот туда', 3), ('title', 'Проект', 0)
+        ], 'Проверьте, что подсказки упорядочены по числу отзывов'
+        with django_assert_num_queries(0):
+            assert self.suggest(client, 'К') == [
+                ('genre', 'Комедия', 3), ('category', 'Книги', 0)
+            ], 'Проверьте, что подсказки читаются из индекса в памяти'
+        assert self.suggest(client, 'туд') == [('title', 'Поворот туда', 3)], (
+            'Проверьте, что префикс ищется с начала каждого слова названия'
+        )
+        assert self.suggest(client, 'поворот  ТУ') == [('title', 'Поворот туда', 3)]
+        assert self.suggest(client, 'оворот') == []
+        assert self.suggest(client, '') == []
+        assert len(self.suggest(client, 'п', limit=1)) == 1
+        assert client.get('/api/v1/autocomplete/', {'q': 'п', 'limit': 'x'}).status_code == 400
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_signals_update_index(self, client, admin_client, admin):
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        first, second = titles[0]['id'], titles[1]['id']
+        self.build_index(client)
+        assert self.suggest(client, 'пр') == [('title', 'Проект', 0)]
+        admin_client.post('/api/v1/genres/', data={'name': 'Приключения', 'slug': 'adventure'})
+        admin_client.patch(f'/api/v1/titles/{second}/', data={
+            'name': 'Приключение', 'genre': ['adventure'],
+        })
+        admin_client.post(f'/api/v1/titles/{second}/reviews/', data={'text': 'Текст', 'score': 9})
+        assert self.suggest(client, 'пр') == [
+            ('title', 'Приключение', 1), ('genre', 'Приключения', 1)
+        ], 'Проверьте, что индекс обновляется при изменении тайтлов, жанров и отзывов'
+        assert self.suggest(client, 'д') == [('genre', 'Драма', 0)], (
+            'Проверьте, что отзывы переносятся между жанрами вместе с тайтлом'
+        )
+        admin_client.delete(f'/api/v1/titles/{first}/')
+        assert self.suggest(client, 'по') == []
+        assert self.suggest(client, 'у') == [('genre', 'Ужасы', 0)], (
+            'Проверьте, что удаление тайтла убирает его отзывы из веса жанров'
+        )
+        admin_client.delete('/api/v1/genres/horror/')
+        assert self.suggest(client, 'у') == []
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_rebuilt_after_load(self, client):
+        assert self.suggest(client, 'о') == []
+        call_command('load_data', stdout=StringIO())
+        self.build_index(client)
+        assert self.suggest(client, 'о'), (
+            'Проверьте, что после load_data индекс строится заново'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_rolled_back_changes_skip_index(self, client, admin_client, admin):
+        from django.db import transaction
+        from reviews.models import Review, Title
+
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        second = titles[1]['id']
+        self.build_index(client)
+        assert self.suggest(client, 'пр') == [('title', 'Проект', 0)]
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                Title.objects.filter(pk=second).update(name='Призрак')
+                title = Title.objects.get(pk=second)
+                title.save()
+                Review.objects.create(title_id=second, author=admin, text='Текст', score=5)
+                raise RuntimeError
+        assert self.suggest(client, 'пр') == [('title', 'Проект', 0)], (
+            'Проверьте, что индекс обновляется только после фиксации транзакции'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_requests_only_read_snapshot(self, client, admin_client, admin, monkeypatch):
+        import threading
+
+        from reviews import autocomplete
+
+        create_reviews(admin_client, admin)
+        index = autocomplete.autocomplete_index
+        load = autocomplete.IndexData.load
+        release = threading.Event()
+        loads = []
+
+        def slow_load():
+            loads.append(threading.current_thread().name)
+            release.wait(timeout=5)
+            return load()
+
+        monkeypatch.setattr(autocomplete.IndexData, 'load', slow_load)
+        assert self.suggest(client, 'пр') == []
+        assert self.suggest(client, 'пр') == [], (
+            'Проверьте, что запрос не ждёт сборки индекса'
+        )
+        release.set()
+        index.wait(timeout=5)
+        assert loads == ['autocomplete-index'], (
+            'Проверьте, что индекс собирается одним фоновым потоком'
+        )
+        assert self.suggest(client, 'пр') == [('title', 'Проект', 0)]
+
+        release.clear()
+        index.built -= index.max_age + 1
+        assert self.suggest(client, 'пр') == [('title', 'Проект', 0)], (
+            'Проверьте, что во время перестройки запросы читают старый индекс'
+        )
+        release.set()
+        index.wait(timeout=5)
+        assert len(loads) == 2, 'Проверьте, что устаревший индекс перестраивается в фоне'
+        assert self.suggest(client, 'пр') == [('title', 'Проект', 0)]